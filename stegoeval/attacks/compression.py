@@ -1,20 +1,48 @@
 import cv2
 import numpy as np
+from typing import Dict, Optional
 
-def apply_jpeg_compression(image: np.ndarray, quality: int = 95) -> np.ndarray:
+# JPEG block transform helpers (shared with DCT-domain algorithms such as dct_qim)
+
+# Zigzag scan: ZIGZAG[k] is the row-major index of the k-th coefficient
+ZIGZAG = np.array(sorted(range(64), key=lambda i: (i // 8 + i % 8, (i // 8) if (i // 8 + i % 8) % 2 else (i % 8))))
+
+
+def _dct_matrix() -> np.ndarray:
+    """Orthonormal 8-point DCT-II matrix."""
+    k = np.arange(8)
+    matrix = np.cos((2 * k[None, :] + 1) * k[:, None] * np.pi / 16) * np.sqrt(2 / 8)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT_8 = _dct_matrix()
+# 2-D DCT of a row-major flattened 8x8 block: coefficients = block @ DCT_64.T
+DCT_64 = np.kron(DCT_8, DCT_8).astype(np.float32)
+
+
+def apply_jpeg_compression(image: np.ndarray, quality: int = 95, stats: Optional[Dict[str, int]] = None) -> np.ndarray:
     """
     Apply JPEG compression to an image.
+
+    `stats`, if given, receives the `compressed_bytes` of the encoded file.
     """
     encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
     _, encoded_image = cv2.imencode('.jpg', image, encode_param)
+    if stats is not None:
+        stats["compressed_bytes"] = len(encoded_image)
     decoded_image = cv2.imdecode(encoded_image, cv2.IMREAD_UNCHANGED)
     return decoded_image
 
-def apply_webp_compression(image: np.ndarray, quality: int = 95) -> np.ndarray:
+def apply_webp_compression(image: np.ndarray, quality: int = 95, stats: Optional[Dict[str, int]] = None) -> np.ndarray:
     """
     Apply WebP compression to an image.
+
+    `stats`, if given, receives the `compressed_bytes` of the encoded file.
     """
     encode_param = [int(cv2.IMWRITE_WEBP_QUALITY), quality]
     _, encoded_image = cv2.imencode('.webp', image, encode_param)
+    if stats is not None:
+        stats["compressed_bytes"] = len(encoded_image)
     decoded_image = cv2.imdecode(encoded_image, cv2.IMREAD_UNCHANGED)
     return decoded_image
@@ -1,13 +1,135 @@
 import cv2
 import numpy as np
+from functools import lru_cache
+from typing import Optional, Tuple
 
-def apply_gaussian_blur(image: np.ndarray, kernel_size: int = 3) -> np.ndarray:
+# `bank`: optional BlurBank of the image; linear blurs whose spatial cost
+#   exceeds one inverse FFT are computed from its shared spectrum instead
+
+# Relative cost of one FFT butterfly per sample vs one spatial filter tap per
+# sample (OpenCV SIMD filters vs scipy.fft, float32, measured on one core)
+FFT_TAP_RATIO = 8.0
+
+# Non-separable kernels at least this wide make cv2.filter2D switch to its own
+# (uncached, forward + inverse) DFT
+FILTER2D_DFT_SIZE = 13
+
+
+@lru_cache(maxsize=64)
+def gaussian_kernel(kernel_size: int) -> np.ndarray:
+    """2-D kernel cv2.GaussianBlur uses for `kernel_size` with sigma derived from the size."""
+    kernel_1d = cv2.getGaussianKernel(kernel_size, 0)
+    kernel = kernel_1d @ kernel_1d.T
+    kernel.flags.writeable = False
+    return kernel
+
+@lru_cache(maxsize=64)
+def motion_kernel(size: int, angle: float) -> np.ndarray:
+    """Line kernel of apply_motion_blur (built once per size and angle)."""
+    # Generating the kernel
+    kernel_motion_blur = np.zeros((size, size))
+    # Fill the middle row (horizontal motion)
+    kernel_motion_blur[int((size-1)/2), :] = np.ones(size)
+    kernel_motion_blur = kernel_motion_blur / size
+
+    # Rotate kernel for angle
+    rotation_matrix = cv2.getRotationMatrix2D((size/2 -0.5 , size/2 -0.5 ) , angle, 1.0)
+    kernel_motion_blur = cv2.warpAffine(kernel_motion_blur, rotation_matrix, (size, size))
+    kernel_motion_blur.flags.writeable = False
+    return kernel_motion_blur
+
+@lru_cache(maxsize=64)
+def _kernel_spectrum(kernel_key: Tuple, fft_shape: Tuple[int, int]) -> np.ndarray:
+    """rfft2 of a kernel centred on the origin of an `fft_shape` grid (flipped: cv2 filters correlate)."""
+    from scipy import fft
+
+    name, *params = kernel_key
+    kernel = gaussian_kernel(*params) if name == "gaussian" else motion_kernel(*params)
+    # cv2 anchors kernels at size // 2; after flipping that tap sits at size - 1 - size // 2
+    shift = kernel.shape[0] - 1 - kernel.shape[0] // 2
+    grid = np.zeros(fft_shape, dtype=np.float32)
+    grid[:kernel.shape[0], :kernel.shape[1]] = kernel[::-1, ::-1]
+    return fft.rfft2(np.roll(grid, (-shift, -shift), axis=(0, 1)))
+
+
+class BlurBank:
+    """
+    Frequency-domain copy of one image shared by all of its linear blurs.
+
+    The image is edge-padded (BORDER_REFLECT_101, as cv2 filters do) and
+    transformed once per channel; each blur is then a pointwise product with
+    a cached kernel spectrum and one inverse FFT. `prefers_fft` compares
+    that against the spatial filter so small kernels stay spatial.
+
+    The bank does not keep a reference to the image (AttackRunner caches it
+    per image, tied to the image's lifetime); pass the same image to every
+    `filter` call.
+    """
+
+    # Minimum padding, so sweeps of small and medium kernels share one spectrum
+    MIN_PAD = 16
+
+    def __init__(self, image: np.ndarray):
+        self.shape = image.shape
+        self.dtype = image.dtype
+        self._spectra = {}
+
+    def _pad(self, radius: int) -> int:
+        # Reflection needs the padding to stay below the image size
+        return min(max(self.MIN_PAD, radius), min(self.shape[:2]) - 1)
+
+    def _spectrum(self, image: np.ndarray, radius: int):
+        from scipy import fft
+
+        pad = self._pad(radius)
+        if pad not in self._spectra:
+            padded = cv2.copyMakeBorder(image, pad, pad, pad, pad, cv2.BORDER_REFLECT_101)
+            padded = padded.reshape(padded.shape[0], padded.shape[1], -1).astype(np.float32)
+            fft_shape = tuple(fft.next_fast_len(n, real=True) for n in padded.shape[:2])
+            self._spectra = {pad: (fft.rfft2(padded, s=fft_shape, axes=(0, 1)), fft_shape, pad)}
+        return self._spectra[pad]
+
+    def fft_cost(self, radius: int) -> float:
+        h, w = self.shape[:2]
+        pad = self._pad(radius)
+        padded_pixels = (h + 2 * pad) * (w + 2 * pad)
+        channels = self.shape[2] if len(self.shape) == 3 else 1
+        return FFT_TAP_RATIO * padded_pixels * channels * np.log2(padded_pixels)
+
+    def prefers_fft(self, kernel_size: int, separable: bool) -> bool:
+        """Whether an FFT blur beats the spatial one for this kernel size."""
+        h, w = self.shape[:2]
+        radius = kernel_size // 2
+        if radius >= min(h, w) or self.dtype != np.uint8:
+            return False
+        if not separable and kernel_size >= FILTER2D_DFT_SIZE:
+            # cv2.filter2D would transform the image itself for every call
+            return True
+        taps = 2 * kernel_size if separable else kernel_size * kernel_size
+        return int(np.prod(self.shape)) * taps > self.fft_cost(radius)
+
+    def filter(self, image: np.ndarray, kernel_key: Tuple, kernel_size: int) -> np.ndarray:
+        """Blur with the kernel named by `kernel_key` ("gaussian", size) / ("motion", size, angle)."""
+        from scipy import fft
+
+        spectrum, fft_shape, pad = self._spectrum(image, kernel_size // 2)
+        blurred = fft.irfft2(spectrum * _kernel_spectrum(kernel_key, fft_shape)[..., None], s=fft_shape, axes=(0, 1))
+        h, w = self.shape[:2]
+        blurred = blurred[pad:pad + h, pad:pad + w].reshape(self.shape)
+        np.rint(blurred, out=blurred)
+        np.clip(blurred, 0, 255, out=blurred)
+        return blurred.astype(np.uint8)
+
+
+def apply_gaussian_blur(image: np.ndarray, kernel_size: int = 3, bank: Optional[BlurBank] = None) -> np.ndarray:
     """
     Apply Gaussian blur to an image.
     """
     # Kernel size must be odd and positive
     if kernel_size % 2 == 0:
         kernel_size += 1
+    if bank is not None and bank.prefers_fft(kernel_size, separable=True):
+        return bank.filter(image, ("gaussian", kernel_size), kernel_size)
     return cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
 
 def apply_median_filter(image: np.ndarray, kernel_size: int = 3) -> np.ndarray:
@@ -19,18 +141,11 @@ def apply_median_filter(image: np.ndarray, kernel_size: int = 3) -> np.ndarray:
         kernel_size += 1
     return cv2.medianBlur(image, kernel_size)
 
-def apply_motion_blur(image: np.ndarray, size: int = 5, angle: float = 0.0) -> np.ndarray:
+def apply_motion_blur(image: np.ndarray, size: int = 5, angle: float = 0.0,
+                      bank: Optional[BlurBank] = None) -> np.ndarray:
     """
     Apply Motion blur to an image.
     """
-    # Generating the kernel
-    kernel_motion_blur = np.zeros((size, size))
-    # Fill the middle row (horizontal motion)
-    kernel_motion_blur[int((size-1)/2), :] = np.ones(size)
-    kernel_motion_blur = kernel_motion_blur / size
-    
-    # Rotate kernel for angle
-    rotation_matrix = cv2.getRotationMatrix2D((size/2 -0.5 , size/2 -0.5 ) , angle, 1.0)
-    kernel_motion_blur = cv2.warpAffine(kernel_motion_blur, rotation_matrix, (size, size))
-
-    return cv2.filter2D(image, -1, kernel_motion_blur)
+    if bank is not None and bank.prefers_fft(size, separable=False):
+        return bank.filter(image, ("motion", size, float(angle)), size)
+    return cv2.filter2D(image, -1, motion_kernel(size, float(angle)))
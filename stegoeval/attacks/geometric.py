@@ -1,11 +1,21 @@
 import cv2
 import numpy as np
 
-def apply_rotation(image: np.ndarray, angle: float = 5.0) -> np.ndarray:
-    """
-    Rotate the image and optionally crop it to remove black borders.
-    """
-    h, w = image.shape[:2]
+# Geometric attacks can also describe themselves as an affine transform
+# (matrix, (width, height), fill): a 3x3 matrix mapping input pixel
+# coordinates to output ones, the output size, and whether uncovered output
+# pixels are filled black (True) or replicate the nearest edge (False).
+# Consecutive transforms compose into one cv2.warpAffine (see fuse_affine)
+# as long as no intermediate image is smaller than its input.
+
+def resize_matrix(src_size: tuple, dst_size: tuple) -> np.ndarray:
+    """Affine matrix of cv2.resize from (w, h) to (w, h) (pixel centres aligned)."""
+    sx, sy = dst_size[0] / src_size[0], dst_size[1] / src_size[1]
+    return np.array([[sx, 0, 0.5 * sx - 0.5], [0, sy, 0.5 * sy - 0.5], [0, 0, 1]])
+
+def rotation_transform(shape: tuple, angle: float = 5.0):
+    """Affine transform of apply_rotation for an image of `shape`."""
+    h, w = shape[:2]
     center = (w / 2, h / 2)
     
     # Calculate the rotation matrix
@@ -21,8 +31,56 @@ def apply_rotation(image: np.ndarray, angle: float = 5.0) -> np.ndarray:
     matrix[0, 2] += (new_w / 2) - center[0]
     matrix[1, 2] += (new_h / 2) - center[1]
     
+    return np.vstack([matrix, [0, 0, 1]]), (new_w, new_h), True
+
+def scaling_transform(shape: tuple, scale_factor: float = 1.5):
+    """Affine transform of apply_scaling for an image of `shape`."""
+    h, w = shape[:2]
+    size = (int(w * scale_factor), int(h * scale_factor))
+    return resize_matrix((w, h), size), size, False
+
+def cropping_transform(shape: tuple, percentage: float = 0.1):
+    """Affine transform (a pure translation) of apply_cropping for an image of `shape`."""
+    h, w = shape[:2]
+    crop_h = int(h * percentage)
+    crop_w = int(w * percentage)
+    if crop_h >= h // 2 or crop_w >= w // 2:
+        return np.eye(3), (w, h), False
+    return np.array([[1.0, 0, -crop_w], [0, 1.0, -crop_h], [0, 0, 1]]), (w - 2 * crop_w, h - 2 * crop_h), False
+
+def resize_transform(shape: tuple, size: tuple):
+    """Affine transform of apply_resize for an image of `shape`."""
+    h, w = shape[:2]
+    return resize_matrix((w, h), tuple(size)), tuple(size), False
+
+def fuse_affine(first, second):
+    """Transform applying `first` and then `second`."""
+    matrix, size, fill = first
+    return second[0] @ matrix, second[1], fill or second[2]
+
+def reduces_resolution(transform) -> bool:
+    """
+    Whether a transform shrinks the image along some direction.
+
+    The shrunken intermediate loses detail, so it is part of the attack
+    and cannot be fused away by a later upscale (or re-alignment).
+    """
+    return bool(np.linalg.svd(transform[0][:2, :2], compute_uv=False).min() < 1 - 1e-9)
+
+def apply_affine(image: np.ndarray, transform) -> np.ndarray:
+    """Resample `image` once through an affine transform (bilinear)."""
+    matrix, size, fill = transform
+    border = cv2.BORDER_CONSTANT if fill else cv2.BORDER_REPLICATE
+    return cv2.warpAffine(image, matrix[:2], size, flags=cv2.INTER_LINEAR, borderMode=border)
+
+def apply_rotation(image: np.ndarray, angle: float = 5.0) -> np.ndarray:
+    """
+    Rotate the image and optionally crop it to remove black borders.
+    """
+    matrix, size, _ = rotation_transform(image.shape, angle)
+    
     # Perform rotation
-    rotated = cv2.warpAffine(image, matrix, (new_w, new_h))
+    rotated = cv2.warpAffine(image, matrix[:2], size)
     
     return rotated
 
@@ -1,23 +1,58 @@
 import numpy as np
+from typing import Optional
 
-def apply_gaussian_noise(image: np.ndarray, mean: float = 0.0, var: float = 0.01) -> np.ndarray:
+# `scratch`: optional float32 array shaped like the image used for the
+# intermediate noise field (AttackRunner passes pooled buffers). Results are
+# always fresh arrays: attacked images outlive the call (queued, cached).
+# Randomness comes from a Generator seeded off NumPy's global RNG, so
+# np.random.seed() keeps runs reproducible.
+
+
+def _rng() -> np.random.Generator:
+    return np.random.default_rng(np.random.randint(0, 2**32, dtype=np.uint64))
+
+
+def _buffer(buffer: Optional[np.ndarray], image: np.ndarray, dtype) -> np.ndarray:
+    if buffer is None:
+        return np.empty(image.shape, dtype=dtype)
+    if buffer.shape != image.shape or buffer.dtype != dtype:
+        raise ValueError(f"Buffer must be {np.dtype(dtype).name} with shape {image.shape}")
+    return buffer
+
+
+# Poisson samples are drawn in bands of this many elements, so their int64
+# counts never take a full-image array
+POISSON_BAND = 1 << 16
+
+
+def _store(field: np.ndarray) -> np.ndarray:
+    """Clip a float32 field to [0, 255] in place and truncate it into a new uint8 image."""
+    np.clip(field, 0, 255, out=field)
+    return field.astype(np.uint8)
+
+
+def apply_gaussian_noise(image: np.ndarray, mean: float = 0.0, var: float = 0.01,
+                         scratch: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Apply Gaussian noise to an image.
     """
     sigma = var ** 0.5
-    gaussian = np.random.normal(mean, sigma, image.shape)
-    
-    noisy_image = image.astype(np.float32) + (gaussian * 255)
-    noisy_image = np.clip(noisy_image, 0, 255)
-    
-    return noisy_image.astype(np.uint8)
+    field = _buffer(scratch, image, np.float32)
+    _rng().standard_normal(dtype=np.float32, out=field)
+
+    # image + N(mean, sigma) * 255, in place
+    field *= sigma * 255
+    field += mean * 255
+    field += image
+
+    return _store(field)
 
 def apply_salt_pepper_noise(image: np.ndarray, amount: float = 0.05, salt_vs_pepper: float = 0.5) -> np.ndarray:
     """
     Apply Salt and Pepper noise to an image.
     """
     noisy_image = np.copy(image)
-    
+
     # Salt mode
     num_salt = np.ceil(amount * image.size * salt_vs_pepper)
     coords = [np.random.randint(0, i - 1, int(num_salt)) for i in image.shape]
@@ -27,30 +62,51 @@ def apply_salt_pepper_noise(image: np.ndarray, amount: float = 0.05, salt_vs_pep
     num_pepper = np.ceil(amount * image.size * (1. - salt_vs_pepper))
     coords = [np.random.randint(0, i - 1, int(num_pepper)) for i in image.shape]
     noisy_image[tuple(coords)] = 0
-    
+
     return noisy_image
 
-def apply_speckle_noise(image: np.ndarray, var: float = 0.04) -> np.ndarray:
+def apply_speckle_noise(image: np.ndarray, var: float = 0.04,
+                        scratch: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Apply Speckle noise (multiplicative) to an image.
     """
     sigma = var ** 0.5
-    gauss = np.random.normal(0, sigma, image.shape)
-    
-    noisy_image = image.astype(np.float32) + image.astype(np.float32) * gauss
-    noisy_image = np.clip(noisy_image, 0, 255)
-    
-    return noisy_image.astype(np.uint8)
+    field = _buffer(scratch, image, np.float32)
+    _rng().standard_normal(dtype=np.float32, out=field)
+
+    # image + image * N(0, sigma) == image * (1 + N(0, sigma)), in place
+    field *= sigma
+    field += 1
+    field *= image
 
-def apply_poisson_noise(image: np.ndarray) -> np.ndarray:
+    return _store(field)
+
+def poisson_levels(image: np.ndarray) -> int:
+    """Number of distinct intensity levels, rounded up to a power of two (per-image invariant)."""
+    if image.dtype == np.uint8:
+        levels = np.count_nonzero(np.bincount(image.ravel(), minlength=256))
+    else:
+        levels = len(np.unique(image))
+    return int(2 ** np.ceil(np.log2(levels)))
+
+def apply_poisson_noise(image: np.ndarray, levels: Optional[int] = None,
+                        scratch: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Apply Poisson noise to an image.
+
+    `levels` is poisson_levels(image); pass it when attacking the same image
+    repeatedly to skip the level count.
     """
-    vals = len(np.unique(image))
-    vals = 2 ** np.ceil(np.log2(vals))
-    
+    vals = levels if levels is not None else poisson_levels(image)
+
     # Adding a small constant to prevent division by zero or zeros turning into nan
-    noisy_image = np.random.poisson((image.astype(np.float32) + 1e-6) * vals) / float(vals)
-    noisy_image = np.clip(noisy_image, 0, 255)
-    
-    return noisy_image.astype(np.uint8)
+    field = _buffer(scratch, image, np.float32)
+    np.add(image, 1e-6, out=field, casting="unsafe")
+    field *= vals
+    # Same samples as one full-image draw (the generator fills in C order)
+    rng, flat = _rng(), field.reshape(-1)
+    for start in range(0, flat.size, POISSON_BAND):
+        band = flat[start:start + POISSON_BAND]
+        np.multiply(rng.poisson(band), 1.0 / vals, out=band, casting="unsafe")
+
+    return _store(field)
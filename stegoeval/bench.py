@@ -0,0 +1,252 @@
+"""
+StegoEval Performance Benchmarks
+
+Times the framework's own building blocks on synthetic data so performance
+regressions are caught before a nightly evaluation overruns:
+- every registered attack (stegoeval/attacks/*)
+- every distortion and robustness metric (stegoeval/metrics/*)
+- LSBStego embed/extract at several payload sizes
+- a fixed end-to-end Evaluator run on generated covers
+- the start-up time of `stegoeval info` (checked against a fixed budget)
+
+Everything runs offline. Results are written as JSON and can be compared
+against a stored baseline file; a case is flagged as a regression when its
+median time exceeds the baseline median by more than the threshold.
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Start-up budget (seconds) for `stegoeval info`; exceeding it is always a regression
+CLI_STARTUP_BUDGET = 0.5
+
+PAYLOAD_SIZES = [10, 100, 1000]
+
+# Parameters used for attacks whose defaults need an explicit value
+ATTACK_PARAMS = {
+    ("geometric", "resize"): {"size": (128, 128)},
+}
+
+
+def synthetic_cover(height: int = 256, width: int = 256, channels: int = 3, seed: int = 0) -> np.ndarray:
+    """Generate a deterministic natural-looking cover: smooth gradients plus texture noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = 127 + 60 * np.sin(x / 17.0) * np.cos(y / 23.0)
+    if channels == 1:
+        img = base + rng.normal(0, 12, (height, width))
+    else:
+        offsets = np.array([0, 20, -20], dtype=np.float32)[:channels]
+        img = base[..., None] + offsets + rng.normal(0, 12, (height, width, channels))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def _time_call(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time a zero-argument callable (one warm-up call, then `repeat` timed calls)."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "repeat": repeat,
+    }
+
+
+def _attack_cases(stego: np.ndarray) -> List[Tuple[str, Callable[[], Any]]]:
+    from stegoeval.core.attack_runner import AttackRunner
+
+    runner = AttackRunner()
+    cases = []
+    for category, attacks in runner.attack_registry.items():
+        for attack_name, attack_func in attacks.items():
+            params = ATTACK_PARAMS.get((category, attack_name), {})
+            cases.append((f"attacks.{category}.{attack_name}",
+                          lambda f=attack_func, p=params: f(stego, **p)))
+    return cases
+
+
+def _metric_cases(cover: np.ndarray, stego: np.ndarray) -> List[Tuple[str, Callable[[], Any]]]:
+    from stegoeval.metrics import distortion, robustness
+
+    distortion_funcs = [
+        distortion.calculate_mse, distortion.calculate_rmse, distortion.calculate_psnr,
+        distortion.calculate_ssim, distortion.calculate_aad, distortion.calculate_nad,
+        distortion.calculate_correlation_coefficient,
+    ]
+    cases = [(f"metrics.distortion.{f.__name__}", lambda f=f: f(cover, stego)) for f in distortion_funcs]
+
+    # Payload-side metrics at several sizes (text payloads, mostly matching)
+    rng = random.Random(0)
+    for size in PAYLOAD_SIZES:
+        original = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(size))
+        extracted = original[: size // 2] + original[size // 2:].upper()
+        cases.append((f"metrics.robustness.calculate_ber[{size}]",
+                      lambda o=original, e=extracted: robustness.calculate_ber(o, e)))
+        cases.append((f"metrics.robustness.calculate_ncc_text[{size}]",
+                      lambda o=original, e=extracted: robustness.calculate_ncc_text(o, e)))
+
+    cases.append(("metrics.robustness.calculate_npcr", lambda: robustness.calculate_npcr(cover, stego)))
+    cases.append(("metrics.robustness.calculate_uaci", lambda: robustness.calculate_uaci(cover, stego)))
+    return cases
+
+
+def _algorithm_cases(cover: np.ndarray) -> List[Tuple[str, Callable[[], Any]]]:
+    from stegoeval.stego_algorithms.example_lsb import LSBStego
+
+    algo = LSBStego()
+    cases = []
+    rng = random.Random(0)
+    for size in PAYLOAD_SIZES:
+        payload = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(size))
+        stego = algo.embed(cover, payload)
+        cases.append((f"algorithms.example_lsb.embed[{size}]", lambda p=payload: algo.embed(cover, p)))
+        cases.append((f"algorithms.example_lsb.extract[{size}]", lambda s=stego: algo.extract(s)))
+    return cases
+
+
+def _end_to_end_case(size: int) -> Tuple[str, Callable[[], Any], Callable[[], None]]:
+    """Fixed Evaluator run on synthetic covers written to a temporary dataset directory."""
+    import cv2
+    from stegoeval.core.evaluator import Evaluator
+    from stegoeval.stego_algorithms.example_lsb import LSBStego
+
+    tmp_dir = tempfile.TemporaryDirectory(prefix="stegoeval_bench_")
+    for i, channels in enumerate([3, 1]):
+        cv2.imwrite(os.path.join(tmp_dir.name, f"synth_{i}.png"), synthetic_cover(size, size, channels, seed=i))
+
+    config = {
+        "dataset_path": tmp_dir.name,
+        "payload_sizes": [10, 100],
+        "capacity": {"enabled": False},
+        "attacks": {
+            "compression": {"jpeg": [50, 90], "webp": [50]},
+            "noise": {"gaussian": [{"mean": 0.0, "var": 0.01}], "salt_pepper": [0.05], "speckle": [0.05]},
+            "filtering": {"gaussian_blur": [3, 7], "median": [3], "motion": [5]},
+            "geometric": {"rotation": [5.0], "scaling": [0.5, 1.5], "cropping": [0.1]},
+        },
+    }
+
+    def run():
+        random.seed(0)
+        np.random.seed(0)
+        Evaluator(config=config, algorithms=[LSBStego()]).evaluate()
+
+    return "end_to_end.evaluator", run, tmp_dir.cleanup
+
+
+def _cli_startup_time(repeat: int) -> Dict[str, float]:
+    """Wall time of `stegoeval info` in a fresh interpreter."""
+    command = [sys.executable, "-m", "stegoeval.cli", "info"]
+    return _time_call(lambda: subprocess.run(command, check=True, capture_output=True), repeat)
+
+
+def run_benchmarks(size: int = 256, repeat: int = 5, only: Optional[str] = None,
+                   progress: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        size: Side length of the synthetic covers in pixels
+        repeat: Timed repetitions per micro-benchmark
+        only: Optional substring filter on case names
+        progress: Callback receiving one line per finished case
+
+    Returns:
+        Dict with "meta" (environment) and "results" (case name -> timing stats)
+    """
+    cover = synthetic_cover(size, size, 3)
+    stego = np.clip(cover.astype(np.int16) + np.random.default_rng(1).integers(-2, 3, cover.shape), 0, 255).astype(np.uint8)
+
+    cases = _attack_cases(stego) + _metric_cases(cover, stego) + _algorithm_cases(cover)
+
+    results = {}
+    for name, func in cases:
+        if only and only not in name:
+            continue
+        np.random.seed(0)
+        results[name] = _time_call(func, repeat)
+        progress(f"{name:<55} {results[name]['median_s'] * 1000:10.3f} ms")
+
+    if not only or only in "end_to_end.evaluator":
+        name, func, cleanup = _end_to_end_case(min(size, 128))
+        try:
+            results[name] = _time_call(func, max(1, repeat // 2))
+        finally:
+            cleanup()
+        progress(f"{name:<55} {results[name]['median_s'] * 1000:10.3f} ms")
+
+    if not only or only in "startup.cli_info":
+        results["startup.cli_info"] = _cli_startup_time(max(1, repeat // 2))
+        results["startup.cli_info"]["budget_s"] = CLI_STARTUP_BUDGET
+        progress(f"{'startup.cli_info':<55} {results['startup.cli_info']['median_s'] * 1000:10.3f} ms")
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cover_size": size,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results against a baseline.
+
+    A case regresses when its median is more than `threshold` (relative) slower
+    than the baseline median. Cases with a fixed budget (CLI start-up) also
+    regress when they exceed it, baseline or not.
+
+    Returns:
+        List of regression records (name, baseline_s, current_s, change)
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+
+    for name, stats in current.get("results", {}).items():
+        current_s = stats["median_s"]
+
+        budget = stats.get("budget_s")
+        if budget is not None and current_s > budget:
+            regressions.append({"name": name, "baseline_s": budget, "current_s": current_s,
+                                "change": current_s / budget - 1.0, "reason": "budget"})
+            continue
+
+        if name not in base_results:
+            continue
+        baseline_s = base_results[name]["median_s"]
+        if baseline_s > 0 and current_s > baseline_s * (1.0 + threshold):
+            regressions.append({"name": name, "baseline_s": baseline_s, "current_s": current_s,
+                                "change": current_s / baseline_s - 1.0, "reason": "baseline"})
+
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
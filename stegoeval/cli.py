@@ -1,14 +1,10 @@
 import typer
-import yaml
 import os
-from typing import Optional
+from typing import List, Optional
 
-from stegoeval.config.schema import StegoEvalConfig
-from stegoeval.core.evaluator import Evaluator
-from stegoeval.reporting.report_generator import ReportGenerator
-
-# Import algorithms
-from stegoeval.stego_algorithms.example_lsb import LSBStego
+# Heavy modules (evaluator, reporting, pydantic config, algorithms) are imported
+# inside the commands that need them so `stegoeval info` and `--help` start fast.
+from stegoeval.stego_algorithms.registry import available_algorithms
 
 app = typer.Typer(help="StegoEval: A framework for evaluating steganography algorithms.")
 
@@ -16,6 +12,7 @@ app = typer.Typer(help="StegoEval: A framework for evaluating steganography algo
 def info():
     """Show information about StegoEval."""
     typer.echo("StegoEval Framework v0.1.0")
+    typer.echo(f"Registered algorithms: {', '.join(sorted(available_algorithms()))}")
 
 @app.command("run")
 def run_benchmark(
@@ -23,11 +20,37 @@ def run_benchmark(
     output_dir: str = typer.Option("./results", "--output", "-o", help="Directory to save evaluation results"),
     run_name: str = typer.Option("benchmark", "--name", "-n", help="Name for this benchmark run (used in output files)"),
     combo_attacks: bool = typer.Option(False, "--combo-attacks", help="Run combination attacks (all attack combinations - slower)"),
-    limit: Optional[int] = typer.Option(None, "--limit", "-l", help="Limit number of images to test")
+    limit: Optional[int] = typer.Option(None, "--limit", "-l", help="Limit number of images to test"),
+    algorithm: Optional[List[str]] = typer.Option(None, "--algorithm", "-a", help="Registered algorithm to evaluate (repeatable, overrides config)"),
+    timings: bool = typer.Option(False, "--timings", help="Record per-stage wall times (timings-<run>.csv and summary section)"),
+    profile: bool = typer.Option(False, "--profile", help="Profile the whole run and dump the profile next to the results"),
+    profile_mode: str = typer.Option("deterministic", "--profile-mode", help="Profiler: 'deterministic' (cProfile .pstats) or 'sampling' (folded stacks, for long runs)"),
+    profile_interval: float = typer.Option(0.005, "--profile-interval", help="Sampling interval in seconds for --profile-mode sampling"),
+    output_format: Optional[str] = typer.Option(None, "--format", "-f", help="Result storage: 'csv' or 'parquet' (partitioned, categories exported on demand)"),
+    live_scores: bool = typer.Option(False, "--live-scores", help="Show running scores in the progress bar and rewrite scores-<run>-live.csv during the run"),
+    prune_monotone: bool = typer.Option(False, "--prune-monotone", help="Run attack sweeps weakest to strongest and skip settings after total failures"),
+    prune_patience: Optional[int] = typer.Option(None, "--prune-patience", help="Consecutive total failures before the rest of a sweep is pruned"),
+    adaptive: bool = typer.Option(False, "--adaptive", help="Sample images in random order and stop once score confidence intervals are narrow enough"),
+    target_half_width: Optional[float] = typer.Option(None, "--target-half-width", help="Confidence interval half-width (score points) at which --adaptive stops"),
+    max_images: Optional[int] = typer.Option(None, "--max-images", help="Upper bound on images evaluated by --adaptive"),
+    async_mode: bool = typer.Option(False, "--async", help="Use the asyncio evaluator (many embed/extract calls in flight, for I/O-bound algorithms)"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", help="Maximum embed/extract calls in flight with --async"),
+    pipeline: bool = typer.Option(False, "--pipeline", help="Use the staged evaluator (embed/attack/extract/metrics stages on their own threads, bounded queues)"),
+    threads: Optional[str] = typer.Option(None, "--threads", help="Total thread budget (number or 'auto'), split between workers and OpenCV/BLAS threads"),
+    threads_per_worker: Optional[int] = typer.Option(None, "--threads-per-worker", help="OpenCV/BLAS threads per worker"),
+    memory_budget: Optional[str] = typer.Option(None, "--memory-budget", help="Estimated memory the pipeline evaluator may have in flight (e.g. 8GB, 'auto'); requires --pipeline"),
+    results_db: Optional[str] = typer.Option(None, "--db", help="SQLite results database to append this run to"),
+    plots: bool = typer.Option(False, "--plots", help="Render PSNR/BER/SSIM figures next to the results (unchanged figures are skipped)")
 ):
     """
     Run the benchmarking workflow using the provided configuration.
     """
+    import yaml
+    from stegoeval.config.schema import StegoEvalConfig
+    from stegoeval.core.threads import resolve_thread_layout, apply_thread_layout
+    from stegoeval.core.memory import parse_memory_size, RSSMonitor
+    from stegoeval.core.pipeline import stage_threads
+
     typer.echo(f"Starting StegoEval with config: {config_path}")
     
     # Load configuration
@@ -42,14 +65,74 @@ def run_benchmark(
             raw_config['combo_attacks'] = combo_attacks
         if limit is not None:
             raw_config['dataset_limit'] = limit
+        if algorithm:
+            raw_config['algorithms'] = algorithm
+        if timings or profile:
+            raw_config['timings'] = True
+        if output_format:
+            raw_config['output_format'] = output_format
+        if live_scores:
+            raw_config['live_scores'] = True
+        if prune_monotone:
+            raw_config['prune_monotone'] = True
+        if prune_patience is not None:
+            raw_config['prune_patience'] = prune_patience
+        if adaptive:
+            raw_config['adaptive_sampling'] = True
+        if target_half_width is not None:
+            raw_config['target_half_width'] = target_half_width
+        if max_images is not None:
+            raw_config['max_images'] = max_images
+        if async_mode:
+            raw_config['async_mode'] = True
+        if concurrency is not None:
+            raw_config['concurrency'] = concurrency
+        if pipeline:
+            raw_config['pipeline'] = True
+        if results_db:
+            raw_config['results_db'] = results_db
+        if plots:
+            raw_config['plots'] = True
+        if threads is not None:
+            raw_config['threads'] = int(threads) if threads.isdigit() else threads
+        if threads_per_worker is not None:
+            raw_config['threads_per_worker'] = threads_per_worker
+        if memory_budget is not None:
+            raw_config['memory_budget'] = int(memory_budget) if memory_budget.isdigit() else memory_budget
         
         # Validate config
         config = StegoEvalConfig(**raw_config).model_dump()
+        budget = parse_memory_size(config['memory_budget'])
+        if budget is not None and not config['pipeline']:
+            raise ValueError("memory_budget is only enforced by the pipeline evaluator; add --pipeline "
+                             "or drop --memory-budget")
         
     except Exception as e:
         typer.echo(f"Error loading configuration: {e}", err=True)
         raise typer.Exit(code=1)
 
+    # Fix the thread layout before NumPy/OpenCV are imported (BLAS reads its limits on load).
+    # The pipeline's workers are the threads of all its stages
+    if config['pipeline']:
+        workers, parallel = sum(stage_threads(config['pipeline_threads']).values()), True
+    else:
+        workers, parallel = config['async_threads'], config['async_mode']
+    config['thread_layout'] = resolve_thread_layout(
+        config['threads'], config['threads_per_worker'], workers=workers, parallel=parallel,
+    )
+    apply_thread_layout(config['thread_layout'])
+    if config['thread_layout']:
+        layout = config['thread_layout']
+        typer.echo(f"Threads: {layout['workers']} worker(s) x {layout['threads_per_worker']} "
+                   f"OpenCV/BLAS thread(s) on {layout['cores']} core(s)")
+
+    if budget is not None:
+        typer.echo(f"Memory budget: {budget / 2**20:,.1f} MiB")
+
+    from stegoeval.core.evaluator import Evaluator
+    from stegoeval.reporting.report_generator import ReportGenerator
+    from stegoeval.stego_algorithms.registry import load_algorithms
+
     typer.echo(f"Dataset path: {config['dataset_path']}")
     limit_str = str(config['dataset_limit']) if config['dataset_limit'] else 'All'
     typer.echo(f"Dataset limit: {limit_str}")
@@ -57,27 +140,241 @@ def run_benchmark(
     typer.echo(f"Run name: {config['run_name']}")
     typer.echo(f"Combo attacks: {config['combo_attacks']}")
 
-    # Register algorithms to evaluate
-    algorithms = [
-        LSBStego()
-        # Add more algorithms here
-    ]
+    # Instantiate the algorithms to evaluate (see stegoeval/stego_algorithms/registry.py)
+    try:
+        algorithms = load_algorithms(config['algorithms'])
+    except Exception as e:
+        typer.echo(f"Error loading algorithms: {e}", err=True)
+        raise typer.Exit(code=1)
     
     algo_names = [a.name() for a in algorithms]
     typer.echo(f"Loaded algorithms: {', '.join(algo_names)}")
 
     # Initialize Evaluator
-    evaluator = Evaluator(config=config, algorithms=algorithms)
+    if config['pipeline']:
+        if config['async_mode']:
+            typer.echo("Warning: async_mode is ignored when pipeline is enabled")
+        from stegoeval.core.pipeline_evaluator import PipelineEvaluator
+        evaluator = PipelineEvaluator(config=config, algorithms=algorithms, output_dir=output_dir)
+    elif config['async_mode']:
+        from stegoeval.core.async_evaluator import AsyncEvaluator
+        evaluator = AsyncEvaluator(config=config, algorithms=algorithms, output_dir=output_dir)
+    else:
+        evaluator = Evaluator(config=config, algorithms=algorithms, output_dir=output_dir)
     
-    # Run evaluation
-    results = evaluator.evaluate()
+    # Run evaluation (optionally under a profiler), tracking the run's peak RSS
+    rss = RSSMonitor().start()
+    profiler = None
+    if profile:
+        if profile_mode == "sampling":
+            from stegoeval.core.profiling import SamplingProfiler
+            profiler = SamplingProfiler(interval=profile_interval)
+            profiler.start()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+    
+    try:
+        results = evaluator.evaluate()
+    finally:
+        config['run_memory'] = {"peak_rss_bytes": rss.stop(), **evaluator.memory_budget.summary()}
+        if profiler is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            if profile_mode == "sampling":
+                profiler.stop()
+                profile_path = os.path.join(output_dir, f"profile-{config['run_name']}.folded")
+                profiler.dump(profile_path)
+            else:
+                profiler.disable()
+                profile_path = os.path.join(output_dir, f"profile-{config['run_name']}.pstats")
+                profiler.dump_stats(profile_path)
+            typer.echo(f"Profile saved to {profile_path}")
     
     # Generate Reports (capacity is now included in evaluator if enabled)
-    reporter = ReportGenerator(output_dir=output_dir, run_name=config['run_name'])
-    reporter.generate(results)
+    reporter = ReportGenerator(output_dir=output_dir, run_name=config['run_name'], output_format=config['output_format'],
+                               score_pruned=config['score_pruned'], results_db=config['results_db'],
+                               plots=config['plots'], plot_workers=config['plot_workers'],
+                               bootstrap_replicates=config['bootstrap_replicates'],
+                               confidence_level=config['confidence_level'], bootstrap_seed=config['bootstrap_seed'])
+    reporter.generate(results, timings=evaluator.timer.summary(), scoreboard=evaluator.scoreboard,
+                      precision=evaluator.precision, breaking_points=evaluator.breaking_points, config=config,
+                      pipeline_stats=getattr(evaluator, "pipeline_stats", None))
 
     typer.echo(f"\n--- Benchmark Complete ---")
     typer.echo(f"Results saved to: {output_dir}")
 
+@app.command("export")
+def export(
+    output_dir: str = typer.Option("./results", "--output", "-o", help="Directory containing the run's results"),
+    run_name: str = typer.Option("benchmark", "--name", "-n", help="Name of the run to export"),
+    category: Optional[List[str]] = typer.Option(None, "--category", "-c", help="Attack category to export (repeatable)"),
+    algorithm: Optional[List[str]] = typer.Option(None, "--algorithm", "-a", help="Algorithm to export (repeatable)"),
+    fmt: str = typer.Option("csv", "--format", "-f", help="Export format: 'csv' or 'parquet'"),
+    dest: Optional[str] = typer.Option(None, "--dest", "-d", help="Destination file (default: results-<run>[-<category>].<format> in the output directory)")
+):
+    """
+    Export a slice of a run's results (e.g. one attack category) as CSV or Parquet.
+    """
+    from stegoeval.reporting.export import export_results
+
+    try:
+        path = export_results(output_dir, run_name, fmt=fmt, dest=dest, algorithms=algorithm, categories=category)
+    except Exception as e:
+        typer.echo(f"Error exporting results: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Exported results to {path}")
+
+@app.command("query")
+def query(
+    db: str = typer.Option("./results/stegoeval.db", "--db", help="SQLite results database"),
+    metric: str = typer.Option("ber", "--metric", "-m", help="Result column to average (ber, ssim, psnr, extract_time_ms, ...)"),
+    algorithm: Optional[List[str]] = typer.Option(None, "--algorithm", "-a", help="Algorithm (repeatable)"),
+    category: Optional[List[str]] = typer.Option(None, "--category", "-c", help="Attack category (repeatable)"),
+    attack: Optional[List[str]] = typer.Option(None, "--attack", help="Attack name, e.g. jpeg (repeatable)"),
+    params: Optional[List[str]] = typer.Option(None, "--params", "-p", help="Attack parameters as stored, e.g. 50 (repeatable)"),
+    image: Optional[List[str]] = typer.Option(None, "--image", "-i", help="Cover image filename (repeatable)"),
+    last: Optional[int] = typer.Option(None, "--last", help="Only the most recent N runs"),
+    runs: bool = typer.Option(False, "--runs", help="List stored runs instead")
+):
+    """
+    Track a metric across stored runs, e.g. one algorithm's JPEG-50 BER over the last 20 runs.
+    """
+    from stegoeval.reporting.database import ResultsDatabase
+
+    if not os.path.exists(db):
+        typer.echo(f"No results database at {db}", err=True)
+        raise typer.Exit(code=1)
+
+    database = ResultsDatabase(db)
+    try:
+        if runs:
+            table = database.runs(limit=last)
+        else:
+            table = database.query(metric=metric, algorithms=algorithm, categories=category, attacks=attack,
+                                   params=params, images=image, last=last)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=1)
+    finally:
+        database.close()
+
+    typer.echo(table.to_markdown(index=False) if not table.empty else "No matching rows.")
+
+@app.command("compare")
+def compare(
+    run_a: str = typer.Argument(..., help="Reference run (id or name)"),
+    run_b: str = typer.Argument(..., help="Run to compare (id or name)"),
+    db: str = typer.Option("./results/stegoeval.db", "--db", help="SQLite results database"),
+    alpha: float = typer.Option(0.05, "--alpha", help="Significance level of the paired tests"),
+    all_rows: bool = typer.Option(False, "--all", help="Show all metrics, not only significant changes")
+):
+    """
+    Compare two stored runs on matched rows and report significant score and latency changes.
+    """
+    from stegoeval.reporting.database import ResultsDatabase
+
+    if not os.path.exists(db):
+        typer.echo(f"No results database at {db}", err=True)
+        raise typer.Exit(code=1)
+
+    database = ResultsDatabase(db)
+    try:
+        table = database.compare(run_a, run_b, alpha=alpha)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=1)
+    finally:
+        database.close()
+
+    if table.empty:
+        typer.echo("No matching rows between the two runs.")
+        return
+    if not all_rows:
+        table = table[table["significant"]]
+        if table.empty:
+            typer.echo(f"No significant changes (alpha={alpha}).")
+            return
+    typer.echo(table.to_markdown(index=False, floatfmt=".4g"))
+
+@app.command("plan")
+def plan(
+    config_path: str = typer.Option("config/default_config.yaml", "--config", "-c", help="Path to the configuration file"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Number of parallel workers to predict for"),
+    sample: int = typer.Option(2, "--sample", "-s", help="Covers evaluated per algorithm to calibrate the cost model"),
+    combo_attacks: bool = typer.Option(False, "--combo-attacks", help="Plan with combination attacks enabled"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-l", help="Limit number of images to plan for"),
+    algorithm: Optional[List[str]] = typer.Option(None, "--algorithm", "-a", help="Registered algorithm (repeatable, overrides config)")
+):
+    """
+    Predict wall time, peak memory and output size of a run without executing it.
+    """
+    import yaml
+    from stegoeval.config.schema import StegoEvalConfig
+    from stegoeval.planner import plan_run, format_plan
+
+    try:
+        with open(config_path, "r") as f:
+            raw_config = yaml.safe_load(f)
+        if combo_attacks:
+            raw_config['combo_attacks'] = True
+        if limit is not None:
+            raw_config['dataset_limit'] = limit
+        if algorithm:
+            raw_config['algorithms'] = algorithm
+        config = StegoEvalConfig(**raw_config).model_dump()
+    except Exception as e:
+        typer.echo(f"Error loading configuration: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        result = plan_run(config, workers=workers, sample_images=sample, progress=typer.echo)
+    except Exception as e:
+        typer.echo(f"Error planning run: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(format_plan(result))
+
+@app.command("bench")
+def bench(
+    output: str = typer.Option("./results/bench.json", "--output", "-o", help="Path of the JSON results file"),
+    baseline: Optional[str] = typer.Option(None, "--baseline", "-b", help="Baseline JSON to compare against"),
+    threshold: float = typer.Option(0.25, "--threshold", "-t", help="Relative slowdown flagged as a regression (0.25 = 25%)"),
+    repeat: int = typer.Option(5, "--repeat", "-r", help="Timed repetitions per micro-benchmark"),
+    size: int = typer.Option(256, "--size", "-s", help="Side length of the synthetic cover images"),
+    only: Optional[str] = typer.Option(None, "--only", help="Only run cases whose name contains this string"),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Also write the results to the --baseline path")
+):
+    """
+    Benchmark attacks, metrics, algorithms and an end-to-end run on synthetic data.
+    """
+    from stegoeval.bench import run_benchmarks, compare_to_baseline, load_results, save_results
+
+    typer.echo(f"Running StegoEval benchmarks (cover {size}x{size}, repeat={repeat})")
+    results = run_benchmarks(size=size, repeat=repeat, only=only, progress=typer.echo)
+    save_results(results, output)
+    typer.echo(f"Benchmark results saved to {output}")
+
+    regressions = []
+    if baseline and os.path.exists(baseline) and not save_baseline:
+        regressions = compare_to_baseline(results, load_results(baseline), threshold)
+    elif baseline and save_baseline:
+        save_results(results, baseline)
+        typer.echo(f"Baseline saved to {baseline}")
+    else:
+        # Fixed budgets apply even without a baseline
+        regressions = compare_to_baseline(results, {}, threshold)
+
+    if regressions:
+        typer.echo(f"\n{len(regressions)} regression(s) detected:", err=True)
+        for reg in regressions:
+            label = "budget" if reg["reason"] == "budget" else "baseline"
+            typer.echo(f"  {reg['name']}: {reg['current_s'] * 1000:.3f} ms vs {label} {reg['baseline_s'] * 1000:.3f} ms "
+                       f"(+{reg['change'] * 100:.1f}%)", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo("No regressions detected.")
+
 if __name__ == "__main__":
     app()
@@ -8,6 +8,13 @@ class StegoEvalConfig(BaseModel):
     dataset_path: str = "./data"
     dataset_limit: Union[int, None] = None
     
+    # Evaluate pixel-identical covers once and copy their rows to every filename
+    # (dataset_limit selects files first). Pixel hashes are cached in
+    # dataset_manifest (default: <output dir>/.stegoeval-manifest.json).
+    # Opt-in: copied rows carry a duplicate_of column
+    deduplicate: bool = False
+    dataset_manifest: Optional[str] = None
+    
     # Payload configuration
     payload: str = "STEGOEVAL_SECRET"
     payload_sizes: List[int] = [10, 100, 1000, 5000]
@@ -16,6 +23,100 @@ class StegoEvalConfig(BaseModel):
     run_name: str = "benchmark"
     combo_attacks: bool = False
     
+    # Fuse runs of two or more consecutive geometric attacks into one cv2.warpAffine
+    # and warp the cover-size image for metrics straight from the run's input (one
+    # resample instead of one per metric). Single geometric steps keep their own
+    # implementation for the attacked image. Off by default: distortion metrics of
+    # geometric attacks change slightly (one interpolation instead of two)
+    geometric_fusion: bool = False
+    
+    # Registered algorithm names to evaluate (see stego_algorithms/registry.py)
+    algorithms: List[str] = ["example_lsb"]
+    
+    # Record per-stage wall times (written to timings-<run>.csv)
+    timings: bool = False
+    
+    # Blind steganalysis (chi-square, RS, SPA) of every clean stego image and its
+    # cover; adds detector columns to clean rows and detectability_score to the scores.
+    # Opt-in: three detectors per clean row cost time and change the output columns
+    detectability: bool = False
+    
+    # Trace peak memory of every embed/extract call with tracemalloc (slows the call
+    # itself; ignored by the async and pipeline evaluators)
+    track_memory: bool = False
+    
+    # Result storage: "csv" (full + per-category CSVs) or "parquet" (partitioned dataset)
+    output_format: str = "csv"
+    
+    # Streaming scores during the run (progress bar + scores-<run>-live.csv every N seconds)
+    live_scores: bool = False
+    live_scores_interval: float = 30.0
+    
+    # Monotone-strength pruning: run each attack sweep weakest -> strongest and skip
+    # the rest after `prune_patience` consecutive total failures (BER >= prune_failure_ber).
+    # Skipped settings are recorded as pruned, inferred-failed rows; `score_pruned`
+    # decides whether scoring counts them.
+    prune_monotone: bool = False
+    prune_patience: int = 1
+    prune_failure_ber: float = 0.4
+    score_pruned: bool = True
+    
+    # Adaptive sampling: process images in random order and stop once every
+    # algorithm x category score's confidence interval is within +/- target_half_width
+    # score points (after at least min_images), or after max_images
+    adaptive_sampling: bool = False
+    target_half_width: float = 1.0
+    confidence_level: float = 0.95
+    min_images: int = 10
+    max_images: Optional[int] = None
+    sampling_seed: Optional[int] = None
+    
+    # Percentile bootstrap intervals (at confidence_level) for every score in the
+    # scores CSVs and the summary, resampling images; 0 (default) disables them
+    bootstrap_replicates: int = 0
+    bootstrap_seed: Optional[int] = None
+    
+    # asyncio evaluator for I/O-bound (e.g. CLI) algorithms: at most `concurrency`
+    # embed/extract calls in flight, attacks/metrics on `async_threads` worker threads
+    async_mode: bool = False
+    concurrency: int = 8
+    async_threads: Optional[int] = None
+    
+    # Staged evaluator: load -> embed -> attack -> extract -> metrics -> sink connected by
+    # bounded queues of pipeline_queue_size items; pipeline_threads sets the threads of the
+    # embed, attack, extract and metrics stages (defaults 1, 2, 1, 2). Per-stage queue
+    # statistics are written to pipeline-<run>.csv
+    pipeline: bool = False
+    pipeline_threads: Dict[str, int] = {}
+    pipeline_queue_size: int = 64
+    
+    # Memory budget (bytes, "4GB", "512MiB" or "auto" = 80% of physical memory): the
+    # pipeline evaluator admits a task only while the estimated footprint of all tasks
+    # in flight stays under it. Requires pipeline: true (the other evaluators reject it);
+    # peak RSS is reported for every run either way
+    memory_budget: Optional[Union[int, str]] = None
+    
+    # Thread budget: total threads (number or "auto" = all cores) split between
+    # workers (async evaluator threads) and OpenCV/BLAS threads per worker.
+    # Unset leaves every library at its default.
+    threads: Optional[Union[int, str]] = None
+    threads_per_worker: Optional[int] = None
+    
+    # Breaking-point search (robustness_threshold mode): for every configured attack
+    # with a numeric strength parameter, bisect for the weakest setting whose BER
+    # exceeds ber_threshold instead of sweeping its grid. Keys: enabled,
+    # ber_threshold (0.0), resolution (fraction of the float range, 0.01),
+    # bounds ({attack_name: [weakest, strongest]})
+    robustness_threshold: Dict[str, Any] = {}
+    
+    # Render PSNR-vs-JPEG, BER-vs-noise and SSIM-vs-rotation figures after the run
+    # in up to `plot_workers` processes (default: one per core); unchanged figures are skipped
+    plots: bool = False
+    plot_workers: Optional[int] = None
+    
+    # SQLite file each run is appended to (queried with `stegoeval query` / `stegoeval compare`)
+    results_db: Optional[str] = None
+    
     # Capacity test configuration
     capacity: Dict[str, Any] = {}
     
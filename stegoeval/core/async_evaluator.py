@@ -0,0 +1,264 @@
+import asyncio
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+from typing import Dict, Any, List, Optional, Tuple
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.async_base import AsyncStegoAlgorithm, SyncAlgorithmAdapter, as_async
+from stegoeval.attacks.compression import apply_jpeg_compression
+
+
+class AsyncEvaluator(Evaluator):
+    """
+    asyncio-driven evaluation loop for I/O-bound algorithms.
+
+    Every image x algorithm x payload is one task. A producer loads images
+    lazily and queues their tasks; `concurrency` workers run one task at a
+    time each, so at most `concurrency` tasks hold images at once. Embed/extract
+    calls are awaited on the algorithms (AsyncStegoAlgorithm, sync ones go
+    through as_async), with at most `concurrency` calls in flight.
+    Attacks and metrics are CPU work and run in a thread pool (OpenCV and
+    NumPy release the GIL). Rows have the same columns as Evaluator's, but
+    are recorded in completion order.
+
+    Supports clean, individual and combination attacks and the capacity
+    search (sync algorithms only). Monotone pruning, breaking-point search
+    and adaptive sampling are sequential by design and use Evaluator.
+    """
+
+    def __init__(self, config: dict, algorithms: List[Any], output_dir: Optional[str] = None):
+        super().__init__(config, algorithms, output_dir=output_dir)
+        self.async_algorithms = [as_async(algo) for algo in algorithms]
+        self.concurrency = config.get("concurrency", 8)
+        # tracemalloc is process-wide: traces would include the worker threads' allocations
+        self.track_memory = False
+        # Thread budget (core/threads.py) decides the pool size when configured
+        layout = config.get("thread_layout")
+        self.worker_threads = layout["workers"] if layout else config.get("async_threads", None)
+
+        for option in ("prune_monotone", "adaptive_sampling"):
+            if config.get(option):
+                print(f"Warning: {option} is not supported by the async evaluator and is ignored")
+        if self.threshold_search:
+            print("Warning: robustness_threshold is not supported by the async evaluator and is ignored")
+
+    async def _in_pool(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def _call_algorithm_async(self, algo: AsyncStegoAlgorithm, stage: str, *args) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Await algo.embed / algo.extract under the concurrency limit and measure its latency.
+
+        Peak memory is only reported when the algorithm provides it; concurrent
+        calls cannot be traced separately with tracemalloc.
+        """
+        async with self._semaphore:
+            start = time.perf_counter()
+            output = await getattr(algo, stage)(*args)
+            elapsed = time.perf_counter() - start
+            # Read before another call on the same instance can overwrite it
+            peak = getattr(algo, "last_peak_memory", None)
+        if self.timer.enabled:
+            self.timer.record(stage, elapsed)
+
+        return output, {
+            f"{stage}_time_ms": elapsed * 1000,
+            f"{stage}_peak_kb": peak / 1024 if peak is not None else None,
+        }
+
+    async def _extract_row(self, algo: AsyncStegoAlgorithm, result: Dict[str, Any], payload: str,
+                           image: np.ndarray) -> Dict[str, Any]:
+        """Fill the robustness columns of `result` from an extract of `image`."""
+        try:
+            extracted, extract_cost = await self._call_algorithm_async(algo, "extract", image)
+            result.update(extract_cost)
+            result["extracted_payload"] = extracted
+            result["ber"], result["ncc_secret"] = self._compute_robustness_metrics(payload, extracted)
+            result["payload_recovered"] = result["ber"] == 0.0
+        except Exception as e:
+            result["extracted_payload"] = f"ERROR: {e}"
+            result["ber"] = 1.0
+            result["ncc_secret"] = 0.0
+            result["payload_recovered"] = False
+        return result
+
+    def _attacked_row(self, img_name: str, algo_name: str, payload: str, category: str, attack_name: str,
+                      params: str, metrics: Dict[str, float], cost: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "image": img_name,
+            "algorithm": algo_name,
+            "payload_size": len(payload),
+            "attack_category": category,
+            "attack_name": attack_name,
+            "attack_params": params,
+
+            # Distortion metrics
+            **metrics,
+
+            # Robustness metrics
+            "ber": 1.0,
+            "ncc_secret": 0.0,
+            "payload_recovered": False,
+            "embedded_payload": payload,
+            "extracted_payload": "",
+
+            # Algorithm cost metrics
+            **cost
+        }
+
+    async def _attack_task(self, algo: AsyncStegoAlgorithm, img_name: str, cover_img: np.ndarray,
+                           stego_img: np.ndarray, payload: str, cost: Dict[str, Any], category: str,
+                           attack_name: str, params: str, chain: List[Tuple[str, str, Any]],
+                           attack_stats: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        try:
+            attacked_img, comparable = await self._in_pool(self._apply_attack_chain, stego_img, chain,
+                                                           cover_img.shape, attack_stats)
+            metrics = await self._in_pool(self._compute_distortion_metrics, cover_img, comparable)
+        except Exception as e:
+            print(f"Warning: Attack {attack_name}.{category} failed: {e}")
+            return None
+        result = self._attacked_row(img_name, algo.name(), payload, category, attack_name, params, metrics, cost)
+        result.update(attack_stats or {})
+        return await self._extract_row(algo, result, payload, attacked_img)
+
+    async def _evaluate_task(self, img_name: str, cover_img: np.ndarray, algo: AsyncStegoAlgorithm,
+                             payload: str) -> List[Dict[str, Any]]:
+        """Async counterpart of Evaluator._evaluate_image_algorithm."""
+        algo_name = algo.name()
+
+        # 1. Embed payload
+        try:
+            stego_img, embed_cost = await self._call_algorithm_async(algo, "embed", cover_img, payload)
+        except Exception as e:
+            return [{"image": img_name, "algorithm": algo_name, "error": f"Embed failed: {e}"}]
+
+        cost = {
+            "cover_megapixels": cover_img.shape[0] * cover_img.shape[1] / 1e6,
+            **embed_cost,
+            "extract_time_ms": None,
+            "extract_peak_kb": None,
+        }
+
+        # 2. Clean row (cover vs stego)
+        metrics = await self._in_pool(self._compute_distortion_metrics, cover_img, stego_img)
+        metrics.update(await self._in_pool(self._compute_detectability_metrics, cover_img, stego_img))
+        base_result = self._attacked_row(img_name, algo_name, payload, "none", "clean", "none", metrics, cost)
+        base_result.update(ber=0.0, ncc_secret=1.0, payload_recovered=True)
+
+        # 3-4. Individual and combination attacks, all in flight together
+        attack_configs = self._get_attack_configurations()
+        jobs = [
+            self._attack_task(algo, img_name, cover_img, stego_img, payload, cost, category, attack_name,
+                              str(params), [(category, attack_name, params)], {})
+            for category, attack_name, params in attack_configs
+        ]
+        if self.combo_attacks and attack_configs:
+            for combo in self._generate_combinations(attack_configs):
+                combo_name = "+".join(attack_name for _, attack_name, _ in combo)
+                combo_params = self._combo_params(combo)
+                jobs.append(self._attack_task(algo, img_name, cover_img, stego_img, payload, cost, "combo",
+                                              combo_name, combo_params, combo))
+
+        rows = await asyncio.gather(self._extract_row(algo, base_result, payload, stego_img), *jobs)
+        return [row for row in rows if row is not None]
+
+    async def _baseline_task(self, img_name: str, cover_img: np.ndarray) -> List[Dict[str, Any]]:
+        try:
+            baseline_img = await self._in_pool(apply_jpeg_compression, cover_img, 95)
+            metrics = await self._in_pool(self._compute_distortion_metrics, cover_img, baseline_img)
+        except Exception as e:
+            print(f"Warning: Baseline calculation failed for {img_name}: {e}")
+            return []
+        return [{
+            "image": img_name,
+            "algorithm": "COVER_IMAGE_BASELINE",
+            "payload_size": 0,
+            "attack_category": "baseline",
+            "attack_name": "clean_jpeg_save",
+            "attack_params": "quality=95",
+            **metrics,
+            "ber": 0.0,
+            "ncc_secret": 0.0,
+            "payload_recovered": False,
+            "embedded_payload": "N/A",
+            "extracted_payload": "N/A"
+        }]
+
+    async def _capacity_task(self, img_name: str, cover_img: np.ndarray, algo: AsyncStegoAlgorithm) -> List[Dict[str, Any]]:
+        if not isinstance(algo, SyncAlgorithmAdapter):
+            print(f"Warning: Capacity search needs a synchronous algorithm, skipped for {algo.name()}")
+            return []
+        async with self._semaphore:
+            with self.timer.time("capacity_search"):
+                return [await algo.run_sync(self._evaluate_max_text_length, img_name, cover_img, algo.algorithm)]
+
+    async def _produce(self, images, queue: asyncio.Queue, workers: int):
+        """Load images one at a time (off the event loop) and queue their tasks, then one stop marker per worker."""
+        payload_sizes = self.config.get("payload_sizes", [10, 100, 1000, 5000])
+        capacity_enabled = self.config.get("capacity", {}).get("enabled", False)
+        per_task = 1 + self._attacks_per_task
+
+        while True:
+            with self.timer.time("load_images"):
+                item = await self._in_pool(next, images, None)
+            if item is None:
+                break
+            img_name, cover_img = item
+            await queue.put((self._baseline_task(img_name, cover_img), 0))
+            for algo in self.async_algorithms:
+                for size in payload_sizes:
+                    payload = self._generate_random_payload(size)
+                    await queue.put((self._evaluate_task(img_name, cover_img, algo, payload), per_task))
+                if capacity_enabled:
+                    await queue.put((self._capacity_task(img_name, cover_img, algo), 1))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def _work(self, queue: asyncio.Queue, pbar):
+        while (job := await queue.get()) is not None:
+            coro, steps = job
+            rows = await coro
+            self._record(rows)
+            self._publish_live_scores(pbar)
+            pbar.update(steps)
+
+    async def _evaluate_all(self) -> List[Dict[str, Any]]:
+        payload_sizes = self.config.get("payload_sizes", [10, 100, 1000, 5000])
+        capacity_enabled = self.config.get("capacity", {}).get("enabled", False)
+
+        num_images = len(self.dataset_loader)
+        if self.limit:
+            num_images = min(num_images, self.limit)
+        if not num_images:
+            print("No images found to evaluate.")
+            return self.results
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        attack_configs = self._get_attack_configurations()
+        combo_multiplier = len(self._generate_combinations(attack_configs)) if self.combo_attacks else 0
+        self._attacks_per_task = len(attack_configs) + combo_multiplier
+        per_image = len(payload_sizes) * (1 + self._attacks_per_task) + (1 if capacity_enabled else 0)
+        total_steps = num_images * len(self.async_algorithms) * per_image
+
+        # At most `concurrency` tasks run at once and each worker starts a task only
+        # when its previous one is done, so covers, stegos and attacked images of the
+        # rest of the dataset are never held (images are loaded as tasks are queued)
+        workers = self.concurrency
+        queue = asyncio.Queue(maxsize=workers)
+        images = iter(self.dataset_loader.get_images(limit=self.limit))
+
+        with self.timer.time("total"), tqdm(total=total_steps, desc="Evaluating (async)", unit="step") as pbar:
+            await asyncio.gather(self._produce(images, queue, workers),
+                                 *(self._work(queue, pbar) for _ in range(workers)))
+            self._publish_live_scores(pbar, force=True)
+
+        self._alias_duplicates()
+        return self.results
+
+    def evaluate(self) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=self.worker_threads, thread_name_prefix="stegoeval-cpu") as pool:
+            self._pool = pool
+            return asyncio.run(self._evaluate_all())
@@ -1,15 +1,62 @@
 import inspect
+import math
+import threading
+import weakref
 import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import all attack functions
 from stegoeval.attacks.compression import apply_jpeg_compression, apply_webp_compression
-from stegoeval.attacks.noise import apply_gaussian_noise, apply_salt_pepper_noise, apply_speckle_noise, apply_poisson_noise
-from stegoeval.attacks.filtering import apply_gaussian_blur, apply_median_filter, apply_motion_blur
-from stegoeval.attacks.geometric import apply_rotation, apply_scaling, apply_cropping, apply_resize
+from stegoeval.attacks.noise import (
+    apply_gaussian_noise, apply_salt_pepper_noise, apply_speckle_noise, apply_poisson_noise, poisson_levels
+)
+from stegoeval.attacks.filtering import BlurBank, apply_gaussian_blur, apply_median_filter, apply_motion_blur
+from stegoeval.attacks.geometric import (
+    apply_rotation, apply_scaling, apply_cropping, apply_resize,
+    rotation_transform, scaling_transform, cropping_transform, resize_transform
+)
+
+
+class BufferPool:
+    """
+    Per-thread scratch arrays keyed by (shape, dtype).
+
+    Attacks get the same float32 scratch buffer for every call on images of
+    one shape instead of allocating a new noise field each time. Buffers
+    are per thread, so concurrent workers (e.g. the async evaluator's
+    thread pool) never share one. Scratch contents must not outlive the
+    attack call that borrowed it.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, shape: tuple, dtype=np.float32) -> np.ndarray:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        key = (shape, np.dtype(dtype))
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def clear(self):
+        self._local.buffers = {}
 
 
 class AttackRunner:
+    # Attacks that take a pooled float32 `scratch` buffer
+    SCRATCH_ATTACKS = {("noise", "gaussian"), ("noise", "speckle"), ("noise", "poisson")}
+    # Linear blurs that share a per-image BlurBank (FFT path for large kernels)
+    BANK_ATTACKS = {("filtering", "gaussian_blur"), ("filtering", "motion")}
+
     def __init__(self):
+        # Scratch arrays recycled across attack calls (per thread)
+        self.buffers = BufferPool()
+        # id(image) -> (weakref to image, {invariant name: value}) for per-image invariants
+        self._invariants = {}
+        
         # Map attack names to their corresponding functions
         self.attack_registry = {
             "compression": {
@@ -34,8 +81,166 @@ class AttackRunner:
                 "resize": apply_resize
             }
         }
+        
+        # Affine form of each geometric attack: f(image shape, **kwargs) ->
+        # (matrix, size, fill), used to fuse geometric chains into one warp
+        self.geometric_transforms = {
+            "rotation": rotation_transform,
+            "scaling": scaling_transform,
+            "cropping": cropping_transform,
+            "resize": resize_transform
+        }
+        
+        # Attack strength as a function of the resolved kwargs (higher = stronger).
+        # Only attacks whose effect grows monotonically with one parameter are
+        # listed; everything else is never reordered or pruned.
+        self.attack_strength = {
+            "compression": {
+                "jpeg": lambda kw: -kw["quality"],
+                "webp": lambda kw: -kw["quality"]
+            },
+            "noise": {
+                "gaussian": lambda kw: kw["var"],
+                "salt_pepper": lambda kw: kw["amount"],
+                "speckle": lambda kw: kw["var"]
+            },
+            "filtering": {
+                "gaussian_blur": lambda kw: kw["kernel_size"],
+                "median": lambda kw: kw["kernel_size"],
+                "motion": lambda kw: kw["size"]
+            },
+            "geometric": {
+                "rotation": lambda kw: abs(kw["angle"]),
+                "scaling": lambda kw: abs(math.log(kw["scale_factor"])),
+                "cropping": lambda kw: kw["percentage"]
+            }
+        }
+        
+        # Attacks whose settings form more than one monotone sweep: the direction
+        # of a setting (resolved kwargs -> hashable) is part of its sweep key.
+        # Up- and downscaling are separate sweeps, each monotone in |log(scale)|.
+        self.attack_direction = {
+            "geometric": {
+                "scaling": lambda kw: int(np.sign(math.log(kw["scale_factor"])))
+            }
+        }
+        
+        # Breaking-point search space of the monotone attacks:
+        # (parameter, weakest value, strongest value, kind) where kind is
+        # "int", "odd" (kernel sizes) or "float". Scaling is searched in the
+        # downscaling direction only.
+        self.strength_search = {
+            "compression": {
+                "jpeg": ("quality", 100, 1, "int"),
+                "webp": ("quality", 100, 1, "int")
+            },
+            "noise": {
+                "gaussian": ("var", 0.0, 1.0, "float"),
+                "salt_pepper": ("amount", 0.0, 1.0, "float"),
+                "speckle": ("var", 0.0, 1.0, "float")
+            },
+            "filtering": {
+                "gaussian_blur": ("kernel_size", 1, 31, "odd"),
+                "median": ("kernel_size", 1, 31, "odd"),
+                "motion": ("size", 1, 31, "int")
+            },
+            "geometric": {
+                "rotation": ("angle", 0.0, 90.0, "float"),
+                "scaling": ("scale_factor", 1.0, 0.1, "float"),
+                "cropping": ("percentage", 0.0, 0.49, "float")
+            }
+        }
+
+    def image_invariant(self, image: np.ndarray, name: str, compute):
+        """
+        Cached per-image value (e.g. the Poisson level count of a stego image).
+
+        Entries are tied to the array object through a weak reference: they
+        are dropped when the image is freed, and a new image with a recycled
+        id() never sees stale values. Cached values must not reference the
+        image themselves.
+        """
+        key = id(image)
+        entry = self._invariants.get(key)
+        if entry is None or entry[0]() is not image:
+            invariants = self._invariants
+            entry = invariants[key] = (weakref.ref(image, lambda _, key=key: invariants.pop(key, None)), {})
+        values = entry[1]
+        if name not in values:
+            values[name] = compute(image)
+        return values[name]
+
+    def _attack_kwargs(self, image: np.ndarray, category: str, attack_name: str, params: Any,
+                       stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Pooled scratch buffers, cached invariants and stats dicts passed to attacks that accept them."""
+        kwargs = {}
+        if (category, attack_name) in self.SCRATCH_ATTACKS:
+            kwargs["scratch"] = self.buffers.get(image.shape, np.float32)
+        if (category, attack_name) in self.BANK_ATTACKS:
+            kwargs["bank"] = self.image_invariant(image, "blur_bank", BlurBank)
+        if (category, attack_name) == ("noise", "poisson"):
+            kwargs["levels"] = self.image_invariant(image, "poisson_levels", poisson_levels)
+        if category == "compression" and stats is not None:
+            kwargs["stats"] = stats
+        return kwargs
+
+    def resolve_params(self, category: str, attack_name: str, params: Any) -> Dict[str, Any]:
+        """Full kwargs of an attack call: function defaults overridden by `params` (dict or single value)."""
+        attack_func = self.attack_registry[category][attack_name]
+        sig = inspect.signature(attack_func)
+        kwargs = {
+            name: p.default for name, p in list(sig.parameters.items())[1:]
+            if p.default is not inspect.Parameter.empty
+        }
+        if isinstance(params, dict):
+            kwargs.update(params)
+        else:
+            kwargs[list(sig.parameters.keys())[1]] = params
+        return kwargs
+
+    def geometric_transform(self, shape: tuple, category: str, attack_name: str, params: Any):
+        """Affine transform of a geometric attack on an image of `shape`, or None for other attacks."""
+        if category != "geometric" or attack_name not in self.geometric_transforms:
+            return None
+        return self.geometric_transforms[attack_name](shape, **self.resolve_params(category, attack_name, params))
+
+    def is_monotone(self, category: str, attack_name: str) -> bool:
+        return attack_name in self.attack_strength.get(category, {})
+
+    def is_searchable(self, category: str, attack_name: str) -> bool:
+        return attack_name in self.strength_search.get(category, {})
+
+    def strength(self, category: str, attack_name: str, params: Any) -> float:
+        """Strength of one attack setting (higher = stronger); only for monotone attacks."""
+        return self.attack_strength[category][attack_name](self.resolve_params(category, attack_name, params))
+
+    def sweep_key(self, category: str, attack_name: str, params: Any) -> tuple:
+        """Monotone sweep a setting belongs to: the attack, plus its direction where it has several."""
+        direction = self.attack_direction.get(category, {}).get(attack_name)
+        if direction is None:
+            return (category, attack_name)
+        return (category, attack_name, direction(self.resolve_params(category, attack_name, params)))
+
+    def sort_by_strength(self, attack_configs: List[Tuple[str, str, Any]]) -> List[Tuple[str, str, Any]]:
+        """
+        Order each monotone sweep (see sweep_key) from weakest to strongest.
+
+        Sweeps keep their first-appearance order; non-monotone attacks keep
+        their configured parameter order.
+        """
+        sweeps = {}
+        for category, attack_name, params in attack_configs:
+            sweeps.setdefault(self.sweep_key(category, attack_name, params), []).append(params)
+        
+        ordered = []
+        for (category, attack_name, *_), param_list in sweeps.items():
+            if self.is_monotone(category, attack_name):
+                param_list = sorted(param_list, key=lambda p: self.strength(category, attack_name, p))
+            ordered.extend((category, attack_name, params) for params in param_list)
+        return ordered
 
-    def run_single_attack(self, image: np.ndarray, category: str, attack_name: str, params: dict) -> np.ndarray:
+    def run_single_attack(self, image: np.ndarray, category: str, attack_name: str, params: dict,
+                          stats: Optional[Dict[str, Any]] = None) -> np.ndarray:
         """
         Run a single attack on an image.
         
@@ -44,6 +249,8 @@ class AttackRunner:
             category: Attack category (compression, noise, filtering, geometric)
             attack_name: Name of the attack
             params: Dictionary of parameters for the attack
+            stats: Optional dict that receives attack-side metrics
+                (`compressed_bytes` for compression attacks)
             
         Returns:
             Attacked image as numpy.ndarray
@@ -57,15 +264,16 @@ class AttackRunner:
         attack_func = self.attack_registry[category][attack_name]
         
         try:
+            extra_kwargs = self._attack_kwargs(image, category, attack_name, params, stats)
             # Check if params is a dict or a single value
             if isinstance(params, dict):
-                attacked_img = attack_func(image, **params)
+                attacked_img = attack_func(image, **params, **extra_kwargs)
             else:
                 # Single implicit value - inspect function to get parameter name
                 sig = inspect.signature(attack_func)
                 first_kwarg = list(sig.parameters.keys())[1]
                 kwargs = {first_kwarg: params}
-                attacked_img = attack_func(image, **kwargs)
+                attacked_img = attack_func(image, **kwargs, **extra_kwargs)
             return attacked_img
         except Exception as e:
             raise RuntimeError(f"Attack {attack_name}.{category} failed: {e}")
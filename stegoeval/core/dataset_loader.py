@@ -1,12 +1,50 @@
 import os
 import cv2
 import glob
+import hashlib
+import json
+import random
+import numpy as np
+from typing import Optional
+
+# Default manifest name inside the output directory
+MANIFEST_NAME = ".stegoeval-manifest.json"
+
+
+def pixel_hash(image: np.ndarray) -> str:
+    """Content hash of decoded pixels (shape and dtype included)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.shape}|{image.dtype}".encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
 
 class DatasetLoader:
-    def __init__(self, dataset_path: str):
+    """
+    Image files of a dataset directory, named by their path relative to it.
+
+    `limit` keeps the first N files (in sorted order) before deduplication,
+    so a limited run selects the same files with and without it. Pixel
+    hashes are cached in `manifest_path` when given; the dataset directory
+    itself is never written to.
+    """
+
+    def __init__(self, dataset_path: str, deduplicate: bool = False, manifest_path: Optional[str] = None,
+                 limit: Optional[int] = None):
         self.dataset_path = dataset_path
         self.image_paths = []
+        # Kept image name -> names of its pixel-identical duplicates (not loaded)
+        self.aliases = {}
+        self.duplicates_skipped = 0
         self._load_image_paths()
+        if limit:
+            self.image_paths = self.image_paths[:limit]
+        if deduplicate and self.image_paths:
+            self._deduplicate(manifest_path)
+
+    def image_name(self, path: str) -> str:
+        """Name of an image in result rows: its path relative to the dataset (the filename for flat datasets)."""
+        return os.path.relpath(path, self.dataset_path).replace(os.sep, "/")
 
     def _load_image_paths(self):
         """Scans the dataset path recursively for common image formats."""
@@ -27,16 +65,77 @@ class DatasetLoader:
         self.image_paths = sorted(list(set(self.image_paths)))
         print(f"Found {len(self.image_paths)} images in {self.dataset_path}")
 
-    def get_images(self, limit: int = None):
-        """Yields images and their filenames."""
-        paths_to_load = self.image_paths[:limit] if limit else self.image_paths
+    def _deduplicate(self, manifest_path: Optional[str] = None):
+        """
+        Keep the first file of every group of pixel-identical images.
+
+        With a manifest, hashes are cached in JSON keyed by path relative to
+        the dataset, and reused while a file's size and mtime are unchanged,
+        so only new or modified images are decoded here.
+        """
+        dataset = os.path.abspath(self.dataset_path)
+        cached = {}
+        if manifest_path:
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                # One manifest per dataset: another dataset's entries are dropped
+                if manifest.get("dataset") == dataset:
+                    cached = manifest.get("images", {})
+            except (OSError, ValueError):
+                pass
+
+        entries = {}
+        first_by_hash = {}
+        kept = []
+        for path in self.image_paths:
+            stat = os.stat(path)
+            key = self.image_name(path)
+            entry = cached.get(key)
+            if entry is None or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+                img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+                if img is None:
+                    # Reported as unreadable when loaded
+                    kept.append(path)
+                    continue
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": pixel_hash(img)}
+            entries[key] = entry
+
+            first = first_by_hash.setdefault(entry["hash"], path)
+            if first is path:
+                kept.append(path)
+            else:
+                self.aliases.setdefault(self.image_name(first), []).append(key)
+
+        self.image_paths = kept
+        self.duplicates_skipped = sum(len(names) for names in self.aliases.values())
+        if self.duplicates_skipped:
+            print(f"Skipping {self.duplicates_skipped} duplicate images ({len(kept)} unique)")
+
+        # Entries of files outside this (limited) selection are kept for later runs
+        entries = {**cached, **entries}
+        if manifest_path and entries != cached:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+                with open(manifest_path, "w") as f:
+                    json.dump({"version": 1, "dataset": dataset, "images": entries}, f, indent=1, sort_keys=True)
+            except OSError as e:
+                print(f"Warning: Could not write dataset manifest {manifest_path}: {e}")
+
+    def get_images(self, limit: int = None, shuffle: bool = False, seed: int = None):
+        """Yields images and their filenames (lazily, optionally in a random order)."""
+        paths = self.image_paths
+        if shuffle:
+            paths = list(paths)
+            random.Random(seed).shuffle(paths)
+        paths_to_load = paths[:limit] if limit else paths
         
         for path in paths_to_load:
             # imread reads as BGR if color, or grayscale if grayscale.
             # Using IMREAD_UNCHANGED keeps original channels (B&W or RGB)
             img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
             if img is not None:
-                yield os.path.basename(path), img
+                yield self.image_name(path), img
             else:
                 print(f"Failed to load image: {path}")
 
@@ -1,12 +1,17 @@
+import os
 import numpy as np
 import random
+import time
 from tqdm import tqdm
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from itertools import product
 
-from stegoeval.core.dataset_loader import DatasetLoader
+from stegoeval.core.dataset_loader import MANIFEST_NAME, DatasetLoader
 from stegoeval.core.attack_runner import AttackRunner
+from stegoeval.core.profiling import StageTimer, traced_call
+from stegoeval.core.memory import MemoryBudget, parse_memory_size, task_footprint
 from stegoeval.stego_algorithms.base import StegoAlgorithm
+from stegoeval.scoring import LiveScoreboard, ScorePrecision
 
 # Import metrics
 from stegoeval.metrics.distortion import (
@@ -14,24 +19,183 @@ from stegoeval.metrics.distortion import (
     calculate_ssim, calculate_aad, calculate_nad, calculate_correlation_coefficient
 )
 from stegoeval.metrics.robustness import calculate_ber, calculate_ncc_text
+from stegoeval.metrics.detectability import calculate_detectability
 from stegoeval.attacks.compression import apply_jpeg_compression
+from stegoeval.attacks.geometric import apply_affine, fuse_affine, reduces_resolution, resize_matrix
+
+# Distortion metrics computed for every row: (result column, function)
+DISTORTION_METRICS = [
+    ("mse", calculate_mse),
+    ("rmse", calculate_rmse),
+    ("psnr", calculate_psnr),
+    ("ssim", calculate_ssim),
+    ("aad", calculate_aad),
+    ("nad", calculate_nad),
+    ("ncc_image", calculate_correlation_coefficient),
+]
+
+
+def attack_configurations(config: dict) -> List[Tuple[str, str, Any]]:
+    """Expand the `attacks` section of a config into (category, attack_name, params) tuples."""
+    attacks_config = config.get("attacks", {})
+    attack_configs = []
+    
+    for category, attacks in attacks_config.items():
+        if not isinstance(attacks, dict):
+            continue
+        for attack_name, param_list in attacks.items():
+            if not isinstance(param_list, list):
+                param_list = [param_list]
+            for params in param_list:
+                # Pass the raw parameter value (could be int, float, or dict)
+                attack_configs.append((category, attack_name, params))
+    
+    return attack_configs
 
 
 class Evaluator:
-    def __init__(self, config: dict, algorithms: List[StegoAlgorithm]):
+    # Whether tasks are admitted against memory_budget (only the pipeline evaluator waits for admission)
+    enforces_memory_budget = False
+
+    def __init__(self, config: dict, algorithms: List[StegoAlgorithm], output_dir: Optional[str] = None):
         self.config = config
         self.algorithms = algorithms
-        self.dataset_loader = DatasetLoader(config.get("dataset_path", "./data"))
+        # With deduplicate, pixel-identical covers are evaluated once and their rows copied to every filename.
+        # dataset_limit selects files before deduplication, except for adaptive sampling,
+        # which draws its random sample from the whole (deduplicated) dataset
+        manifest_path = config.get("dataset_manifest")
+        if manifest_path is None and output_dir:
+            manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.dataset_loader = DatasetLoader(config.get("dataset_path", "./data"),
+                                            deduplicate=config.get("deduplicate", False),
+                                            manifest_path=manifest_path,
+                                            limit=None if config.get("adaptive_sampling") else config.get("dataset_limit"))
         self.attack_runner = AttackRunner()
         self.limit = config.get("dataset_limit", None)
         self.run_name = config.get("run_name", "benchmark")
         self.combo_attacks = config.get("combo_attacks", False)
         
+        # Resample runs of two or more consecutive geometric attacks in one warp
+        # and re-align geometric results to cover size for metrics in one warp
+        # from the run's input (opt-in: changes geometric distortion metrics slightly)
+        self.geometric_fusion = config.get("geometric_fusion", False)
+        
+        # Per-stage wall-time instrumentation (no-op unless enabled)
+        self.timer = StageTimer(enabled=config.get("timings", False))
+        
+        # Blind steganalysis (chi-square, RS, SPA) of every clean stego image and its cover
+        self.detectability = config.get("detectability", False)
+        
+        # Peak allocation of every embed/extract call (opt-in: traces the call itself, slowing it)
+        self.track_memory = config.get("track_memory", False)
+        
+        # Monotone-strength pruning of attack sweeps (opt-in)
+        self.prune_monotone = config.get("prune_monotone", False)
+        self.prune_patience = config.get("prune_patience", 1)
+        self.prune_failure_ber = config.get("prune_failure_ber", 0.4)
+        
+        # Running scores updated with every row (progress bar + scores-<run>-live.csv)
+        self.scoreboard = (LiveScoreboard(include_pruned=config.get("score_pruned", True))
+                           if config.get("live_scores", False) else None)
+        self.live_scores_interval = config.get("live_scores_interval", 30.0)
+        self.live_scores_path = (os.path.join(output_dir, f"scores-{self.run_name}-live.csv")
+                                 if output_dir and self.scoreboard is not None else None)
+        self._last_live_write = 0.0
+        
+        # Adaptive sampling: images in random order, stop once every
+        # algorithm x category score interval is narrow enough
+        self.adaptive_sampling = config.get("adaptive_sampling", False)
+        self.target_half_width = config.get("target_half_width", 1.0)
+        self.min_images = config.get("min_images", 10)
+        self.max_images = config.get("max_images", None)
+        self.sampling_seed = config.get("sampling_seed", None)
+        self.precision = (ScorePrecision(confidence=config.get("confidence_level", 0.95),
+                                         include_pruned=config.get("score_pruned", True))
+                          if self.adaptive_sampling else None)
+        
+        # Breaking-point search (robustness_threshold mode): bisect each
+        # searchable attack's strength instead of sweeping its grid
+        self.threshold_config = config.get("robustness_threshold", {})
+        self.threshold_search = self.threshold_config.get("enabled", False)
+        
+        # Estimated memory admitted per task; tasks wait while the total would exceed memory_budget.
+        # Only the pipeline evaluator admits tasks against the limit: the others would silently
+        # overrun it, so a budget they cannot enforce is rejected
+        self.memory_budget = MemoryBudget(parse_memory_size(config.get("memory_budget")))
+        if self.memory_budget.limit is not None and not self.enforces_memory_budget:
+            raise ValueError(f"memory_budget is only enforced by the pipeline evaluator, not by "
+                             f"{type(self).__name__}; set pipeline: true or remove memory_budget")
+        self._footprints = {}
+        
         # Results storage: List of dicts
         self.results = []
+        # One row per image x algorithm x payload x searched attack
+        self.breaking_points = []
+
+    def _record(self, rows: List[Dict[str, Any]]):
+        """Store result rows and fold them into the live scoreboard."""
+        self.results.extend(rows)
+        if self.scoreboard is not None:
+            for row in rows:
+                self.scoreboard.update(row)
+        if self.precision is not None:
+            for row in rows:
+                self.precision.update(row)
+
+    def _alias_duplicates(self):
+        """
+        Copy the rows of every deduplicated cover to its duplicates' filenames.
+
+        The copies are scored like evaluated rows, so scores match a run that
+        evaluated every copy.
+        """
+        aliases = self.dataset_loader.aliases
+        if not aliases:
+            return
+
+        def copies(rows):
+            return [{**row, "image": alias, "duplicate_of": row["image"]}
+                    for row in rows if row.get("image") in aliases
+                    for alias in aliases[row["image"]]]
+
+        aliased = copies(self.results)
+        self.results.extend(aliased)
+        if self.scoreboard is not None:
+            for row in aliased:
+                self.scoreboard.update(row)
+        self.breaking_points.extend(copies(self.breaking_points))
+
+    def _sampling_done(self) -> bool:
+        """Adaptive sampling stop check, run after each image."""
+        self.precision.end_image()
+        if self.precision.images_seen < self.min_images:
+            return False
+        if self.precision.converged(self.target_half_width):
+            self.precision.stop_reason = (f"all score intervals within ±{self.target_half_width:g} "
+                                          f"after {self.precision.images_seen} images")
+            return True
+        return False
+
+    def _publish_live_scores(self, pbar, force: bool = False):
+        """Show running scores in the progress bar and periodically rewrite the live CSV."""
+        if self.scoreboard is None:
+            return
+        pbar.set_postfix(self.scoreboard.postfix(), refresh=False)
+        
+        now = time.monotonic()
+        if self.live_scores_path and (force or now - self._last_live_write >= self.live_scores_interval):
+            os.makedirs(os.path.dirname(self.live_scores_path) or ".", exist_ok=True)
+            tmp_path = self.live_scores_path + ".tmp"
+            self.scoreboard.overall_scores().to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.live_scores_path)  # atomic for readers tailing the file
+            self._last_live_write = now
 
     def _generate_random_payload(self, length: int) -> str:
         """Generates a random payload using varied English words and numbers."""
+        with self.timer.time("payload_generation"):
+            return self._build_random_payload(length)
+
+    def _build_random_payload(self, length: int) -> str:
         from wonderwords import RandomWord
         
         r = RandomWord()
@@ -59,25 +223,231 @@ class Evaluator:
 
     def _get_attack_configurations(self) -> List[Tuple[str, str, Any]]:
         """Extract all attack configurations from config."""
-        attacks_config = self.config.get("attacks", {})
-        attack_configs = []
-        
-        for category, attacks in attacks_config.items():
-            if not isinstance(attacks, dict):
+        return attack_configurations(self.config)
+
+    def _run_single_attack(self, image: np.ndarray, category: str, attack_name: str, params: Any,
+                           stats: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Run a single attack on an image (attack-side metrics go into `stats`)."""
+        # Pass params as-is to AttackRunner - it handles both dict and simple values
+        with self.timer.time(f"attack.{category}.{attack_name}"):
+            return self.attack_runner.run_single_attack(image, category, attack_name, params, stats)
+
+    def _apply_attack_chain(self, image: np.ndarray, chain: List[Tuple[str, str, Any]], cover_shape: tuple,
+                            stats: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply attacks in sequence.
+
+        Returns the attacked image and the same image at cover size for the
+        distortion metrics. With geometric fusion, each run of two or more
+        consecutive geometric attacks is one warp of its input, and the
+        cover-size image is warped straight from that input as well, so the
+        metrics see one interpolation and resize nothing. A run ends at a step
+        that downscales, since the lost detail belongs to the attack; such
+        runs are re-aligned from their result. Single geometric steps keep
+        their own implementation, so the attacked image (and the extract)
+        is the same with and without fusion.
+        """
+        if not self.geometric_fusion:
+            for category, attack_name, params in chain:
+                image = self._run_single_attack(image, category, attack_name, params, stats)
+            return image, image
+
+        # Pending geometric run: its steps, input image and fused transform so far
+        source, transform, run = image, None, []
+        # (input, transform) of the fused run that produced `image`, if it was fused
+        realign = None
+
+        def resolve():
+            nonlocal image, transform, run, realign
+            if len(run) == 1:
+                image = self._run_single_attack(source, *run[0], stats)
+            else:
+                with self.timer.time("attack.geometric.fused"):
+                    image = apply_affine(source, transform)
+            if reduces_resolution(transform):
+                # Downscaled detail is part of the attack: re-align from the result
+                realign = (image, (np.eye(3), image.shape[1::-1], False))
+            else:
+                realign = (source, transform)
+            transform, run = None, []
+
+        for category, attack_name, params in chain:
+            shape = image.shape if transform is None else transform[1][::-1]
+            step = self.attack_runner.geometric_transform(shape, category, attack_name, params)
+            if step is not None:
+                source, transform = (image, step) if transform is None else (source, fuse_affine(transform, step))
+                run.append((category, attack_name, params))
+                if reduces_resolution(transform):
+                    # Downscaling is part of the attack: resample here, fuse nothing past it
+                    resolve()
                 continue
-            for attack_name, param_list in attacks.items():
-                if not isinstance(param_list, list):
-                    param_list = [param_list]
-                for params in param_list:
-                    # Pass the raw parameter value (could be int, float, or dict)
-                    attack_configs.append((category, attack_name, params))
+            if run:
+                resolve()
+            image = self._run_single_attack(image, category, attack_name, params, stats)
+            realign = None
+        if run:
+            resolve()
+
+        if image.shape[:2] == cover_shape[:2] or realign is None:
+            return image, image
+
+        source, transform = realign
+        cover_size = cover_shape[1::-1]
+        align = (resize_matrix(transform[1], cover_size), cover_size, False)
+        with self.timer.time("attack.geometric.fused"):
+            return image, apply_affine(source, fuse_affine(transform, align))
+
+    def _compute_distortion_metrics(self, cover_img: np.ndarray, image: np.ndarray) -> Dict[str, float]:
+        """Compute all distortion metrics of `image` relative to the cover."""
+        metrics = {}
+        for key, func in DISTORTION_METRICS:
+            with self.timer.time(f"metric.{key}"):
+                metrics[key] = func(cover_img, image)
+        return metrics
+
+    def _compute_detectability_metrics(self, cover_img: np.ndarray, stego_img: np.ndarray) -> Dict[str, float]:
+        """Detector outputs on the stego image, plus the cover's (`cover_` prefix) for reference."""
+        if not self.detectability:
+            return {}
         
-        return attack_configs
+        metrics = {}
+        with self.timer.time("metric.detectability"):
+            # Cover values are computed once per cover and shared by all algorithms and payloads
+            cover = self.attack_runner.image_invariant(cover_img, "detectability", calculate_detectability)
+            for key, value in calculate_detectability(stego_img).items():
+                metrics[key] = value
+                metrics[f"cover_{key}"] = cover[key]
+        return metrics
 
-    def _run_single_attack(self, image: np.ndarray, category: str, attack_name: str, params: Any) -> np.ndarray:
-        """Run a single attack on an image."""
-        # Pass params as-is to AttackRunner - it handles both dict and simple values
-        return self.attack_runner.run_single_attack(image, category, attack_name, params)
+    def _compute_robustness_metrics(self, payload: str, extracted: str) -> Tuple[float, float]:
+        """Compute (BER, text NCC) between the embedded and extracted payloads."""
+        with self.timer.time("metric.ber"):
+            ber = calculate_ber(payload, extracted)
+        with self.timer.time("metric.ncc_secret"):
+            ncc = calculate_ncc_text(payload, extracted)
+        return ber, ncc
+
+    def _call_algorithm(self, algo: StegoAlgorithm, stage: str, *args,
+                        method: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Call algo.embed / algo.extract (or `method`, e.g. extract_batch) and measure its cost.
+
+        The algorithm is called exactly once. Peak memory comes from the
+        algorithm itself if it reports `last_peak_memory` (out-of-process
+        adapters), otherwise from tracing the call with tracemalloc when
+        `track_memory` is enabled (its latency then includes the tracing
+        overhead).
+
+        Returns:
+            (call result, {"<stage>_time_ms": ..., "<stage>_peak_kb": ...})
+        """
+        func = getattr(algo, method or stage)
+        traced = None
+        with self.timer.time(stage):
+            start = time.perf_counter()
+            if self.track_memory:
+                output, traced = traced_call(func, *args)
+            else:
+                output = func(*args)
+            elapsed = time.perf_counter() - start
+        
+        peak = getattr(algo, "last_peak_memory", None)
+        if peak is None:
+            peak = traced
+        
+        return output, {
+            f"{stage}_time_ms": elapsed * 1000,
+            f"{stage}_peak_kb": peak / 1024 if peak is not None else None,
+        }
+
+    def _extract(self, algo: StegoAlgorithm, image: np.ndarray) -> Tuple[str, Dict[str, Any]]:
+        return self._call_algorithm(algo, "extract", image)
+
+    def _extract_many(self, algo: StegoAlgorithm,
+                      images: List[np.ndarray]) -> List[Tuple[Union[str, Exception], Dict[str, Any]]]:
+        """
+        Extract several attacked images of one stego image in one algo.extract_batch call.
+
+        Each image is charged an equal share of the call's time (extract_time_ms)
+        and the call's peak memory. If the batch call fails, the images are
+        extracted one by one so every row gets its own payload or error.
+
+        Returns:
+            (extracted payload or the exception raised, extract cost) per image
+        """
+        if not images:
+            return []
+        try:
+            outputs, cost = self._call_algorithm(algo, "extract", images, method="extract_batch")
+        except Exception:
+            outputs = None
+        if outputs is not None and len(outputs) == len(images):
+            share = {**cost, "extract_time_ms": cost["extract_time_ms"] / len(images)}
+            return [(output, share) for output in outputs]
+
+        extracted = []
+        for image in images:
+            try:
+                extracted.append(self._extract(algo, image))
+            except Exception as e:
+                extracted.append((e, {}))
+        return extracted
+
+    def _fill_robustness(self, result: Dict[str, Any], payload: str, extracted: Union[str, Exception],
+                         extract_cost: Dict[str, Any]):
+        """Robustness and extract cost columns of a row from its extracted payload (or extract error)."""
+        if isinstance(extracted, Exception):
+            result.update(extracted_payload=f"ERROR: {extracted}", ber=1.0, ncc_secret=0.0, payload_recovered=False)
+            return
+        result.update(extract_cost)
+        result["extracted_payload"] = extracted
+        result["ber"], result["ncc_secret"] = self._compute_robustness_metrics(payload, extracted)
+        result["payload_recovered"] = result["ber"] == 0.0
+
+    def _extract_rows(self, algo: StegoAlgorithm, payload: str, pending: List[Tuple[Dict[str, Any], np.ndarray]]):
+        """Fill attack rows from one batched extract of their attacked images."""
+        extracted = self._extract_many(algo, [image for _, image in pending])
+        for (result, _), (output, extract_cost) in zip(pending, extracted):
+            self._fill_robustness(result, payload, output, extract_cost)
+
+    def _pruned_result(self, img_name: str, algo_name: str, payload: str, category: str,
+                       attack_name: str, params: Any, cost: Dict[str, Any]) -> Dict[str, Any]:
+        """Row for a sweep setting skipped by monotone pruning (inferred failed, nothing computed)."""
+        return {
+            "image": img_name,
+            "algorithm": algo_name,
+            "payload_size": len(payload),
+            "attack_category": category,
+            "attack_name": attack_name,
+            "attack_params": str(params),
+            
+            # Distortion metrics were not computed
+            **{key: None for key, _ in DISTORTION_METRICS},
+            
+            # Inferred total failure
+            "ber": 1.0,
+            "ncc_secret": 0.0,
+            "payload_recovered": False,
+            "embedded_payload": payload,
+            "extracted_payload": "PRUNED",
+            
+            # Algorithm cost metrics (no extract call was made)
+            **cost,
+            
+            "pruned": True
+        }
+
+    def _task_footprint(self, cover_img: np.ndarray, slots: int = 1) -> int:
+        """Estimated peak memory of one image x algorithm x payload task on `cover_img` (cached per shape)."""
+        key = (cover_img.shape, cover_img.itemsize, slots)
+        if key not in self._footprints:
+            attack_configs = self._get_attack_configurations()
+            chains = [[]] + [[config] for config in attack_configs]
+            if self.combo_attacks and attack_configs:
+                chains += self._generate_combinations(attack_configs)
+            self._footprints[key] = task_footprint(self.attack_runner, cover_img.shape, chains,
+                                                   cover_img.itemsize, slots)
+        return self._footprints[key]
 
     def _generate_combinations(self, attack_configs: List[Tuple[str, str, Any]]) -> List[List[Tuple[str, str, Any]]]:
         """Generate all possible combinations of attacks."""
@@ -100,6 +470,11 @@ class Evaluator:
         
         return combinations
 
+    @staticmethod
+    def _combo_params(combo: List[Tuple[str, str, Any]]) -> str:
+        """attack_params of a combination row: every step with its params, unique per chain."""
+        return str({cat: {name: params} for cat, name, params in combo})
+
     def _evaluate_image_algorithm(self, img_name: str, cover_img: np.ndarray, algo: StegoAlgorithm, 
                                    payload: str) -> List[Dict[str, Any]]:
         """Evaluate a single image-algorithm-payload combination."""
@@ -108,10 +483,18 @@ class Evaluator:
         
         # 1. Embed payload
         try:
-            stego_img = algo.embed(cover_img, payload)
+            stego_img, embed_cost = self._call_algorithm(algo, "embed", cover_img, payload)
         except Exception as e:
             return [{"image": img_name, "algorithm": algo_name, "error": f"Embed failed: {e}"}]
         
+        # Cost columns shared by every row produced from this embed
+        cost = {
+            "cover_megapixels": cover_img.shape[0] * cover_img.shape[1] / 1e6,
+            **embed_cost,
+            "extract_time_ms": None,
+            "extract_peak_kb": None,
+        }
+        
         # 2. Compute Cover vs Stego metrics (Distortion) - Clean/No attack
         base_result = {
             "image": img_name,
@@ -122,28 +505,28 @@ class Evaluator:
             "attack_params": "none",
             
             # Distortion metrics (cover vs stego)
-            "mse": calculate_mse(cover_img, stego_img),
-            "rmse": calculate_rmse(cover_img, stego_img),
-            "psnr": calculate_psnr(cover_img, stego_img),
-            "ssim": calculate_ssim(cover_img, stego_img),
-            "aad": calculate_aad(cover_img, stego_img),
-            "nad": calculate_nad(cover_img, stego_img),
-            "ncc_image": calculate_correlation_coefficient(cover_img, stego_img),
+            **self._compute_distortion_metrics(cover_img, stego_img),
+            
+            # Detectability metrics (stego and cover)
+            **self._compute_detectability_metrics(cover_img, stego_img),
             
             # Robustness metrics
             "ber": 0.0,
             "ncc_secret": 1.0,
             "payload_recovered": True,
             "embedded_payload": payload,
-            "extracted_payload": ""
+            "extracted_payload": "",
+            
+            # Algorithm cost metrics
+            **cost
         }
         
         # Extract clean payload
         try:
-            clean_extracted = algo.extract(stego_img)
+            clean_extracted, extract_cost = self._extract(algo, stego_img)
+            base_result.update(extract_cost)
             base_result["extracted_payload"] = clean_extracted
-            base_result["ber"] = calculate_ber(payload, clean_extracted)
-            base_result["ncc_secret"] = calculate_ncc_text(payload, clean_extracted)
+            base_result["ber"], base_result["ncc_secret"] = self._compute_robustness_metrics(payload, clean_extracted)
             base_result["payload_recovered"] = base_result["ber"] == 0.0
         except Exception as e:
             base_result["extracted_payload"] = f"ERROR: {e}"
@@ -156,9 +539,35 @@ class Evaluator:
         # 3. Run individual attacks
         attack_configs = self._get_attack_configurations()
         
-        for category, attack_name, params in attack_configs:
+        if self.threshold_search:
+            # Searchable attacks get a breaking-point search instead of their grid
+            searched = {}
+            for category, attack_name, params in attack_configs:
+                if self.attack_runner.is_searchable(category, attack_name):
+                    searched.setdefault((category, attack_name), params)
+            for (category, attack_name), params in searched.items():
+                self.breaking_points.append(
+                    self._find_breaking_point(img_name, algo, stego_img, payload, category, attack_name, params))
+            attack_configs = [c for c in attack_configs if (c[0], c[1]) not in searched]
+        
+        # Monotone pruning: run each sweep weakest -> strongest and stop after
+        # `prune_patience` consecutive total failures
+        consecutive_failures = {}
+        sweep = self.attack_runner.sort_by_strength(attack_configs) if self.prune_monotone else attack_configs
+        
+        # Rows and attacked images awaiting one batched extract (with pruning each
+        # setting is extracted before the next one)
+        pending = []
+        for category, attack_name, params in sweep:
+            sweep_key = self.attack_runner.sweep_key(category, attack_name, params) if self.prune_monotone else None
+            if self.prune_monotone and consecutive_failures.get(sweep_key, 0) >= self.prune_patience:
+                results.append(self._pruned_result(img_name, algo_name, payload, category, attack_name, params, cost))
+                continue
+            
             try:
-                attacked_stego = self._run_single_attack(stego_img, category, attack_name, params)
+                attack_stats = {}
+                attacked_stego, comparable = self._apply_attack_chain(
+                    stego_img, [(category, attack_name, params)], cover_img.shape, attack_stats)
                 
                 # Compute metrics relative to cover image
                 result = {
@@ -170,34 +579,33 @@ class Evaluator:
                     "attack_params": str(params),
                     
                     # Distortion metrics (cover vs attacked stego)
-                    "mse": calculate_mse(cover_img, attacked_stego),
-                    "rmse": calculate_rmse(cover_img, attacked_stego),
-                    "psnr": calculate_psnr(cover_img, attacked_stego),
-                    "ssim": calculate_ssim(cover_img, attacked_stego),
-                    "aad": calculate_aad(cover_img, attacked_stego),
-                    "nad": calculate_nad(cover_img, attacked_stego),
-                    "ncc_image": calculate_correlation_coefficient(cover_img, attacked_stego),
+                    **self._compute_distortion_metrics(cover_img, comparable),
                     
                     # Robustness metrics
-                    "ber": base_result["ber"],  # Will be updated below
-                    "ncc_secret": base_result["ncc_secret"],  # Will be updated below
+                    "ber": base_result["ber"],  # Will be updated by the extract
+                    "ncc_secret": base_result["ncc_secret"],  # Will be updated by the extract
                     "payload_recovered": False,
                     "embedded_payload": payload,
-                    "extracted_payload": ""
+                    "extracted_payload": "",
+                    
+                    # Algorithm cost metrics
+                    **cost,
+                    
+                    # Attack-side metrics (compressed_bytes)
+                    **attack_stats
                 }
                 
-                # Try to extract payload from attacked image
-                try:
-                    attacked_extracted = algo.extract(attacked_stego)
-                    result["extracted_payload"] = attacked_extracted
-                    result["ber"] = calculate_ber(payload, attacked_extracted)
-                    result["ncc_secret"] = calculate_ncc_text(payload, attacked_extracted)
-                    result["payload_recovered"] = result["ber"] == 0.0
-                except Exception as e:
-                    result["extracted_payload"] = f"ERROR: {e}"
-                    result["ber"] = 1.0
-                    result["ncc_secret"] = 0.0
-                    result["payload_recovered"] = False
+                if not self.prune_monotone:
+                    pending.append((result, attacked_stego))
+                    results.append(result)
+                    continue
+                
+                # Extract now: the next setting of the sweep depends on this result
+                self._extract_rows(algo, payload, [(result, attacked_stego)])
+                result["pruned"] = False
+                if self.attack_runner.is_monotone(category, attack_name):
+                    failed = not result["payload_recovered"] and result["ber"] >= self.prune_failure_ber
+                    consecutive_failures[sweep_key] = consecutive_failures.get(sweep_key, 0) + 1 if failed else 0
                 
                 results.append(result)
                 
@@ -205,22 +613,18 @@ class Evaluator:
                 # Skip failed attacks
                 print(f"Warning: Attack {attack_name}.{category} failed: {e}")
                 continue
+        self._extract_rows(algo, payload, pending)
         
         # 4. Run combination attacks if enabled
         if self.combo_attacks and attack_configs:
             combinations = self._generate_combinations(attack_configs)
             
+            pending = []
             for combo in combinations:
                 try:
                     # Apply all attacks in combination sequentially
-                    attacked_img = stego_img.copy()
-                    combo_params = []
-                    
-                    for category, attack_name, params in combo:
-                        attacked_img = self._run_single_attack(attacked_img, category, attack_name, params)
-                        combo_params.append(f"{attack_name}")
-                    
-                    combo_name = "+".join(combo_params)
+                    attacked_img, comparable = self._apply_attack_chain(stego_img, combo, cover_img.shape)
+                    combo_name = "+".join(attack_name for _, attack_name, _ in combo)
                     combo_category = "combo"
                     
                     result = {
@@ -229,46 +633,114 @@ class Evaluator:
                         "payload_size": len(payload),
                         "attack_category": combo_category,
                         "attack_name": combo_name,
-                        "attack_params": str({cat: name for cat, name, _ in combo}),
+                        "attack_params": self._combo_params(combo),
                         
                         # Distortion metrics
-                        "mse": calculate_mse(cover_img, attacked_img),
-                        "rmse": calculate_rmse(cover_img, attacked_img),
-                        "psnr": calculate_psnr(cover_img, attacked_img),
-                        "ssim": calculate_ssim(cover_img, attacked_img),
-                        "aad": calculate_aad(cover_img, attacked_img),
-                        "nad": calculate_nad(cover_img, attacked_img),
-                        "ncc_image": calculate_correlation_coefficient(cover_img, attacked_img),
+                        **self._compute_distortion_metrics(cover_img, comparable),
                         
                         # Robustness metrics
                         "ber": 1.0,
                         "ncc_secret": 0.0,
                         "payload_recovered": False,
                         "embedded_payload": payload,
-                        "extracted_payload": ""
+                        "extracted_payload": "",
+                        
+                        # Algorithm cost metrics
+                        **cost
                     }
                     
-                    # Try to extract payload
-                    try:
-                        combo_extracted = algo.extract(attacked_img)
-                        result["extracted_payload"] = combo_extracted
-                        result["ber"] = calculate_ber(payload, combo_extracted)
-                        result["ncc_secret"] = calculate_ncc_text(payload, combo_extracted)
-                        result["payload_recovered"] = result["ber"] == 0.0
-                    except Exception as e:
-                        result["extracted_payload"] = f"ERROR: {e}"
-                        result["ber"] = 1.0
-                        result["ncc_secret"] = 0.0
-                        result["payload_recovered"] = False
-                    
+                    pending.append((result, attacked_img))
                     results.append(result)
                     
                 except Exception as e:
                     print(f"Warning: Combo attack failed: {e}")
                     continue
+            self._extract_rows(algo, payload, pending)
         
         return results
 
+    def _find_breaking_point(self, img_name: str, algo: StegoAlgorithm, stego_img: np.ndarray, payload: str,
+                             category: str, attack_name: str, params: Any) -> Dict[str, Any]:
+        """
+        Uses bisection on an attack's strength parameter to find the weakest
+        setting whose BER exceeds the configured threshold (same idea as the
+        capacity search in _evaluate_max_text_length).
+        
+        Needs about log2(range / resolution) attack + extract calls instead of
+        one per grid point.
+        """
+        param, weakest, strongest, kind = self.attack_runner.strength_search[category][attack_name]
+        weakest, strongest = self.threshold_config.get("bounds", {}).get(attack_name, (weakest, strongest))
+        ber_threshold = self.threshold_config.get("ber_threshold", 0.0)
+        resolution = self.threshold_config.get("resolution", 0.01)
+        
+        # Other parameters (e.g. gaussian mean) come from the first configured setting
+        base_params = {k: v for k, v in params.items() if k != param} if isinstance(params, dict) else {}
+        
+        # Bisect on a coordinate: the value itself for floats, an index for integers
+        if kind == "odd":
+            to_value = lambda x: 2 * x + 1
+            lo, hi = (weakest - 1) // 2, (strongest - 1) // 2
+        elif kind == "int":
+            to_value = lambda x: x
+            lo, hi = weakest, strongest
+        else:
+            to_value = lambda x: x
+            lo, hi = float(weakest), float(strongest)
+        tolerance = abs(hi - lo) * resolution if kind == "float" else 1
+        
+        bers = {}
+        
+        def probe(x) -> float:
+            value = to_value(x)
+            attacked = self._run_single_attack(stego_img, category, attack_name, {**base_params, param: value})
+            try:
+                extracted, _ = self._extract(algo, attacked)
+                ber, _ = self._compute_robustness_metrics(payload, extracted)
+            except Exception:
+                ber = 1.0
+            bers[value] = ber
+            return ber
+        
+        result = {
+            "image": img_name,
+            "algorithm": algo.name(),
+            "payload_size": len(payload),
+            "attack_category": category,
+            "attack_name": attack_name,
+            "parameter": param,
+            "ber_threshold": ber_threshold,
+            "breaking_point": None,
+            "last_passing": None,
+            "ber_at_break": None,
+            "broken": False,
+            "evaluations": 0,
+        }
+        
+        try:
+            if probe(hi) <= ber_threshold:
+                # Survives even the strongest setting searched
+                result["last_passing"] = to_value(hi)
+            elif probe(lo) > ber_threshold:
+                # Already broken by the weakest setting
+                result.update(broken=True, breaking_point=to_value(lo), ber_at_break=bers[to_value(lo)])
+            else:
+                # Invariant: lo passes, hi breaks
+                while abs(hi - lo) > tolerance:
+                    mid = (lo + hi) / 2 if kind == "float" else (lo + hi) // 2
+                    if probe(mid) > ber_threshold:
+                        hi = mid
+                    else:
+                        lo = mid
+                result.update(broken=True, breaking_point=to_value(hi), last_passing=to_value(lo),
+                              ber_at_break=bers[to_value(hi)])
+        except Exception as e:
+            print(f"Warning: Breaking-point search for {category}.{attack_name} failed: {e}")
+            result["error"] = str(e)
+        
+        result["evaluations"] = len(bers)
+        return result
+
     def _evaluate_max_text_length(self, img_name: str, cover_img: np.ndarray, algo: StegoAlgorithm) -> Dict[str, Any]:
         """
         Uses binary search to find the maximum text length that can be embedded
@@ -281,8 +753,11 @@ class Evaluator:
         upper_bound = capacity_config.get("max_payload", 100000)
         tolerance = capacity_config.get("tolerance", 50)
         
+        # The algorithm's capacity hint (if any) narrows the search
+        hint = getattr(algo, "capacity", lambda shape: None)(cover_img.shape)
+        
         low = 1
-        high = upper_bound
+        high = min(upper_bound, hint) if hint is not None else upper_bound
         max_valid_length = 0
         
         # Binary search for maximum capacity
@@ -355,8 +830,17 @@ class Evaluator:
         # Payload sizes to test
         payload_sizes = self.config.get("payload_sizes", [10, 100, 1000, 5000])
         
-        images = list(self.dataset_loader.get_images(limit=self.limit))
-        if not images:
+        if self.adaptive_sampling:
+            # Images are loaded lazily in random order; most may never be needed
+            limits = [n for n in (self.limit, self.max_images) if n]
+            limit = min(limits) if limits else None
+            images = self.dataset_loader.get_images(limit=limit, shuffle=True, seed=self.sampling_seed)
+            num_images = min(len(self.dataset_loader), limit) if limit else len(self.dataset_loader)
+        else:
+            with self.timer.time("load_images"):
+                images = list(self.dataset_loader.get_images(limit=self.limit))
+            num_images = len(images)
+        if not num_images:
             print("No images found to evaluate.")
             return self.results
 
@@ -368,19 +852,20 @@ class Evaluator:
         capacity_enabled = self.config.get("capacity", {}).get("enabled", False)
         
         if self.combo_attacks and combo_multiplier > 0:
-            total_steps = len(images) * len(self.algorithms) * len(payload_sizes) * (1 + total_attacks + combo_multiplier)
+            total_steps = num_images * len(self.algorithms) * len(payload_sizes) * (1 + total_attacks + combo_multiplier)
         else:
-            total_steps = len(images) * len(self.algorithms) * len(payload_sizes) * (1 + total_attacks)
+            total_steps = num_images * len(self.algorithms) * len(payload_sizes) * (1 + total_attacks)
             
         # Add capacity test steps if enabled
         if capacity_enabled:
-            total_steps += len(images) * len(self.algorithms)
+            total_steps += num_images * len(self.algorithms)
         
-        with tqdm(total=total_steps, desc="Evaluating", unit="step") as pbar:
+        with self.timer.time("total"), tqdm(total=total_steps, desc="Evaluating", unit="step") as pbar:
             for img_name, cover_img in images:
                 # Add Baseline Test for the pure cover image (simulating a standard 95% JPEG save)
                 try:
-                    baseline_img = apply_jpeg_compression(cover_img, quality=95)
+                    with self.timer.time("baseline.jpeg"):
+                        baseline_img = apply_jpeg_compression(cover_img, quality=95)
                     baseline_result = {
                         "image": img_name,
                         "algorithm": "COVER_IMAGE_BASELINE",
@@ -390,13 +875,7 @@ class Evaluator:
                         "attack_params": "quality=95",
                         
                         # Baseline Distortion metrics (cover vs clean save)
-                        "mse": calculate_mse(cover_img, baseline_img),
-                        "rmse": calculate_rmse(cover_img, baseline_img),
-                        "psnr": calculate_psnr(cover_img, baseline_img),
-                        "ssim": calculate_ssim(cover_img, baseline_img),
-                        "aad": calculate_aad(cover_img, baseline_img),
-                        "nad": calculate_nad(cover_img, baseline_img),
-                        "ncc_image": calculate_correlation_coefficient(cover_img, baseline_img),
+                        **self._compute_distortion_metrics(cover_img, baseline_img),
                         
                         # Robustness metrics (N/A for baseline)
                         "ber": 0.0,
@@ -405,7 +884,7 @@ class Evaluator:
                         "embedded_payload": "N/A",
                         "extracted_payload": "N/A"
                     }
-                    self.results.append(baseline_result)
+                    self._record([baseline_result])
                 except Exception as e:
                     print(f"Warning: Baseline calculation failed for {img_name}: {e}")
 
@@ -415,9 +894,13 @@ class Evaluator:
                     for size in payload_sizes:
                         payload = self._generate_random_payload(size)
                         
-                        # Run evaluation for this image-algorithm-payload
+                        # Run evaluation for this image-algorithm-payload (one task at a time,
+                        # so the budget only records the estimate and flags oversized tasks)
+                        reservation = self.memory_budget.reserve(self._task_footprint(cover_img))
                         results = self._evaluate_image_algorithm(img_name, cover_img, algo, payload)
-                        self.results.extend(results)
+                        reservation.retire()
+                        self._record(results)
+                        self._publish_live_scores(pbar)
                         
                         pbar.update(1 + total_attacks)  # Clean + individual attacks
                         if self.combo_attacks:
@@ -430,8 +913,18 @@ class Evaluator:
                         
                     # Run Capacity test if enabled for this image & algorithm
                     if capacity_enabled:
-                        capacity_result = self._evaluate_max_text_length(img_name, cover_img, algo)
-                        self.results.append(capacity_result)
+                        with self.timer.time("capacity_search"):
+                            capacity_result = self._evaluate_max_text_length(img_name, cover_img, algo)
+                        self._record([capacity_result])
                         pbar.update(1)
-                        
+                
+                if self.precision is not None and self._sampling_done():
+                    break
+            
+            if self.precision is not None and self.precision.stop_reason is None:
+                self.precision.stop_reason = f"image limit reached after {self.precision.images_seen} images"
+            
+            self._publish_live_scores(pbar, force=True)
+        
+        self._alias_duplicates()
         return self.results
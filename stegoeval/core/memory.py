@@ -0,0 +1,263 @@
+"""
+Memory budget and peak RSS.
+
+Large covers are expensive in flight: geometric attacks enlarge them
+(scaling up, rotation bounding boxes), the noise/filter attacks work on
+float32 copies and the distortion metrics on float64 ones, and every
+queued attack item keeps its attacked image. The estimates here are
+per-element byte counts of those working sets, deliberately on the high
+side; they are used to admit work only while the estimated total stays
+under `memory_budget`, not to predict RSS exactly.
+"""
+
+import math
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Peak working set of the distortion metrics (tracemalloc on a 2040x1404x3 cover):
+# per image element for the correlation coefficient (flattened copies and their
+# float64 stack, the largest of the element-wise metrics) ...
+METRIC_BYTES_PER_ELEMENT = 34
+# ... and per pixel for SSIM (float64 planes of both images and five local moments)
+SSIM_BYTES_PER_PIXEL = 136
+# Scratch of one attack step per image element (float32 noise fields,
+# float32 padded image + complex spectrum for FFT blurs, float DCT blocks)
+ATTACK_SCRATCH_BYTES = {"noise": 4, "filtering": 12, "compression": 8, "geometric": 0}
+# Algorithm working set per image element during embed/extract (float64 copy);
+# a batched extract needs it for every image of the batch
+ALGORITHM_BYTES_PER_ELEMENT = 8
+
+_UNITS = {"": 1, "k": 1e3, "m": 1e6, "g": 1e9, "t": 1e12,
+          "ki": 2**10, "mi": 2**20, "gi": 2**30, "ti": 2**40}
+
+
+def physical_memory() -> Optional[int]:
+    """Physical memory of the machine in bytes (None where sysconf is unavailable)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def parse_memory_size(value: Union[int, float, str, None]) -> Optional[int]:
+    """
+    Bytes of a memory size: a number of bytes, "512MB", "8GiB", "auto" (80% of physical memory) or None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = value.strip().lower()
+    if text == "auto":
+        physical = physical_memory()
+        return int(physical * 0.8) if physical else None
+    match = re.fullmatch(r"([\d.]+)\s*([kmgt]i?)?b?", text)
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (use e.g. 4GB, 512MiB or auto)")
+    return int(float(match.group(1)) * _UNITS[match.group(2) or ""])
+
+
+def _elements(shape: Tuple[int, ...]) -> int:
+    return math.prod(shape)
+
+
+def metric_peak_bytes(shape: Tuple[int, ...]) -> int:
+    """Transient memory of the distortion metrics on an image of `shape`."""
+    return max(METRIC_BYTES_PER_ELEMENT * _elements(shape), SSIM_BYTES_PER_PIXEL * shape[0] * shape[1])
+
+
+def chain_footprint(runner, cover_shape: Tuple[int, ...], chain: List[Tuple[str, str, Any]],
+                    itemsize: int = 1) -> Tuple[int, int]:
+    """
+    Memory of one attack item.
+
+    Args:
+        runner: AttackRunner (gives the output size of geometric attacks)
+        cover_shape: Shape of the stego image the chain starts from
+        chain: (category, attack name, params) steps
+        itemsize: Bytes per image element
+
+    Returns:
+        (held, transient): bytes the item keeps while queued (attacked image and
+        its cover-sized copy for the metrics) and the extra peak while it is attacked
+        or measured
+    """
+    shape, transient = tuple(cover_shape), 0
+    for category, attack_name, params in chain:
+        out_shape = shape
+        transform = runner.geometric_transform(shape, category, attack_name, params)
+        if transform is not None:
+            width, height = transform[1]
+            out_shape = (height, width) + tuple(shape[2:])
+        step = (_elements(shape) + _elements(out_shape)) * itemsize
+        step += ATTACK_SCRATCH_BYTES.get(category, 0) * max(_elements(shape), _elements(out_shape))
+        transient = max(transient, step)
+        shape = out_shape
+
+    held = _elements(shape) * itemsize if chain else 0
+    if shape[:2] != tuple(cover_shape[:2]):
+        held += _elements(cover_shape) * itemsize
+    return held, max(transient, metric_peak_bytes(cover_shape))
+
+
+def task_footprint(runner, cover_shape: Tuple[int, ...], chains: List[List[Tuple[str, str, Any]]],
+                   itemsize: int = 1, slots: int = 1) -> int:
+    """
+    Estimated peak memory of one image x algorithm x payload task.
+
+    The cover and stego image are held throughout. During embed the algorithm
+    works on a float copy; afterwards every attack item may be queued at once
+    (held bytes of all chains) while up to `slots` worker threads run the most
+    expensive attacks/metrics, or while one batched extract works on float
+    copies of all of them.
+    """
+    images = 2 * _elements(cover_shape) * itemsize
+    embed = ALGORITHM_BYTES_PER_ELEMENT * _elements(cover_shape)
+    footprints = [chain_footprint(runner, cover_shape, chain, itemsize) for chain in chains]
+    held = sum(h for h, _ in footprints)
+    transients = sorted((t for _, t in footprints), reverse=True)[:max(1, slots)]
+    extract = ALGORITHM_BYTES_PER_ELEMENT * held // itemsize
+    return images + max(embed, held + max(sum(transients), extract))
+
+
+class MemoryBudget:
+    """
+    Admission control against an estimated memory budget.
+
+    `acquire` blocks until the requested bytes fit under the limit. A
+    request larger than the whole budget is admitted once nothing else is
+    reserved, so oversized tasks run alone instead of deadlocking. With no
+    limit nothing blocks, but the estimated peak is still tracked.
+
+    Only one thread may block in `acquire` (the pipeline's load stage):
+    a second waiter holding reservations could wait on the first forever.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.admitted = 0
+        self.waits = 0
+        self.wait_s = 0.0
+        self.oversized = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int) -> int:
+        with self._cond:
+            if self.limit is not None and self.in_use + nbytes > self.limit and self.in_use > 0:
+                self.waits += 1
+                start = time.perf_counter()
+                self._cond.wait_for(lambda: self.in_use + nbytes <= self.limit or self.in_use == 0)
+                self.wait_s += time.perf_counter() - start
+            if self.limit is not None and nbytes > self.limit:
+                self.oversized += 1
+            self.in_use += nbytes
+            self.admitted += 1
+            self.peak = max(self.peak, self.in_use)
+        return nbytes
+
+    def release(self, nbytes: int):
+        with self._cond:
+            self.in_use -= nbytes
+            self._cond.notify_all()
+
+    def reserve(self, nbytes: int) -> "Reservation":
+        return Reservation(self, self.acquire(nbytes))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "memory_budget_bytes": self.limit,
+            "estimated_peak_bytes": self.peak,
+            "admissions": self.admitted,
+            "admission_waits": self.waits,
+            "admission_wait_s": self.wait_s,
+            "oversized_tasks": self.oversized,
+        }
+
+
+class Reservation:
+    """Bytes held in a MemoryBudget until every item sharing them has been retired."""
+
+    def __init__(self, budget: MemoryBudget, nbytes: int):
+        self.budget = budget
+        self.nbytes = nbytes
+        self._holders = 1
+        self._lock = threading.Lock()
+
+    def share(self, holders: int):
+        """Hand the reservation to `holders` items instead of one (0 retires it)."""
+        with self._lock:
+            self._holders += holders - 1
+            done = self._holders == 0
+        if done:
+            self.budget.release(self.nbytes)
+
+    def retire(self):
+        self.share(0)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of the process's resident set size (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc only, None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class RSSMonitor:
+    """
+    Peak resident set size of the process during one run.
+
+    The process high-water mark (getrusage) is exact when the run raised it;
+    when an earlier run in the same process set a higher mark, the peak of
+    this run comes from sampling the current RSS every `interval` seconds.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._before = None
+        self._sampled = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while True:
+            rss = current_rss_bytes()
+            if rss is None:
+                return
+            self._sampled = max(self._sampled, rss)
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> "RSSMonitor":
+        self._before = peak_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, name="stegoeval-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Optional[int]:
+        """Stop sampling; returns the run's peak RSS in bytes (None where unavailable)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        after = peak_rss_bytes()
+        if after is not None and (self._before is None or after > self._before):
+            return after
+        return max(self._sampled, current_rss_bytes() or 0) or after
@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# End-of-stream marker, one per worker thread of the receiving stage
+_DONE = object()
+
+# Threads of the evaluator's stages when pipeline_threads does not set them
+# (embed and extract stay single-threaded: algorithms need not be thread-safe)
+DEFAULT_STAGE_THREADS = {"embed": 1, "attack": 2, "extract": 1, "metrics": 2}
+
+
+def stage_threads(requested: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Thread count of every evaluator stage: `requested` (pipeline_threads) over the defaults."""
+    requested = requested or {}
+    return {stage: int(requested.get(stage, default)) for stage, default in DEFAULT_STAGE_THREADS.items()}
+
+
+class StageStats:
+    """
+    Counters of one pipeline stage, updated by its worker threads.
+
+    busy_s is time spent in the stage function, starved_s time waiting for
+    input and blocked_s time waiting for room in the next stage's queue
+    (for the source, also time waiting in `admit`).
+    The input queue depth is sampled on every put.
+    """
+
+    def __init__(self, name: str, threads: int, capacity: int):
+        self.name = name
+        self.threads = threads
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.items = 0
+        self.outputs = 0
+        self.errors = 0
+        self.busy_s = 0.0
+        self.starved_s = 0.0
+        self.blocked_s = 0.0
+        self.depth_sum = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+    def add(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def sample_depth(self, depth: int):
+        with self._lock:
+            self.depth_sum += depth
+            self.depth_samples += 1
+            if depth > self.depth_max:
+                self.depth_max = depth
+
+    def summary(self, wall_s: float) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "threads": self.threads,
+            "items": self.items,
+            "outputs": self.outputs,
+            "errors": self.errors,
+            "busy_s": self.busy_s,
+            "starved_s": self.starved_s,
+            "blocked_s": self.blocked_s,
+            # Share of the stage's thread time spent working; the bottleneck is near 1
+            "utilization": self.busy_s / (self.threads * wall_s) if wall_s > 0 else 0.0,
+            "mean_queue_depth": self.depth_sum / self.depth_samples if self.depth_samples else 0.0,
+            "max_queue_depth": self.depth_max,
+            "queue_capacity": self.capacity,
+        }
+
+
+class Pipeline:
+    """
+    Stages connected by bounded queues, each run by its own worker threads.
+
+    A stage function takes one item and returns an iterable of items for the
+    next stage (fan-out and filtering are both allowed); the last stage's
+    return value is ignored. Bounded queues make fast producers wait for
+    slow consumers, so the number of items in flight (and their images)
+    stays bounded. Stages that release the GIL (OpenCV, NumPy, subprocess
+    calls) overlap with each other.
+
+    An exception in a stage function drops that item, counts it in the
+    stage's `errors` and is reported through `on_error`.
+    """
+
+    def __init__(self, queue_size: int = 64,
+                 on_error: Optional[Callable[[str, Any, Exception], None]] = None):
+        self.queue_size = queue_size
+        self.on_error = on_error or (lambda stage, item, e: print(f"Warning: Pipeline stage {stage} failed: {e}"))
+        self.stages = []
+
+    def add_stage(self, name: str, func: Callable[[Any], Optional[Iterable[Any]]], threads: int = 1) -> "Pipeline":
+        self.stages.append((name, func, max(1, int(threads))))
+        return self
+
+    def _put(self, target: queue.Queue, stats: StageStats, item, source_stats: StageStats):
+        start = time.perf_counter()
+        target.put(item)
+        source_stats.add(blocked_s=time.perf_counter() - start)
+        stats.sample_depth(target.qsize())
+
+    def run(self, source: Iterable[Any], source_name: str = "load",
+            admit: Optional[Callable[[Any], Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Feed `source` through all stages and wait until everything drained.
+
+        Args:
+            source: Items for the first stage
+            source_name: Name of the source in the stats
+            admit: Called on every source item before it is queued, returns the
+                item to queue; may block (e.g. memory admission), which counts
+                as the source's blocked_s rather than busy_s
+
+        Returns:
+            One stats row per stage (source first), see StageStats.summary
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stats = [StageStats(name, threads, self.queue_size) for name, _, threads in self.stages]
+        source_stats = StageStats(source_name, 1, 0)
+        remaining = [threads for _, _, threads in self.stages]
+        remaining_lock = threading.Lock()
+
+        def produce():
+            try:
+                start = time.perf_counter()
+                for item in source:
+                    source_stats.add(items=1, outputs=1, busy_s=time.perf_counter() - start)
+                    if admit is not None:
+                        start = time.perf_counter()
+                        item = admit(item)
+                        source_stats.add(blocked_s=time.perf_counter() - start)
+                    self._put(queues[0], stats[0], item, source_stats)
+                    start = time.perf_counter()
+            except Exception as e:
+                source_stats.add(errors=1)
+                self.on_error(source_name, None, e)
+            finally:
+                for _ in range(self.stages[0][2]):
+                    queues[0].put(_DONE)
+
+        def work(index: int):
+            name, func, _ = self.stages[index]
+            inbox, own = queues[index], stats[index]
+            last = index == len(self.stages) - 1
+            while True:
+                start = time.perf_counter()
+                item = inbox.get()
+                own.add(starved_s=time.perf_counter() - start)
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                try:
+                    outputs = func(item)
+                    outputs = [] if last or outputs is None else list(outputs)
+                except Exception as e:
+                    own.add(items=1, errors=1, busy_s=time.perf_counter() - start)
+                    self.on_error(name, item, e)
+                    continue
+                own.add(items=1, outputs=len(outputs), busy_s=time.perf_counter() - start)
+                for output in outputs:
+                    self._put(queues[index + 1], stats[index + 1], output, own)
+
+            # The last worker of a stage closes the next one
+            with remaining_lock:
+                remaining[index] -= 1
+                closing = remaining[index] == 0
+            if closing and not last:
+                for _ in range(self.stages[index + 1][2]):
+                    queues[index + 1].put(_DONE)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=produce, name=f"stegoeval-{source_name}", daemon=True)]
+        for index, (name, _, count) in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(index,), name=f"stegoeval-{name}-{i}", daemon=True)
+                        for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_s = time.perf_counter() - start
+
+        return [source_stats.summary(wall_s)] + [s.summary(wall_s) for s in stats]
@@ -0,0 +1,292 @@
+import threading
+from tqdm import tqdm
+from typing import Dict, Any, List, Optional
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.core.pipeline import DEFAULT_STAGE_THREADS, Pipeline, stage_threads
+from stegoeval.core.memory import metric_peak_bytes, task_footprint
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+from stegoeval.attacks.compression import apply_jpeg_compression
+
+
+class _ExtractBatch:
+    """Attack items of one stego image, collected for one algo.extract_batch call."""
+
+    def __init__(self, size: int):
+        self.pending = size
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    def add(self, job: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add an attacked item (None: one was lost); returns every item once the last one arrived."""
+        with self._lock:
+            if job is not None:
+                self.jobs.append(job)
+            self.pending -= 1
+            if self.pending:
+                return []
+            jobs, self.jobs = self.jobs, []
+            return jobs
+
+
+class PipelineEvaluator(Evaluator):
+    """
+    Staged evaluation loop: load -> embed -> attack -> extract -> metrics -> sink.
+
+    Stages are connected by bounded queues (core/pipeline.py) and run on
+    their own threads, so slow stages (an out-of-process extract, SSIM on
+    large images) overlap with fast ones and images are only loaded as fast
+    as the slowest stage consumes them. A work item is one image x algorithm
+    x payload until the embed stage, then one (clean or attacked) stego
+    image. The attack stage hands all attacked images of a stego image to
+    the extract stage as one batch (algo.extract_batch). Rows have the same
+    columns as Evaluator's, but are recorded in completion order.
+
+    With `memory_budget` set, the load stage admits a task only while the
+    estimated footprint of all tasks in flight (core/memory.py: cover, stego,
+    every queued attack item and the working set of the attack/metrics
+    threads) stays under the budget; the reservation is returned when the
+    task's last row reaches the sink.
+
+    Per-stage thread counts come from `pipeline_threads`; embed and extract
+    default to one thread, as algorithms are not required to be thread-safe.
+    Per-stage busy/starved/blocked times and queue depths are kept in
+    `pipeline_stats` (the stage with the highest utilization and the
+    fullest input queue is the bottleneck).
+
+    Supports clean, individual and combination attacks and the capacity
+    search. Monotone pruning, breaking-point search and adaptive sampling
+    are sequential by design and use Evaluator.
+    """
+
+    STAGES = tuple(DEFAULT_STAGE_THREADS)
+    enforces_memory_budget = True
+
+    def __init__(self, config: dict, algorithms: List[StegoAlgorithm], output_dir: Optional[str] = None):
+        super().__init__(config, algorithms, output_dir=output_dir)
+        threads = config.get("pipeline_threads") or {}
+        unknown = set(threads) - set(self.STAGES)
+        if unknown:
+            print(f"Warning: unknown pipeline stages {sorted(unknown)} in pipeline_threads are ignored")
+        self.stage_threads = stage_threads(threads)
+        self.queue_size = config.get("pipeline_queue_size", 64)
+        # tracemalloc is process-wide: traces would include the other stages' allocations
+        self.track_memory = False
+        # One row per stage after evaluate() (see core/pipeline.py StageStats.summary)
+        self.pipeline_stats = []
+
+        for option in ("prune_monotone", "adaptive_sampling"):
+            if config.get(option):
+                print(f"Warning: {option} is not supported by the pipeline evaluator and is ignored")
+        if self.threshold_search:
+            print("Warning: robustness_threshold is not supported by the pipeline evaluator and is ignored")
+
+    # Work items are dicts; "kind" is baseline, capacity, embed, attack, batch (the attack
+    # items of one stego image) or row. Every item carries the memory reservation of its
+    # task, shared by all items fanned out from it
+
+    def _jobs(self, payload_sizes: List[int], capacity_enabled: bool):
+        """
+        Load stage: one baseline, len(payload_sizes) embed and an optional capacity item per
+        image x algorithm, each with its estimated memory footprint (reserved in `_admit`).
+        """
+        slots = self.stage_threads["attack"] + self.stage_threads["metrics"]
+        # Images are read lazily: the bounded queues and the memory budget keep loading
+        # in step with the slowest stage
+        for img_name, cover_img in self.dataset_loader.get_images(limit=self.limit):
+            yield {"kind": "baseline", "image": img_name, "cover": cover_img,
+                   "footprint": 2 * cover_img.nbytes + metric_peak_bytes(cover_img.shape)}
+            for algo in self.algorithms:
+                for size in payload_sizes:
+                    yield {"kind": "embed", "image": img_name, "cover": cover_img, "algo": algo,
+                           "payload": self._generate_random_payload(size),
+                           "footprint": self._task_footprint(cover_img, slots)}
+                if capacity_enabled:
+                    yield {"kind": "capacity", "image": img_name, "cover": cover_img, "algo": algo,
+                           "footprint": task_footprint(self.attack_runner, cover_img.shape, [], cover_img.itemsize)}
+
+    def _admit(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Reserve the job's footprint (blocks while the budget is full; only the load thread waits here)."""
+        job["reservation"] = self.memory_budget.reserve(job.pop("footprint"))
+        return job
+
+    @staticmethod
+    def _row_item(job: Dict[str, Any], row: Optional[Dict[str, Any]], steps: int) -> Dict[str, Any]:
+        """Item for the sink (row None only advances the progress bar)."""
+        return {"kind": "row", "row": row, "steps": steps, "reservation": job["reservation"]}
+
+    def _embed_stage(self, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Embed and fan out to the clean, individual attack and combination items."""
+        if job["kind"] == "baseline":
+            return [job]
+        img_name, cover_img, algo = job["image"], job["cover"], job["algo"]
+        if job["kind"] == "capacity":
+            with self.timer.time("capacity_search"):
+                row = self._evaluate_max_text_length(img_name, cover_img, algo)
+            return [self._row_item(job, row, 1)]
+
+        payload = job["payload"]
+        try:
+            stego_img, embed_cost = self._call_algorithm(algo, "embed", cover_img, payload)
+        except Exception as e:
+            return [self._row_item(job, {"image": img_name, "algorithm": algo.name(), "error": f"Embed failed: {e}"},
+                                   self._steps_per_embed)]
+
+        cost = {
+            "cover_megapixels": cover_img.shape[0] * cover_img.shape[1] / 1e6,
+            **embed_cost,
+            "extract_time_ms": None,
+            "extract_peak_kb": None,
+        }
+        item = {"kind": "attack", "image": img_name, "cover": cover_img, "algo": algo, "payload": payload,
+                "stego": stego_img, "cost": cost, "reservation": job["reservation"]}
+
+        # Individual attacks record their attack-side stats (compressed_bytes), combinations do not
+        items = [{**item, "category": "none", "attack_name": "clean", "params": "none", "chain": [], "stats": None}]
+        attack_configs = self._get_attack_configurations()
+        items += [{**item, "category": category, "attack_name": attack_name, "params": str(params),
+                   "chain": [(category, attack_name, params)], "stats": {}}
+                  for category, attack_name, params in attack_configs]
+        if self.combo_attacks and attack_configs:
+            items += [{**item, "category": "combo", "attack_name": "+".join(name for _, name, _ in combo),
+                       "params": self._combo_params(combo), "chain": combo, "stats": None}
+                      for combo in self._generate_combinations(attack_configs)]
+        batch = _ExtractBatch(len(items))
+        for attack_item in items:
+            attack_item["batch"] = batch
+        job["reservation"].share(len(items))
+        return items
+
+    def _attack_stage(self, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if job["kind"] == "baseline":
+            try:
+                with self.timer.time("baseline.jpeg"):
+                    job["comparable"] = apply_jpeg_compression(job["cover"], quality=95)
+            except Exception as e:
+                print(f"Warning: Baseline calculation failed for {job['image']}: {e}")
+                return [self._row_item(job, None, 0)]
+            return [job]
+        if job["kind"] != "attack":
+            return [job]
+
+        if not job["chain"]:
+            job["attacked"] = job["comparable"] = job["stego"]
+        else:
+            try:
+                job["attacked"], job["comparable"] = self._apply_attack_chain(
+                    job["stego"], job["chain"], job["cover"].shape, job["stats"])
+            except Exception as e:
+                print(f"Warning: Attack {job['attack_name']}.{job['category']} failed: {e}")
+                return [self._row_item(job, None, 1)] + self._batch_item(job["batch"].add(None))
+        return self._batch_item(job["batch"].add(job))
+
+    @staticmethod
+    def _batch_item(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Extract-stage item of a completed batch (nothing while the batch is incomplete)."""
+        return [{"kind": "batch", "jobs": jobs}] if jobs else []
+
+    def _extract_stage(self, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if job["kind"] != "batch":
+            return [job]
+        jobs = job["jobs"]
+        extracted = self._extract_many(jobs[0]["algo"], [item["attacked"] for item in jobs])
+        for item, (output, extract_cost) in zip(jobs, extracted):
+            item["robustness"] = {"ber": 1.0, "ncc_secret": 0.0, "payload_recovered": False,
+                                  "embedded_payload": item["payload"], "extracted_payload": ""}
+            self._fill_robustness(item["robustness"], item["payload"], output, {})
+            item["extract_cost"] = extract_cost
+            # The attacked image is no longer needed; drop it before the item waits in the next queue
+            del item["attacked"], item["batch"]
+        return jobs
+
+    def _metrics_stage(self, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Distortion (and, for clean rows, detectability) metrics; builds the result row."""
+        if job["kind"] == "row":
+            return [job]
+        cover_img = job["cover"]
+        metrics = self._compute_distortion_metrics(cover_img, job["comparable"])
+
+        if job["kind"] == "baseline":
+            row = {
+                "image": job["image"],
+                "algorithm": "COVER_IMAGE_BASELINE",
+                "payload_size": 0,
+                "attack_category": "baseline",
+                "attack_name": "clean_jpeg_save",
+                "attack_params": "quality=95",
+                **metrics,
+                "ber": 0.0,
+                "ncc_secret": 0.0,
+                "payload_recovered": False,
+                "embedded_payload": "N/A",
+                "extracted_payload": "N/A"
+            }
+            return [self._row_item(job, row, 0)]
+
+        if job["category"] == "none":
+            metrics.update(self._compute_detectability_metrics(cover_img, job["stego"]))
+        row = {
+            "image": job["image"],
+            "algorithm": job["algo"].name(),
+            "payload_size": len(job["payload"]),
+            "attack_category": job["category"],
+            "attack_name": job["attack_name"],
+            "attack_params": job["params"],
+            **metrics,
+            **job["robustness"],
+            **job["cost"],
+            **job["extract_cost"],
+            **(job["stats"] or {}),
+        }
+        return [self._row_item(job, row, 1)]
+
+    def _drop(self, stage: str, job: Dict[str, Any], e: Exception):
+        """Pipeline error hook: the item is lost, return its share of the task's memory."""
+        print(f"Warning: Pipeline stage {stage} failed: {e}")
+        if job is None:
+            return
+        lost = job["jobs"] if job["kind"] == "batch" else [job]
+        if stage == "attack" and job["kind"] == "attack":
+            # Items already waiting for this one in its extract batch are lost with it
+            lost += job["batch"].add(None)
+        for item in lost:
+            item["reservation"].retire()
+
+    def evaluate(self) -> List[Dict[str, Any]]:
+        payload_sizes = self.config.get("payload_sizes", [10, 100, 1000, 5000])
+        capacity_enabled = self.config.get("capacity", {}).get("enabled", False)
+
+        num_images = len(self.dataset_loader)
+        if self.limit:
+            num_images = min(num_images, self.limit)
+        if not num_images:
+            print("No images found to evaluate.")
+            return self.results
+
+        total_attacks = len(self._get_attack_configurations())
+        combo_multiplier = len(self._generate_combinations(self._get_attack_configurations())) if self.combo_attacks else 0
+        self._steps_per_embed = 1 + total_attacks + combo_multiplier
+        total_steps = num_images * len(self.algorithms) * (
+            len(payload_sizes) * self._steps_per_embed + (1 if capacity_enabled else 0))
+
+        with self.timer.time("total"), tqdm(total=total_steps, desc="Evaluating (pipeline)", unit="step") as pbar:
+            def sink(job):
+                # Single sink thread: rows, scoreboard and progress bar are only touched here
+                if job["row"] is not None:
+                    self._record([job["row"]])
+                    self._publish_live_scores(pbar)
+                pbar.update(job["steps"])
+                job["reservation"].retire()
+
+            pipeline = Pipeline(queue_size=self.queue_size, on_error=self._drop)
+            pipeline.add_stage("embed", self._embed_stage, self.stage_threads["embed"])
+            pipeline.add_stage("attack", self._attack_stage, self.stage_threads["attack"])
+            pipeline.add_stage("extract", self._extract_stage, self.stage_threads["extract"])
+            pipeline.add_stage("metrics", self._metrics_stage, self.stage_threads["metrics"])
+            pipeline.add_stage("sink", sink, 1)
+            self.pipeline_stats = pipeline.run(self._jobs(payload_sizes, capacity_enabled), admit=self._admit)
+
+            self._publish_live_scores(pbar, force=True)
+
+        self._alias_duplicates()
+        return self.results
@@ -0,0 +1,161 @@
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _NullTiming:
+    """Shared no-op context manager returned when timing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMING = _NullTiming()
+
+
+class _Timing:
+    __slots__ = ("timer", "stage", "start")
+
+    def __init__(self, timer: "StageTimer", stage: str):
+        self.timer = timer
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """
+    Lightweight wall-time accumulator for evaluator stages.
+
+    Usage:
+        with timer.time("embed"):
+            stego = algo.embed(cover, payload)
+
+    When disabled, `time()` returns a shared no-op context manager, so the
+    instrumentation costs one method call per stage. Recording is thread-safe
+    (the async evaluator times attacks and metrics on worker threads).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.maxima = defaultdict(float)
+
+    def time(self, stage: str):
+        if not self.enabled:
+            return _NULL_TIMING
+        return _Timing(self, stage)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.totals[stage] += seconds
+            self.counts[stage] += 1
+            if seconds > self.maxima[stage]:
+                self.maxima[stage] = seconds
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate timings, one row per stage sorted by total time.
+
+        Returns rows with: stage, calls, total_s, mean_s, max_s, share
+        (share of the "total" stage if recorded, else of the summed stages).
+        """
+        if not self.totals:
+            return []
+
+        reference = self.totals.get("total") or sum(self.totals.values())
+        rows = []
+        for stage, total in sorted(self.totals.items(), key=lambda kv: kv[1], reverse=True):
+            calls = self.counts[stage]
+            rows.append({
+                "stage": stage,
+                "calls": calls,
+                "total_s": total,
+                "mean_s": total / calls if calls else 0.0,
+                "max_s": self.maxima[stage],
+                "share": total / reference if reference else 0.0,
+            })
+        return rows
+
+
+def traced_call(func, *args) -> Tuple[Any, int]:
+    """
+    Call `func` once under tracemalloc.
+
+    NumPy reports its buffers to tracemalloc, so the peak covers array
+    temporaries as well as Python objects. Tracing slows pure-Python code
+    considerably, and tracemalloc is process-wide: allocations of other
+    threads during the call are counted too.
+
+    Returns:
+        (result, peak heap allocation of the call in bytes)
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        output = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return output, max(0, peak - before)
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler for long runs.
+
+    A background thread samples the stack of the profiled thread every
+    `interval` seconds and counts collapsed stacks, written in the
+    "folded" format understood by flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="stegoeval-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.samples.items(), key=lambda kv: kv[1], reverse=True):
+                f.write(f"{stack} {count}\n")
@@ -0,0 +1,97 @@
+"""
+Process-wide thread budget.
+
+OpenCV, the BLAS behind NumPy/SciPy and OpenMP each start their own thread
+pools sized to the machine. With several workers (async evaluator threads
+or worker processes) every worker gets a full pool and the machine ends up
+with hundreds of runnable threads. The layout chosen here is applied once
+at start-up (and by `apply_thread_layout` as a worker initializer) so that
+
+    workers * threads_per_worker <= cores
+"""
+
+import os
+from typing import Any, Dict, Optional, Union
+
+# Environment variables read by the BLAS / OpenMP runtimes when they load
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects affinity / cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_thread_layout(threads: Union[int, str, None], threads_per_worker: Optional[int] = None,
+                          workers: Optional[int] = None, parallel: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Decide how many workers run in parallel and how many threads each may use.
+
+    Args:
+        threads: Total thread budget, "auto" (all available cores) or None
+            (leave every library at its default and report nothing)
+        threads_per_worker: Intra-op threads per worker (OpenCV/BLAS); derived if None
+        workers: Requested inter-image workers; derived if None
+        parallel: Whether the evaluator can use more than one worker
+            (the async evaluator's thread pool)
+
+    Returns:
+        {"cores", "threads", "workers", "threads_per_worker"} or None
+    """
+    if threads is None and threads_per_worker is None:
+        return None
+
+    cores = available_cores()
+    budget = cores if threads in (None, "auto") else max(1, int(threads))
+
+    if not parallel:
+        workers = 1
+    elif workers is None:
+        # Auto: favour inter-image parallelism, each worker single-threaded
+        # unless threads_per_worker asks for more
+        workers = max(1, budget // (threads_per_worker or 1))
+    if threads_per_worker is None:
+        threads_per_worker = max(1, budget // workers)
+
+    return {
+        "cores": cores,
+        "threads": budget,
+        "workers": workers,
+        "threads_per_worker": threads_per_worker,
+    }
+
+
+def apply_thread_layout(layout: Optional[Dict[str, Any]]):
+    """
+    Limit OpenCV, BLAS and OpenMP to the layout's threads per worker.
+
+    Environment variables only take effect for libraries loaded afterwards,
+    so call this before NumPy-heavy modules are imported (the CLI does) and
+    as the initializer of worker processes. OpenCV's limit applies
+    immediately.
+    """
+    if layout is None:
+        return
+
+    per_worker = str(layout["threads_per_worker"])
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = per_worker
+
+    import cv2
+    cv2.setNumThreads(layout["threads_per_worker"])
+
+    # Runtime limit for BLAS pools that are already loaded (optional dependency)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(layout["threads_per_worker"])
+    except ImportError:
+        pass
@@ -1,6 +1,5 @@
 import numpy as np
 import cv2
-from skimage.metrics import structural_similarity
 
 def _match_dims(cover: np.ndarray, stego: np.ndarray) -> np.ndarray:
     if cover.shape != stego.shape:
@@ -33,6 +32,9 @@ def calculate_psnr(cover: np.ndarray, stego: np.ndarray) -> float:
 
 def calculate_ssim(cover: np.ndarray, stego: np.ndarray) -> float:
     """Structural Similarity Index"""
+    # Imported lazily: scikit-image is the slowest import in the package
+    from skimage.metrics import structural_similarity
+
     stego = _match_dims(cover, stego)
     
     # Calculate appropriate window size based on image dimensions
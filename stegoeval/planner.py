@@ -0,0 +1,296 @@
+"""
+StegoEval Run Planner
+
+Predicts the cost of a run before launching it (`stegoeval plan`):
+1. Expand the config into work units: images, algorithms, payload sizes,
+   attacks, attack combinations and capacity probes.
+2. Calibrate by evaluating a few real covers per algorithm with stage
+   timings on (the same Evaluator code path as a real run, without combos).
+3. Scale the per-call costs by cover size (megapixels) to the whole
+   dataset and predict wall time, peak memory and output size for a
+   given number of workers.
+
+Worker counts assume images are spread evenly over workers with no
+contention; treat the parallel estimate as a lower bound.
+"""
+
+import io
+import math
+import os
+import pickle
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+# Warn when one image x algorithm x payload expands into more combinations than this
+COMBO_WARNING = 1000
+# Warn when a run is predicted to produce more result rows than this
+ROWS_WARNING = 5_000_000
+# Warn when a run is predicted to take longer than this (seconds)
+DURATION_WARNING = 24 * 3600
+
+# Working copies of a cover held by one worker at a time
+# (cover, stego, attacked image, float temporaries of the metrics)
+WORKING_SET_FACTOR = 8
+
+
+def _dataset_megapixels(paths: List[str]) -> List[Tuple[float, int]]:
+    """(megapixels, channels) of every readable cover, read from the image headers only."""
+    from PIL import Image
+
+    sizes = []
+    for path in paths:
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                channels = len(img.getbands())
+        except Exception:
+            continue
+        sizes.append((width * height / 1e6, channels))
+    return sizes
+
+
+def expand_config(config: Dict[str, Any], num_images: int) -> Dict[str, Any]:
+    """Count the work units a config expands to, without running anything."""
+    from stegoeval.core.evaluator import attack_configurations
+
+    attack_configs = attack_configurations(config)
+
+    per_category = {}
+    for category, _, _ in attack_configs:
+        per_category[category] = per_category.get(category, 0) + 1
+    combos = math.prod(per_category.values()) if config.get("combo_attacks") and per_category else 0
+
+    algorithms = len(config.get("algorithms", []))
+    payloads = len(config.get("payload_sizes", []))
+    capacity = config.get("capacity", {})
+    capacity_probes = math.ceil(math.log2(max(2, capacity.get("max_payload", 100000)))) + 1 if capacity.get("enabled") else 0
+
+    tasks = num_images * algorithms * payloads
+    rows_per_task = 1 + len(attack_configs) + combos
+    return {
+        "images": num_images,
+        "algorithms": algorithms,
+        "payload_sizes": payloads,
+        "attacks": len(attack_configs),
+        "attacks_per_category": per_category,
+        "combos_per_task": combos,
+        "capacity_probes_per_image": capacity_probes,
+        "tasks": tasks,
+        "rows": tasks * rows_per_task + num_images + (num_images * algorithms if capacity_probes else 0),
+        "embed_calls": tasks + num_images * algorithms * capacity_probes,
+        "extract_calls": tasks * rows_per_task + num_images * algorithms * capacity_probes,
+        "attack_calls": tasks * (len(attack_configs) + combos * len(per_category)),
+    }
+
+
+def _stage_means(timings: List[Dict[str, Any]]) -> Dict[str, float]:
+    return {row["stage"]: row["mean_s"] for row in timings}
+
+
+def calibrate(config: Dict[str, Any], algorithm_name: str, sample_images: int) -> Dict[str, Any]:
+    """Evaluate `sample_images` real covers with one algorithm and return per-call costs."""
+    import random
+    import numpy as np
+    from stegoeval.core.evaluator import Evaluator, DISTORTION_METRICS
+    from stegoeval.stego_algorithms.registry import load_algorithm
+
+    sample_config = {
+        **config,
+        "dataset_limit": sample_images,
+        "combo_attacks": False,
+        "timings": True,
+        "live_scores": False,
+        "adaptive_sampling": False,
+        "prune_monotone": False,
+        "robustness_threshold": {},
+        "results_db": None,
+    }
+    random.seed(0)
+    np.random.seed(0)
+    evaluator = Evaluator(config=sample_config, algorithms=[load_algorithm(algorithm_name)])
+    results = evaluator.evaluate()
+    means = _stage_means(evaluator.timer.summary())
+    rows = pd.DataFrame(results)
+    images = rows["image"].nunique() if not rows.empty else 0
+
+    def mean(stage: str) -> float:
+        return means.get(stage, 0.0)
+
+    metrics_row = sum(mean(f"metric.{key}") for key, _ in DISTORTION_METRICS) + mean("metric.ber") + mean("metric.ncc_secret")
+    attack_means = {stage[len("attack."):]: value for stage, value in means.items() if stage.startswith("attack.")}
+
+    # Sizes of one result row in memory and on disk
+    algo_rows = rows[rows["algorithm"] != "COVER_IMAGE_BASELINE"] if not rows.empty else rows
+    bytes_per_row = {"memory": 0.0, "csv": 0.0, "parquet": None}
+    if not algo_rows.empty:
+        bytes_per_row["memory"] = len(pickle.dumps(results)) / len(results) + algo_rows.memory_usage(deep=True).sum() / len(algo_rows)
+        bytes_per_row["csv"] = len(algo_rows.to_csv(index=False).encode()) / len(algo_rows)
+        try:
+            buffer = io.BytesIO()
+            algo_rows.to_parquet(buffer, engine="pyarrow", compression="zstd", index=False)
+            bytes_per_row["parquet"] = buffer.tell() / len(algo_rows)
+        except ImportError:
+            pass
+
+    peaks = [rows[col].max() for col in ("embed_peak_kb", "extract_peak_kb") if col in rows and rows[col].notna().any()]
+    return {
+        "images": images,
+        "embed_s": mean("embed"),
+        "extract_s": mean("extract"),
+        "payload_s": mean("payload_generation"),
+        "metrics_row_s": metrics_row,
+        "attack_s": attack_means,
+        "baseline_s": mean("baseline.jpeg"),
+        "capacity_s": mean("capacity_search"),
+        "load_s": mean("load_images") / images if images else 0.0,
+        "peak_kb": max(peaks) if peaks else 0.0,
+        "bytes_per_row": bytes_per_row,
+    }
+
+
+def plan_run(config: Dict[str, Any], workers: int = 1, sample_images: int = 2,
+             progress: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Expand, calibrate and predict a run.
+
+    Returns a dict with the work-unit counts ("expansion"), the per-algorithm
+    calibration, predicted "wall_time_s", "serial_time_s", "peak_memory_bytes",
+    "output_bytes" and a list of "warnings".
+    """
+    from stegoeval.core.dataset_loader import DatasetLoader
+    from stegoeval.core.evaluator import attack_configurations
+
+    loader = DatasetLoader(config.get("dataset_path", "./data"), deduplicate=config.get("deduplicate", False),
+                           manifest_path=config.get("dataset_manifest"), limit=config.get("dataset_limit"))
+    paths = loader.image_paths
+    sizes = _dataset_megapixels(paths)
+    if not sizes:
+        raise ValueError(f"No readable images in {config.get('dataset_path')}")
+
+    expansion = expand_config(config, len(sizes))
+    mean_mp = sum(mp for mp, _ in sizes) / len(sizes)
+    max_mp, max_channels = max(sizes)
+    sample_mp = sum(mp for mp, _ in sizes[:sample_images]) / min(sample_images, len(sizes))
+    scale = mean_mp / sample_mp if sample_mp else 1.0
+
+    attack_configs = attack_configurations(config)
+    payloads = expansion["payload_sizes"]
+    combos = expansion["combos_per_task"]
+    rows_per_task = 1 + expansion["attacks"] + combos
+
+    calibration = {}
+    serial_s = 0.0
+    peak_kb = 0.0
+    bytes_per_row = {"memory": 0.0, "csv": 0.0, "parquet": None}
+    for name in config.get("algorithms", []):
+        progress(f"Calibrating {name} on {min(sample_images, len(sizes))} cover(s)...")
+        cal = calibrate(config, name, sample_images)
+        calibration[name] = cal
+
+        # Per image x algorithm x payload: embed, extracts + metrics for every
+        # row, each configured attack once, each combo's component attacks
+        attack_sum = 0.0
+        category_sums = {}
+        for category, attack_name, _ in attack_configs:
+            cost = cal["attack_s"].get(f"{category}.{attack_name}", 0.0)
+            attack_sum += cost
+            category_sums[category] = category_sums.get(category, 0.0) + cost
+        combo_attacks = sum(
+            total * combos / expansion["attacks_per_category"][category]
+            for category, total in category_sums.items()
+        ) if combos else 0.0
+
+        task_s = (cal["embed_s"] + cal["payload_s"] + rows_per_task * (cal["extract_s"] + cal["metrics_row_s"])
+                  + attack_sum + combo_attacks)
+        image_s = payloads * task_s + cal["capacity_s"]
+        serial_s += expansion["images"] * image_s * scale
+
+        peak_kb = max(peak_kb, cal["peak_kb"])
+        for key in ("memory", "csv"):
+            bytes_per_row[key] = max(bytes_per_row[key], cal["bytes_per_row"][key])
+        if cal["bytes_per_row"]["parquet"] is not None:
+            bytes_per_row["parquet"] = max(bytes_per_row["parquet"] or 0.0, cal["bytes_per_row"]["parquet"])
+
+    # Work independent of the algorithms: loading covers and the baseline save
+    first = next(iter(calibration.values()), None)
+    if first is not None:
+        serial_s += expansion["images"] * (first["load_s"] + first["baseline_s"] + first["metrics_row_s"]) * scale
+
+    parallel = max(1, min(workers, expansion["images"]))
+    wall_s = serial_s / parallel
+
+    # Memory: every worker holds a few copies of the largest cover plus the
+    # algorithm's own peak; the parent keeps all rows and a DataFrame of them
+    cover_bytes = max_mp * 1e6 * max_channels
+    if peak_kb:
+        algo_peak = peak_kb * 1024 * (max_mp / sample_mp if sample_mp else 1.0)
+    else:
+        # No measured peak (track_memory off, algorithm does not report one): assume a float64 copy
+        from stegoeval.core.memory import ALGORITHM_BYTES_PER_ELEMENT
+        algo_peak = cover_bytes * ALGORITHM_BYTES_PER_ELEMENT
+    peak_memory = parallel * (cover_bytes * WORKING_SET_FACTOR + algo_peak) + expansion["rows"] * bytes_per_row["memory"]
+
+    if config.get("output_format", "csv") == "parquet" and bytes_per_row["parquet"] is not None:
+        output_bytes = expansion["rows"] * bytes_per_row["parquet"]
+    else:
+        # Full CSV plus the per-category copies
+        output_bytes = 2 * expansion["rows"] * bytes_per_row["csv"]
+
+    warnings = []
+    if combos > COMBO_WARNING:
+        warnings.append(f"combo_attacks expands to {combos:,} combinations per image x algorithm x payload "
+                        f"({expansion['tasks'] * combos:,} combination rows)")
+    if expansion["rows"] > ROWS_WARNING:
+        warnings.append(f"{expansion['rows']:,} result rows; consider output_format: parquet or fewer attack settings")
+    if wall_s > DURATION_WARNING:
+        warnings.append(f"predicted wall time {wall_s / 3600:.1f} h with {parallel} worker(s)")
+    try:
+        physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        if peak_memory > 0.8 * physical:
+            warnings.append(f"predicted peak memory {peak_memory / 2**30:.1f} GiB exceeds 80% of physical memory "
+                            f"({physical / 2**30:.1f} GiB)")
+    except (ValueError, OSError, AttributeError):
+        pass
+
+    return {
+        "expansion": expansion,
+        "mean_megapixels": mean_mp,
+        "calibration": calibration,
+        "workers": parallel,
+        "serial_time_s": serial_s,
+        "wall_time_s": wall_s,
+        "peak_memory_bytes": peak_memory,
+        "output_bytes": output_bytes,
+        "warnings": warnings,
+    }
+
+
+def format_plan(plan: Dict[str, Any]) -> str:
+    """Human-readable plan report."""
+    def duration(seconds: float) -> str:
+        if seconds < 120:
+            return f"{seconds:.1f} s"
+        if seconds < 7200:
+            return f"{seconds / 60:.1f} min"
+        return f"{seconds / 3600:.1f} h"
+
+    exp = plan["expansion"]
+    lines = [
+        "## Work",
+        f"- Images: {exp['images']:,} (mean {plan['mean_megapixels']:.2f} MP)",
+        f"- Algorithms: {exp['algorithms']}, payload sizes: {exp['payload_sizes']}",
+        f"- Attacks per stego: {exp['attacks']:,} individual + {exp['combos_per_task']:,} combinations",
+        f"- Capacity probes per image x algorithm: {exp['capacity_probes_per_image']}",
+        f"- Calls: {exp['embed_calls']:,} embed, {exp['extract_calls']:,} extract, {exp['attack_calls']:,} attack",
+        f"- Result rows: {exp['rows']:,}",
+        "",
+        "## Prediction",
+        f"- Wall time: {duration(plan['wall_time_s'])} with {plan['workers']} worker(s) "
+        f"(serial {duration(plan['serial_time_s'])})",
+        f"- Peak memory: {plan['peak_memory_bytes'] / 2**20:,.0f} MiB",
+        f"- Output size: {plan['output_bytes'] / 2**20:,.1f} MiB",
+    ]
+    if plan["warnings"]:
+        lines += ["", "## Warnings"] + [f"- {warning}" for warning in plan["warnings"]]
+    return "\n".join(lines)
@@ -0,0 +1,290 @@
+"""
+Cross-run results database.
+
+With `results_db: path/to/stegoeval.db` in the config, ReportGenerator
+appends every run (metadata, result rows and scores) to one SQLite file,
+indexed for the usual cross-run slices:
+
+    stegoeval query --db results/stegoeval.db -a example_lsb --attack jpeg --params 50 --metric ber
+    stegoeval compare nightly-0412 nightly-0413 --db results/stegoeval.db
+
+Runs are referenced by numeric id or by name (latest run with that name).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from stegoeval.scoring import calculate_distortion_score, calculate_robustness_score, calculate_stegnoeval_score
+
+# Result columns stored per row (others stay in the run's CSV/Parquet files)
+RESULT_COLUMNS = {
+    "image": "TEXT",
+    "algorithm": "TEXT",
+    "payload_size": "INTEGER",
+    "attack_category": "TEXT",
+    "attack_name": "TEXT",
+    "attack_params": "TEXT",
+    "mse": "REAL",
+    "psnr": "REAL",
+    "ssim": "REAL",
+    "ber": "REAL",
+    "ncc_secret": "REAL",
+    "payload_recovered": "INTEGER",
+    "cover_megapixels": "REAL",
+    "embed_time_ms": "REAL",
+    "embed_peak_kb": "REAL",
+    "extract_time_ms": "REAL",
+    "extract_peak_kb": "REAL",
+    "pruned": "INTEGER",
+}
+
+SCORE_COLUMNS = {
+    "algorithm": "TEXT",
+    "attack_category": "TEXT",
+    "avg_ssim": "REAL",
+    "avg_psnr": "REAL",
+    "avg_ber": "REAL",
+    "recovery_rate": "REAL",
+    "overall_score": "REAL",
+    "images_tested": "INTEGER",
+}
+
+# Rows are matched across runs on these columns
+JOIN_KEY = ["image", "algorithm", "payload_size", "attack_category", "attack_name", "attack_params"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    config_hash TEXT,
+    code_version TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    {", ".join(f"{col} {sql_type}" for col, sql_type in RESULT_COLUMNS.items())}
+);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    {", ".join(f"{col} {sql_type}" for col, sql_type in SCORE_COLUMNS.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_results_attack ON results (algorithm, attack_name, attack_params, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_image ON results (image, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_scores_run ON scores (run_id, algorithm);
+"""
+
+
+# Config keys that name or place a run without changing what it measures
+UNHASHED_CONFIG_KEYS = {"run_name", "results_db", "threads", "threads_per_worker", "thread_layout",
+                        "memory_budget", "run_memory"}
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Stable hash of a run configuration (equal for reruns of the same benchmark)."""
+    hashed = {k: v for k, v in config.items() if k not in UNHASHED_CONFIG_KEYS}
+    return hashlib.sha256(json.dumps(hashed, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def code_version() -> str:
+    """Installed stegoeval version plus the git commit when run from a checkout."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        label = version("stegoeval")
+    except PackageNotFoundError:
+        label = "unknown"
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        if commit.returncode == 0:
+            label += f"+{commit.stdout.strip()}"
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return label
+
+
+class ResultsDatabase:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def append_run(self, run_name: str, results: pd.DataFrame, scores: Optional[pd.DataFrame] = None,
+                   config: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Store one run in a single transaction.
+
+        Args:
+            run_name: Name of the run
+            results: Result rows (baseline rows included)
+            scores: Optional per-category scores (calculate_scores_by_category columns)
+            config: Optional run configuration, stored with its hash
+
+        Returns:
+            run_id of the new run
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (run_name, created_at, config_hash, code_version, config) VALUES (?, ?, ?, ?, ?)",
+                (run_name, datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                 config_hash(config) if config is not None else None, code_version(),
+                 json.dumps(config, sort_keys=True, default=str) if config is not None else None),
+            )
+            run_id = cursor.lastrowid
+            self._insert("results", run_id, results, RESULT_COLUMNS)
+            if scores is not None and not scores.empty:
+                self._insert("scores", run_id, scores, SCORE_COLUMNS)
+        return run_id
+
+    def _insert(self, table: str, run_id: int, df: pd.DataFrame, columns: Dict[str, str]):
+        frame = df.reindex(columns=list(columns))
+        for col, sql_type in columns.items():
+            if sql_type == "INTEGER":
+                frame[col] = frame[col].astype("Float64").round().astype("Int64")
+        frame = frame.astype(object).where(frame.notna(), None)
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        self.conn.executemany(
+            f"INSERT INTO {table} (run_id, {', '.join(columns)}) VALUES ({placeholders})",
+            ((run_id, *row) for row in frame.itertuples(index=False, name=None)),
+        )
+
+    def runs(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """Stored runs, newest first."""
+        sql = "SELECT run_id, run_name, created_at, config_hash, code_version FROM runs ORDER BY run_id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return pd.read_sql_query(sql, self.conn)
+
+    def resolve_run(self, run: Union[int, str]) -> int:
+        """Run id from a numeric id or a run name (latest run with that name)."""
+        if isinstance(run, int) or str(run).isdigit():
+            row = self.conn.execute("SELECT run_id FROM runs WHERE run_id = ?", (int(run),)).fetchone()
+        else:
+            row = self.conn.execute("SELECT MAX(run_id) FROM runs WHERE run_name = ?", (run,)).fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"Unknown run '{run}' in {self.path}")
+        return row[0]
+
+    def query(self, metric: str = "ber", algorithms: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+              attacks: Optional[List[str]] = None, params: Optional[List[str]] = None, images: Optional[List[str]] = None,
+              last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Mean of `metric` per run and algorithm over a slice of rows, oldest run first.
+
+        Filters match exactly; `last` keeps only the most recent N runs.
+        """
+        if metric not in RESULT_COLUMNS:
+            raise ValueError(f"Unknown metric '{metric}'. Stored columns: {', '.join(RESULT_COLUMNS)}")
+
+        where, args = ["r.algorithm != 'COVER_IMAGE_BASELINE'"], []
+        for col, values in [("algorithm", algorithms), ("attack_category", categories), ("attack_name", attacks),
+                            ("attack_params", params), ("image", images)]:
+            if values:
+                where.append(f"r.{col} IN ({', '.join('?' for _ in values)})")
+                args.extend(values)
+        if last:
+            where.append("r.run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)")
+            args.append(int(last))
+
+        sql = f"""
+            SELECT r.run_id, u.run_name, u.created_at, r.algorithm,
+                   AVG(r.{metric}) AS mean_{metric}, COUNT(r.{metric}) AS rows
+            FROM results r JOIN runs u ON u.run_id = r.run_id
+            WHERE {" AND ".join(where)}
+            GROUP BY r.run_id, r.algorithm
+            ORDER BY r.run_id, r.algorithm
+        """
+        return pd.read_sql_query(sql, self.conn, params=args)
+
+    def _run_rows(self, run_id: int) -> pd.DataFrame:
+        return pd.read_sql_query(
+            # Embed-error rows have no attack and nothing to compare
+            "SELECT * FROM results WHERE run_id = ? AND algorithm != 'COVER_IMAGE_BASELINE'"
+            " AND attack_category IS NOT NULL",
+            self.conn, params=(run_id,),
+        ).drop(columns=["run_id"])
+
+    def compare(self, run_a: Union[int, str], run_b: Union[int, str], alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Compare two runs on rows matched by JOIN_KEY.
+
+        Per algorithm x attack category, tests paired per-image differences
+        (paired t-test; rows of one image are not independent samples) of:
+        - score: the StegnoEval formula applied per image (mean SSIM/PSNR/BER
+          of the image's rows, recovery indicator from the run's pooled rate)
+        - ber, ssim, extract_time_ms: mean of the image's matched rows
+        - embed_time_ms: mean of the image's matched clean rows
+
+        Raises ValueError when JOIN_KEY does not identify rows uniquely in
+        either run (e.g. combination rows stored before attack_params held
+        the full chain), instead of pairing every duplicate with every other.
+
+        Returns one row per algorithm x category x metric with the means of
+        both runs, the delta (b - a), the number of paired images, the p-value and a
+        `significant` flag (p < alpha).
+        """
+        from scipy import stats
+
+        id_a, id_b = self.resolve_run(run_a), self.resolve_run(run_b)
+        try:
+            merged = self._run_rows(id_a).merge(self._run_rows(id_b), on=JOIN_KEY, suffixes=("_a", "_b"),
+                                                validate="one_to_one")
+        except pd.errors.MergeError as e:
+            raise ValueError(f"Runs {run_a} and {run_b} have rows with the same {', '.join(JOIN_KEY)}; "
+                             f"they cannot be paired ({e})") from e
+
+        def per_image_means(group: pd.DataFrame, metric: str) -> Tuple[pd.Series, pd.Series]:
+            means = group.groupby("image")[[f"{metric}_a", f"{metric}_b"]].mean()
+            return means[f"{metric}_a"], means[f"{metric}_b"]
+
+        def per_image_scores(group: pd.DataFrame, side: str) -> pd.Series:
+            recovered = group[f"payload_recovered_{side}"].mean() > 0
+            means = group.groupby("image")[[f"ssim_{side}", f"psnr_{side}", f"ber_{side}"]].mean()
+            return pd.Series([
+                calculate_stegnoeval_score(calculate_distortion_score(ssim, psnr), calculate_robustness_score(ber, recovered))
+                for ssim, psnr, ber in means.itertuples(index=False, name=None)
+            ], index=means.index)
+
+        rows = []
+        for (algo, category), group in merged.groupby(["algorithm", "attack_category"], sort=False):
+            samples = {}
+            if category != "none":
+                samples["score"] = (per_image_scores(group, "a"), per_image_scores(group, "b"))
+                for metric in ["ber", "ssim", "extract_time_ms"]:
+                    samples[metric] = per_image_means(group, metric)
+            else:
+                samples["embed_time_ms"] = per_image_means(group, "embed_time_ms")
+
+            for metric, (a, b) in samples.items():
+                pairs = pd.concat([a.rename("a"), b.rename("b")], axis=1).dropna()
+                if pairs.empty:
+                    continue
+                p_value = float("nan")
+                if len(pairs) > 1 and (pairs["b"] - pairs["a"]).std() > 0:
+                    p_value = float(stats.ttest_rel(pairs["b"], pairs["a"]).pvalue)
+                rows.append({
+                    "algorithm": algo,
+                    "attack_category": category,
+                    "metric": metric,
+                    "run_a": pairs["a"].mean(),
+                    "run_b": pairs["b"].mean(),
+                    "delta": pairs["b"].mean() - pairs["a"].mean(),
+                    "pairs": len(pairs),
+                    "p_value": p_value,
+                    "significant": bool(p_value < alpha),
+                })
+        return pd.DataFrame(rows)
@@ -0,0 +1,143 @@
+"""
+Parquet result storage and on-demand exports.
+
+In Parquet mode, ReportGenerator writes one dataset per run
+(`results-<run>.parquet/`), hive-partitioned by algorithm and
+attack_category, with typed columns and zstd compression. Category files are
+not written eagerly; `stegoeval export` (or `export_results`) produces them
+when needed. Notebooks can read just the partitions they need:
+
+    load_results("./results", "benchmark", algorithms=["example_lsb"], categories=["noise"])
+"""
+
+import os
+import pandas as pd
+from typing import List, Optional
+
+PARTITION_COLUMNS = ["algorithm", "attack_category"]
+# Partition value of rows that have none (embed errors)
+ERROR_PARTITION = "error"
+
+STRING_COLUMNS = [
+    "image", "algorithm", "attack_category", "attack_name", "attack_params",
+    "embedded_payload", "extracted_payload", "error",
+]
+BOOLEAN_COLUMNS = ["payload_recovered", "pruned"]
+INTEGER_COLUMNS = ["payload_size"]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+
+
+def parquet_path(output_dir: str, run_name: str) -> str:
+    return os.path.join(output_dir, f"results-{run_name}.parquet")
+
+
+def typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast result columns to nullable, explicitly typed dtypes for Parquet."""
+    df = df.copy()
+    for col in STRING_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("string")
+    for col in BOOLEAN_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("boolean")
+    for col in INTEGER_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("Int64")
+    return df
+
+
+def write_parquet(df: pd.DataFrame, output_dir: str, run_name: str, compression: str = "zstd") -> str:
+    """Write results as a dataset partitioned by algorithm and attack_category."""
+    _require_pyarrow()
+    path = parquet_path(output_dir, run_name)
+
+    # Replace a previous run of the same name instead of appending files to it
+    if os.path.exists(path):
+        import shutil
+        shutil.rmtree(path)
+
+    # Rows without a partition value (failed embeds have no attack_category) would land in
+    # a __HIVE_DEFAULT_PARTITION__ directory that pyarrow cannot read back; file them under "error"
+    df = df.assign(**{col: df[col].fillna(ERROR_PARTITION) for col in PARTITION_COLUMNS if col in df})
+    typed_frame(df).to_parquet(path, engine="pyarrow", partition_cols=PARTITION_COLUMNS,
+                               compression=compression, index=False)
+    return path
+
+
+def load_results(output_dir: str, run_name: str, algorithms: Optional[List[str]] = None,
+                 categories: Optional[List[str]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load a run's results, reading only the requested partitions and columns.
+
+    Falls back to the full results CSV for runs written in CSV mode.
+    """
+    path = parquet_path(output_dir, run_name)
+
+    if os.path.isdir(path):
+        _require_pyarrow()
+        filters = []
+        if algorithms:
+            filters.append(("algorithm", "in", list(algorithms)))
+        if categories:
+            filters.append(("attack_category", "in", list(categories)))
+
+        df = pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters or None)
+        # Partition keys come back as categoricals; return them as plain strings
+        for col in PARTITION_COLUMNS:
+            if col in df and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("string")
+        
+        # Partition keys are appended last on read; restore the usual column order
+        ordered = [c for c in ["image", "algorithm", "payload_size", "attack_category"] if c in df]
+        return df[ordered + [c for c in df.columns if c not in ordered]]
+
+    csv_path = os.path.join(output_dir, f"results-{run_name}.csv")
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"No results for run '{run_name}' in {output_dir}")
+
+    df = pd.read_csv(csv_path, usecols=columns)
+    if algorithms:
+        df = df[df["algorithm"].isin(algorithms)]
+    if categories:
+        df = df[df["attack_category"].isin(categories)]
+    return df
+
+
+def export_results(output_dir: str, run_name: str, fmt: str = "csv", dest: Optional[str] = None,
+                   algorithms: Optional[List[str]] = None, categories: Optional[List[str]] = None) -> str:
+    """
+    Materialize a slice of a run as a CSV or Parquet file.
+
+    The default file name follows the eager CSV layout, e.g.
+    results-<run>-noise.csv for a single category.
+
+    Returns:
+        Path of the written file
+    """
+    df = load_results(output_dir, run_name, algorithms=algorithms, categories=categories)
+
+    if dest is None:
+        suffix = ""
+        if categories and len(categories) == 1:
+            suffix += f"-{categories[0]}"
+        if algorithms and len(algorithms) == 1:
+            suffix += f"-{algorithms[0]}"
+        if not suffix and fmt == "parquet":
+            suffix = "-all"  # results-<run>.parquet is the partitioned dataset itself
+        dest = os.path.join(output_dir, f"results-{run_name}{suffix}.{fmt}")
+
+    if fmt == "csv":
+        df.to_csv(dest, index=False)
+    elif fmt == "parquet":
+        _require_pyarrow()
+        typed_frame(df).to_parquet(dest, engine="pyarrow", compression="zstd", index=False)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    return dest
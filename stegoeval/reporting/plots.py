@@ -1,68 +1,151 @@
 """
-PLOT GENERATION MODULE - DISABLED
+Opt-in plot stage (`plots: true` / `stegoeval run --plots`).
 
-This module is currently disabled to speed up benchmarks.
-To re-enable, uncomment the imports and functions below.
-
-Note: Plot generation can be re-enabled by:
-1. Uncommenting the imports
-2. Uncommenting the generate_plots function
-3. Calling it from ReportGenerator.generate()
+Figures are drawn from small aggregated frames (mean metric per algorithm,
+attack and strength), never from the raw result rows. matplotlib is only
+imported inside the worker processes, with the Agg backend, so the
+evaluation path never pays for it. Each figure's aggregate is fingerprinted
+and figures whose input has not changed since the last render are skipped.
 """
 
-# import pandas as pd
-# import matplotlib.pyplot as plt
-# import seaborn as sns
-# import os
+import ast
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+# (file stem, title, attack category, attack names, metric, y label)
+PLOT_SPECS = [
+    ("psnr_vs_jpeg", "PSNR vs JPEG Quality", "compression", ["jpeg"], "psnr", "PSNR (dB)"),
+    ("ber_vs_noise", "Bit Error Rate (BER) vs Noise Strength", "noise", ["gaussian", "speckle", "salt_pepper"], "ber", "BER"),
+    ("ssim_vs_rotation", "SSIM vs Rotation Angle", "geometric", ["rotation"], "ssim", "SSIM"),
+]
+
+GROUP_COLUMNS = ['algorithm', 'attack_category', 'attack_name', 'attack_params']
+
+
+def plot_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean PSNR/SSIM/BER per algorithm, attack and strength for the plotted attacks.
+
+    Args:
+        df: Result rows (baseline excluded)
+
+    Returns:
+        One row per (algorithm, attack, setting) with the numeric strength in `x`
+        and the name of the strength parameter in `x_label`
+    """
+    from stegoeval.core.attack_runner import AttackRunner
+
+    attacks = {(category, name) for _, _, category, names, _, _ in PLOT_SPECS for name in names}
+    mask = pd.Series(list(zip(df['attack_category'], df['attack_name'])), index=df.index).isin(attacks)
+    metrics = [m for m in ('psnr', 'ssim', 'ber') if m in df]
+    if not mask.any() or not metrics:
+        return pd.DataFrame(columns=GROUP_COLUMNS + metrics + ['x', 'x_label'])
+
+    agg = df.loc[mask].groupby(GROUP_COLUMNS, sort=False, observed=True)[metrics].mean().reset_index()
+
+    # Strength of each distinct setting (parsed once per setting, not per row)
+    runner = AttackRunner()
+    xs, labels = [], []
+    for category, name, params in zip(agg['attack_category'], agg['attack_name'], agg['attack_params']):
+        param = runner.strength_search[category][name][0]
+        try:
+            value = runner.resolve_params(category, name, ast.literal_eval(params))[param]
+            xs.append(float(value))
+        except (ValueError, SyntaxError, KeyError, TypeError):
+            xs.append(float('nan'))
+        labels.append(param)
+    agg['x'] = xs
+    agg['x_label'] = labels
+    return agg.dropna(subset=['x']).sort_values(['algorithm', 'attack_name', 'x'], ignore_index=True)
 
-def generate_plots(df, output_dir):
+
+def _fingerprint(spec: tuple, frame: pd.DataFrame) -> str:
+    payload = json.dumps([list(spec), frame.to_dict(orient='split')], default=str, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def render_figure(spec: tuple, frame: pd.DataFrame, path: str) -> str:
+    """Draw one figure (one panel per attack, one line per algorithm) into `path`."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    _, title, _, _, metric, ylabel = spec
+    attacks = list(dict.fromkeys(frame['attack_name']))
+    fig, axes = plt.subplots(1, len(attacks), figsize=(6 * len(attacks), 4.5), squeeze=False)
+    for ax, attack in zip(axes[0], attacks):
+        attack_frame = frame[frame['attack_name'] == attack]
+        for algorithm, group in attack_frame.groupby('algorithm', sort=True):
+            ax.plot(group['x'], group[metric], marker='o', label=algorithm)
+        ax.set_title(attack)
+        ax.set_xlabel(attack_frame['x_label'].iloc[0])
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+    axes[0][0].legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
+
+
+def generate_plots(df: pd.DataFrame, output_dir: str, run_name: str = "benchmark",
+                   workers: Optional[int] = None) -> List[str]:
     """
-    Plot generation is currently disabled.
-    To enable plots, edit this file and uncomment the code below.
+    Render the standard figures of a run as `<stem>-<run_name>.png`.
+
+    Args:
+        df: Result rows (baseline excluded)
+        output_dir: Directory receiving the PNGs and the fingerprint cache
+        run_name: Run name used in the file names
+        workers: Render processes (default: one per stale figure, at most the core count)
+
+    Returns:
+        Paths of the figures rendered in this call (unchanged figures are skipped)
     """
-    print("Plots generation is disabled. To enable, edit stegoeval/reporting/plots.py")
-    pass
-
-    # """
-    # os.makedirs(output_dir, exist_ok=True)
-    # 
-    # algorithms = df['algorithm'].unique()
-    # sns.set_theme(style="whitegrid")
-    # 
-    # # 1. PSNR vs JPEG quality (Compression Attack)
-    # jpeg_df = df[(df['attack_category'] == 'compression') & (df['attack_name'] == 'jpeg')].copy()
-    # if not jpeg_df.empty:
-    #     jpeg_df['quality'] = jpeg_df['attack_params'].apply(lambda x: int(x.split('=')[1]))
-    #     plt.figure(figsize=(10, 6))
-    #     sns.lineplot(data=jpeg_df, x='quality', y='psnr', hue='algorithm', marker='o')
-    #     plt.title('PSNR vs JPEG Quality')
-    #     plt.xlabel('JPEG Quality')
-    #     plt.ylabel('PSNR (dB)')
-    #     plt.savefig(os.path.join(output_dir, 'psnr_vs_jpeg.png'))
-    #     plt.close()
-    # 
-    # # 2. BER vs Noise Variance
-    # noise_df = df[(df['attack_category'] == 'noise') & (df['attack_name'].isin(['gaussian', 'speckle']))].copy()
-    # if not noise_df.empty:
-    #     plt.figure(figsize=(12, 6))
-    #     sns.barplot(data=noise_df, x='attack_name', y='ber', hue='algorithm')
-    #     plt.title('Bit Error Rate (BER) across Noise Attacks')
-    #     plt.xlabel('Noise Type')
-    #     plt.ylabel('BER')
-    #     plt.savefig(os.path.join(output_dir, 'ber_vs_noise.png'))
-    #     plt.close()
-    # 
-    # # 3. SSIM vs Rotation Angle
-    # rot_df = df[(df['attack_category'] == 'geometric') & (df['attack_name'] == 'rotation')].copy()
-    # if not rot_df.empty:
-    #     rot_df['angle'] = rot_df['attack_params'].apply(lambda x: float(x.split('=')[1]))
-    #     plt.figure(figsize=(10, 6))
-    #     sns.lineplot(data=rot_df, x='angle', y='ssim', hue='algorithm', marker='s')
-    #     plt.title('SSIM vs Rotation Angle')
-    #     plt.xlabel('Angle (Degrees)')
-    #     plt.ylabel('SSIM')
-    #     plt.savefig(os.path.join(output_dir, 'ssim_vs_rotation.png'))
-    #     plt.close()
-    #     
-    # print(f"Plots generated in {output_dir}")
-    # """
+    agg = plot_aggregates(df)
+    cache_path = os.path.join(output_dir, f".plots-{run_name}.json")
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    jobs, fingerprints, skipped = [], {}, 0
+    for spec in PLOT_SPECS:
+        stem, _, category, names, metric, _ = spec
+        frame = agg[(agg['attack_category'] == category) & agg['attack_name'].isin(names)]
+        if frame.empty or metric not in frame or frame[metric].isna().all():
+            continue
+        frame = frame[['algorithm', 'attack_name', 'x', 'x_label', metric]].reset_index(drop=True)
+        path = os.path.join(output_dir, f"{stem}-{run_name}.png")
+        fingerprints[stem] = _fingerprint(spec, frame)
+        if cache.get(stem) == fingerprints[stem] and os.path.exists(path):
+            skipped += 1
+            continue
+        jobs.append((spec, frame, path))
+
+    n_workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if n_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rendered = list(pool.map(render_figure, *zip(*jobs)))
+    else:
+        # A single process would only add its start-up to the render
+        rendered = [render_figure(*job) for job in jobs]
+
+    if fingerprints != cache:
+        try:
+            with open(cache_path, "w") as f:
+                json.dump(fingerprints, f, indent=1, sort_keys=True)
+        except OSError as e:
+            print(f"Warning: could not write plot cache {cache_path}: {e}")
+
+    if rendered or skipped:
+        print(f"Plots: {len(rendered)} rendered, {skipped} unchanged in {output_dir}")
+    return rendered
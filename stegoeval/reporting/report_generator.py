@@ -1,18 +1,54 @@
 import os
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from stegoeval.reporting.tables import generate_csv, generate_markdown_summary
-from stegoeval.scoring import calculate_overall_scores, calculate_scores_by_category
+from stegoeval.reporting.export import write_parquet
+from stegoeval.scoring import (LiveScoreboard, ScoreAggregates, ScorePrecision, bootstrap_score_intervals,
+                               calculate_overall_scores, calculate_scores_by_category)
 
 
 class ReportGenerator:
-    def __init__(self, output_dir: str, run_name: str = "benchmark"):
+    def __init__(self, output_dir: str, run_name: str = "benchmark", output_format: str = "csv",
+                 score_pruned: bool = True, results_db: Optional[str] = None, plots: bool = False,
+                 plot_workers: Optional[int] = None, bootstrap_replicates: int = 0,
+                 confidence_level: float = 0.95, bootstrap_seed: Optional[int] = None):
         self.output_dir = output_dir
         self.run_name = run_name
+        # "csv": full + per-category CSVs; "parquet": one partitioned dataset,
+        # category files exported on demand (see reporting/export.py)
+        self.output_format = output_format
+        # Whether rows skipped by monotone pruning are scored as failures
+        self.score_pruned = score_pruned
+        # Optional SQLite file every run is appended to (see reporting/database.py)
+        self.results_db = results_db
+        # Image-level bootstrap intervals on every score (0 replicates disables them)
+        self.bootstrap_replicates = bootstrap_replicates
+        self.confidence_level = confidence_level
+        self.bootstrap_seed = bootstrap_seed
+        # Opt-in figures rendered from aggregated frames (see reporting/plots.py)
+        self.plots = plots
+        self.plot_workers = plot_workers
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def generate(self, results: List[Dict[str, Any]]):
+    def generate(self, results: List[Dict[str, Any]], timings: Optional[List[Dict[str, Any]]] = None,
+                 scoreboard: Optional[LiveScoreboard] = None, precision: Optional[ScorePrecision] = None,
+                 breaking_points: Optional[List[Dict[str, Any]]] = None, config: Optional[Dict[str, Any]] = None,
+                 pipeline_stats: Optional[List[Dict[str, Any]]] = None):
+        """
+        Write all reports for a run.
+        
+        Args:
+            results: Result rows from Evaluator.evaluate()
+            timings: Optional per-stage timings (StageTimer.summary())
+            scoreboard: Optional LiveScoreboard filled during the run; its
+                streaming aggregates replace re-aggregating the rows for scoring
+            precision: Optional ScorePrecision from adaptive sampling; the achieved
+                confidence intervals are added to the summary
+            breaking_points: Optional breaking-point search rows (robustness_threshold mode)
+            config: Optional run configuration, recorded with the run in the results database
+            pipeline_stats: Optional per-stage queue statistics (PipelineEvaluator.pipeline_stats)
+        """
         if not results:
             print("No results to generate reports for.")
             return
@@ -20,100 +56,186 @@ class ReportGenerator:
         # Convert to DataFrame
         df = pd.DataFrame(results)
         
-        # 0. Extract and save Cover Image Baseline (if exists)
-        baseline_df = df[df['algorithm'] == 'COVER_IMAGE_BASELINE']
-        if not baseline_df.empty:
-            baseline_csv = os.path.join(self.output_dir, f"results-{self.run_name}-baseline.csv")
-            baseline_df.to_csv(baseline_csv, index=False)
-            print(f"Cover image baselines saved to {baseline_csv}")
-            
         # Filter out the baseline so it doesn't skew algorithm scores
-        algo_df = df[df['algorithm'] != 'COVER_IMAGE_BASELINE']
+        baseline_mask = df['algorithm'] == 'COVER_IMAGE_BASELINE'
+        algo_df = df[~baseline_mask]
         
-        # 1. Save main CSV with all results
-        main_csv = os.path.join(self.output_dir, f"results-{self.run_name}.csv")
-        algo_df.to_csv(main_csv, index=False)
-        print(f"Full algorithm results saved to {main_csv}")
+        # Split by category once and aggregate once; all outputs below share these
+        category_frames = dict(tuple(algo_df.groupby('attack_category', sort=False)))
         
-        # 2. Generate per-attack-type CSVs
-        self._generate_attack_csvs(algo_df)
+        # Pruned rows stay in the result files; scoring may leave them out
+        score_df = algo_df
+        if not self.score_pruned and 'pruned' in algo_df:
+            score_df = algo_df[algo_df['pruned'] != True]  # noqa: E712 (column holds NaN for unpruned runs)
+        aggregates = ScoreAggregates(score_df) if not score_df.empty and scoreboard is None else None
+        
+        if self.output_format == "parquet":
+            # 0-2. One typed, partitioned dataset (baseline rows included under
+            # algorithm=COVER_IMAGE_BASELINE); no eager per-category copies
+            parquet_dir = write_parquet(df, self.output_dir, self.run_name)
+            print(f"Partitioned results saved to {parquet_dir}")
+        else:
+            # 0. Extract and save Cover Image Baseline (if exists)
+            baseline_df = df[baseline_mask]
+            if not baseline_df.empty:
+                baseline_csv = os.path.join(self.output_dir, f"results-{self.run_name}-baseline.csv")
+                baseline_df.to_csv(baseline_csv, index=False)
+                print(f"Cover image baselines saved to {baseline_csv}")
+            
+            # 1. Save main CSV with all results
+            main_csv = os.path.join(self.output_dir, f"results-{self.run_name}.csv")
+            algo_df.to_csv(main_csv, index=False)
+            print(f"Full algorithm results saved to {main_csv}")
+            
+            # 2. Generate per-attack-type CSVs
+            self._generate_attack_csvs(category_frames)
         
         # 3. Generate scores file
-        self._generate_scores(algo_df)
+        scores_df, category_scores = self._generate_scores(score_df, aggregates, scoreboard)
         
         # 4. Generate clean results CSV (no attack)
-        clean_df = algo_df[algo_df['attack_category'] == 'none']
-        if not clean_df.empty:
+        clean_df = category_frames.get('none')
+        if self.output_format != "parquet" and clean_df is not None and not clean_df.empty:
             clean_csv = os.path.join(self.output_dir, f"results-{self.run_name}-clean.csv")
             clean_df.to_csv(clean_csv, index=False)
             print(f"Clean results saved to {clean_csv}")
         
-        # 5. Generate summary markdown
-        self._generate_summary(algo_df)
+        # 5. Save per-stage timings (only when the evaluator recorded them)
+        timings_df = pd.DataFrame(timings) if timings else None
+        if timings_df is not None:
+            timings_csv = os.path.join(self.output_dir, f"timings-{self.run_name}.csv")
+            timings_df.to_csv(timings_csv, index=False)
+            print(f"Stage timings saved to {timings_csv}")
+        
+        # 6. Save breaking points (robustness_threshold mode)
+        breaking_df = pd.DataFrame(breaking_points) if breaking_points else None
+        if breaking_df is not None:
+            breaking_csv = os.path.join(self.output_dir, f"breaking-points-{self.run_name}.csv")
+            breaking_df.to_csv(breaking_csv, index=False)
+            print(f"Breaking points saved to {breaking_csv}")
+        
+        # Per-stage queue statistics (pipeline evaluator)
+        pipeline_df = pd.DataFrame(pipeline_stats) if pipeline_stats else None
+        if pipeline_df is not None:
+            pipeline_csv = os.path.join(self.output_dir, f"pipeline-{self.run_name}.csv")
+            pipeline_df.to_csv(pipeline_csv, index=False)
+            print(f"Pipeline stage statistics saved to {pipeline_csv}")
+        
+        # 7. Generate summary markdown
+        self._generate_summary(algo_df, scores_df, timings_df, precision, breaking_df,
+                               thread_layout=(config or {}).get('thread_layout'), pipeline_df=pipeline_df,
+                               run_memory=(config or {}).get('run_memory'))
+        
+        # 8. Append the run to the cross-run results database
+        if self.results_db:
+            from stegoeval.reporting.database import ResultsDatabase
+            
+            db = ResultsDatabase(self.results_db)
+            try:
+                run_id = db.append_run(self.run_name, df, category_scores, config)
+            finally:
+                db.close()
+            print(f"Run stored in {self.results_db} (run_id {run_id})")
+        
+        # 9. Render figures (skipped when their aggregates are unchanged)
+        if self.plots:
+            from stegoeval.reporting.plots import generate_plots
+            
+            generate_plots(algo_df, self.output_dir, self.run_name, workers=self.plot_workers)
         
         print("\n--- Benchmark Complete ---")
         print(f"Total evaluated items: {len(results)}")
         print(f"Reports available in: {self.output_dir}")
 
-    def _generate_attack_csvs(self, df: pd.DataFrame):
+    def _generate_attack_csvs(self, category_frames: Dict[str, pd.DataFrame]):
         """Generate separate CSV files for each attack category."""
-        attack_categories = df['attack_category'].unique()
-        
-        for category in attack_categories:
+        for category, cat_df in category_frames.items():
             if category == 'none':
                 continue  # Already saved as clean
             
-            cat_df = df[df['attack_category'] == category]
             filename = f"results-{self.run_name}-{category}.csv"
             filepath = os.path.join(self.output_dir, filename)
             cat_df.to_csv(filepath, index=False)
             print(f"{category.capitalize()} results saved to {filepath}")
 
-    def _generate_scores(self, df: pd.DataFrame):
-        """Generate scores file with StegnoEval scores."""
+    def _generate_scores(self, df: pd.DataFrame, aggregates: Optional[ScoreAggregates] = None,
+                         scoreboard: Optional[LiveScoreboard] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Generate scores file with StegnoEval scores. Returns (overall scores, scores by category)."""
         # Calculate overall scores
-        scores_df = calculate_overall_scores(df)
+        if scoreboard is not None:
+            scores_df = scoreboard.overall_scores()
+        else:
+            scores_df = calculate_overall_scores(df, aggregates)
+        
+        # Calculate detailed scores by category
+        if scoreboard is not None:
+            category_scores = scoreboard.category_scores()
+        else:
+            category_scores = calculate_scores_by_category(df, aggregates)
+        
+        # Bootstrap confidence intervals (resampling images)
+        overall_ci, category_ci = bootstrap_score_intervals(df, self.bootstrap_replicates, self.confidence_level,
+                                                            self.bootstrap_seed)
+        if not scores_df.empty and not overall_ci.empty:
+            scores_df = scores_df.merge(overall_ci, on='algorithm', how='left')
+        if not category_scores.empty and not category_ci.empty:
+            category_scores = category_scores.merge(category_ci, on=['algorithm', 'attack_category'], how='left')
         
         if not scores_df.empty:
             scores_csv = os.path.join(self.output_dir, f"scores-{self.run_name}.csv")
             scores_df.to_csv(scores_csv, index=False)
             print(f"Scores saved to {scores_csv}")
         
-        # Calculate detailed scores by category
-        category_scores = calculate_scores_by_category(df)
-        
         if not category_scores.empty:
             category_csv = os.path.join(self.output_dir, f"scores-{self.run_name}-by-category.csv")
             category_scores.to_csv(category_csv, index=False)
             print(f"Category scores saved to {category_csv}")
+        
+        return scores_df, category_scores
+
+    @staticmethod
+    def _score_cell(row: pd.Series, column: str) -> str:
+        """Score with its bootstrap interval (when computed), or N/A."""
+        score = row.get(column)
+        if score is None or pd.isna(score):
+            return "N/A"
+        low, high = row.get(f"{column}_ci_low"), row.get(f"{column}_ci_high")
+        if low is None or pd.isna(low):
+            return f"{score:.1f}"
+        return f"{score:.1f} [{low:.1f}, {high:.1f}]"
 
-    def _generate_summary(self, df: pd.DataFrame):
-        """Generate markdown summary."""
+    def _generate_summary(self, df: pd.DataFrame, scores_df: pd.DataFrame, timings_df: Optional[pd.DataFrame] = None,
+                          precision: Optional[ScorePrecision] = None, breaking_df: Optional[pd.DataFrame] = None,
+                          thread_layout: Optional[Dict[str, Any]] = None, pipeline_df: Optional[pd.DataFrame] = None,
+                          run_memory: Optional[Dict[str, Any]] = None):
+        """Generate markdown summary from the already computed overall scores."""
         summary_path = os.path.join(self.output_dir, f"summary-{self.run_name}.md")
         
-        # Get scores
-        scores_df = calculate_overall_scores(df)
-        
         markdown_str = f"# StegoEval Benchmark Summary - {self.run_name}\n\n"
         
         # Overall scores table
         if not scores_df.empty:
             markdown_str += "## Overall Scores (0-100)\n\n"
-            markdown_str += "| Algorithm | Compression | Blur | Noise | Geometric | Combo | Capacity | Overall |\n"
-            markdown_str += "|-----------|-------------|------|-------|-----------|-------|----------|---------|\n"
+            markdown_str += "| Algorithm | Compression | Blur | Noise | Geometric | Combo | Capacity | Overall | Embed MP/s | Extract MP/s | Embed kbit/s | Extract kbit/s |\n"
+            markdown_str += "|-----------|-------------|------|-------|-----------|-------|----------|---------|------------|--------------|--------------|----------------|\n"
             
             for _, row in scores_df.iterrows():
-                comp = f"{row['compression_score']:.1f}" if row['compression_score'] else "N/A"
-                blur = f"{row['blur_score']:.1f}" if row['blur_score'] else "N/A"
-                noise = f"{row['noise_score']:.1f}" if pd.notna(row.get('noise_score')) and row.get('noise_score') is not None else "N/A"
-                geo = f"{row['geometric_score']:.1f}" if pd.notna(row.get('geometric_score')) and row.get('geometric_score') is not None else "N/A"
-                combo = f"{row['combo_score']:.1f}" if pd.notna(row.get('combo_score')) and row.get('combo_score') is not None else "N/A"
-                capacity = f"{row['capacity_score']:.1f}" if pd.notna(row.get('capacity_score')) and row.get('capacity_score') is not None else "N/A"
-                overall = f"{row['overall_score']:.1f}" if pd.notna(row.get('overall_score')) and row.get('overall_score') is not None else "N/A"
+                comp, blur, noise, geo, combo, capacity, overall = (
+                    self._score_cell(row, column) for column in
+                    ['compression_score', 'blur_score', 'noise_score', 'geometric_score', 'combo_score',
+                     'capacity_score', 'overall_score'])
                 
-                markdown_str += f"| {row['algorithm']} | {comp} | {blur} | {noise} | {geo} | {combo} | {capacity} | {overall} |\n"
+                embed_mpx = f"{row['embed_mpx_per_s']:.2f}" if pd.notna(row.get('embed_mpx_per_s')) else "N/A"
+                extract_mpx = f"{row['extract_mpx_per_s']:.2f}" if pd.notna(row.get('extract_mpx_per_s')) else "N/A"
+                embed_kbit = f"{row['embed_bits_per_s'] / 1000:.1f}" if pd.notna(row.get('embed_bits_per_s')) else "N/A"
+                extract_kbit = f"{row['extract_bits_per_s'] / 1000:.1f}" if pd.notna(row.get('extract_bits_per_s')) else "N/A"
+                
+                markdown_str += f"| {row['algorithm']} | {comp} | {blur} | {noise} | {geo} | {combo} | {capacity} | {overall} | {embed_mpx} | {extract_mpx} | {embed_kbit} | {extract_kbit} |\n"
             
             markdown_str += f"\n**Recovery Rate**: {scores_df['overall_recovery_rate'].mean()*100:.1f}%\n"
+            if 'overall_score_ci_low' in scores_df:
+                markdown_str += (f"\nBrackets: {self.confidence_level * 100:g}% bootstrap confidence interval "
+                                 f"({self.bootstrap_replicates} image resamples).\n")
         
         # Average metrics by attack
         markdown_str += "\n## Average Metrics by Attack\n\n"
@@ -126,6 +248,91 @@ class ReportGenerator:
             summary = attack_df.groupby('attack_category')[available].mean().reset_index()
             markdown_str += summary.to_markdown(index=False)
         
+        # Blind steganalysis of the clean stego images vs their covers
+        if 'detectability_score' in scores_df and 'chi2_p' in df:
+            clean = df[df['attack_category'] == 'none']
+            detect_table = clean.groupby('algorithm', sort=False)[
+                ['chi2_p', 'cover_chi2_p', 'rs_rate', 'cover_rs_rate', 'spa_rate', 'cover_spa_rate']].mean()
+            detect_table = scores_df.set_index('algorithm')[['detectability_score']].join(detect_table).reset_index()
+            detect_table.columns = ['Algorithm', 'Detectability (0-100)', 'Chi-square p', 'Cover', 'RS rate', 'Cover',
+                                    'SPA rate', 'Cover']
+            markdown_str += "\n\n## Detectability\n\n"
+            markdown_str += detect_table.to_markdown(index=False, floatfmt=".3f")
+        
+        # Achieved precision of adaptive sampling
+        if precision is not None:
+            intervals = precision.intervals()
+            markdown_str += "\n\n## Score Precision\n\n"
+            markdown_str += f"Adaptive sampling stopped: {precision.stop_reason}.\n\n"
+            if not intervals.empty:
+                interval_table = intervals[['algorithm', 'attack_category', 'score', 'half_width', 'images']].copy()
+                interval_table.columns = ['Algorithm', 'Category', 'Score',
+                                          f'± ({precision.confidence * 100:g}% CI)', 'Images']
+                markdown_str += interval_table.to_markdown(index=False, floatfmt=".2f")
+        
+        # Breaking points: median over images of the weakest failing setting
+        if breaking_df is not None and not breaking_df.empty:
+            markdown_str += "\n\n## Breaking Points\n\n"
+            grouped = breaking_df.groupby(['algorithm', 'payload_size', 'attack_category', 'attack_name', 'parameter'], sort=False)
+            breaking_table = grouped.agg(
+                median_breaking_point=('breaking_point', 'median'),
+                broken=('broken', 'sum'),
+                images=('broken', 'size'),
+                evaluations=('evaluations', 'mean'),
+            ).reset_index()
+            breaking_table['broken'] = breaking_table['broken'].astype(int).astype(str) + "/" + breaking_table['images'].astype(str)
+            breaking_table = breaking_table.drop(columns=['images'])
+            breaking_table.columns = ['Algorithm', 'Payload', 'Category', 'Attack', 'Parameter',
+                                      'Median Breaking Point', 'Broken', 'Evaluations/Search']
+            markdown_str += breaking_table.to_markdown(index=False, floatfmt=".3g")
+        
+        # Where the time went
+        if timings_df is not None and not timings_df.empty:
+            markdown_str += "\n\n## Stage Timings\n\n"
+            timing_table = timings_df[['stage', 'calls', 'total_s', 'mean_s', 'share']].copy()
+            timing_table['mean_s'] = timing_table['mean_s'] * 1000
+            timing_table['share'] = timing_table['share'] * 100
+            timing_table.columns = ['Stage', 'Calls', 'Total (s)', 'Mean (ms)', 'Share (%)']
+            markdown_str += timing_table.to_markdown(index=False, floatfmt=".3f")
+        
+        # Pipeline stages: the busiest stage with a full input queue is the bottleneck
+        if pipeline_df is not None and not pipeline_df.empty:
+            markdown_str += "\n\n## Pipeline Stages\n\n"
+            stage_table = pipeline_df[['stage', 'threads', 'items', 'utilization', 'busy_s', 'starved_s',
+                                       'blocked_s', 'mean_queue_depth', 'max_queue_depth']].copy()
+            stage_table['utilization'] = stage_table['utilization'] * 100
+            stage_table.columns = ['Stage', 'Threads', 'Items', 'Utilization (%)', 'Busy (s)', 'Starved (s)',
+                                   'Blocked (s)', 'Mean queue', 'Max queue']
+            markdown_str += stage_table.to_markdown(index=False, floatfmt=".2f")
+            bottleneck = pipeline_df.loc[pipeline_df['utilization'].idxmax()]
+            markdown_str += (f"\n\nBottleneck: `{bottleneck['stage']}` "
+                             f"({bottleneck['utilization'] * 100:.0f}% busy on {bottleneck['threads']} thread(s))\n")
+        
+        # Run metadata
+        metadata = []
+        if thread_layout:
+            metadata.append(f"- Thread layout: {thread_layout['workers']} worker(s) x "
+                            f"{thread_layout['threads_per_worker']} OpenCV/BLAS thread(s) "
+                            f"(budget {thread_layout['threads']} of {thread_layout['cores']} cores)\n")
+        if run_memory:
+            mib = lambda n: f"{n / 2**20:,.1f} MiB" if n is not None else "n/a"
+            line = f"- Peak RSS: {mib(run_memory['peak_rss_bytes'])}"
+            if run_memory['admissions']:
+                line += f" (estimated peak in flight {mib(run_memory['estimated_peak_bytes'])}"
+                if run_memory['memory_budget_bytes'] is not None:
+                    line += (f", budget {mib(run_memory['memory_budget_bytes'])}; {run_memory['admission_waits']} of "
+                             f"{run_memory['admissions']} admissions waited {run_memory['admission_wait_s']:.1f} s")
+                    if run_memory['oversized_tasks']:
+                        line += f", {run_memory['oversized_tasks']} task(s) over budget ran alone"
+                line += ")"
+            metadata.append(line + "\n")
+        if 'duplicate_of' in df:
+            duplicates = df.loc[df['duplicate_of'].notna(), 'image'].nunique()
+            metadata.append(f"- Duplicate covers skipped: {duplicates} "
+                            f"(rows copied from the first pixel-identical image, see `duplicate_of`)\n")
+        if metadata:
+            markdown_str += "\n\n## Run Metadata\n\n" + "".join(metadata)
+        
         with open(summary_path, 'w') as f:
             f.write(markdown_str)
         
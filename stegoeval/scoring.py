@@ -11,11 +11,19 @@ Overall Score = (Distortion Score * 0.4) + (Robustness Score * 0.6)
 Where:
 - Distortion Score = SSIM * 100 (higher is better)
 - Robustness Score = (1 - avg_BER) * recovery_rate * 100
+
+Algorithm cost (embed/extract latency and peak memory) is reported alongside
+the scores as throughput figures but does not enter the score itself. The
+same holds for the optional detectability score (blind steganalysis of the
+clean stego images, see metrics/detectability.py).
 """
 
+import math
+import warnings
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from statistics import NormalDist
+from typing import Dict, List, Any, Tuple
 
 
 def calculate_distortion_score(ssim: float, psnr: float) -> float:
@@ -73,10 +81,198 @@ def calculate_stegnoeval_score(
     return (distortion_score * distortion_weight) + (robustness_score * robustness_weight)
 
 
-def calculate_scores_by_category(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_throughput(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Aggregate per-call embed/extract cost columns into throughput figures.
+
+    Embed figures use the clean rows (one per embed call); extract figures use
+    every row with a measured extract call. Throughput is total work divided by
+    total time, so large covers weigh in proportionally.
+    
+    Returns dict with:
+    - avg_embed_ms / avg_extract_ms
+    - embed_mpx_per_s / extract_mpx_per_s (cover megapixels per second)
+    - embed_bits_per_s / extract_bits_per_s (payload bits per second)
+    - embed_peak_kb / extract_peak_kb (largest peak allocation of any call)
+    """
+    figures = {}
+    
+    for stage in ['embed', 'extract']:
+        time_col = f'{stage}_time_ms'
+        peak_col = f'{stage}_peak_kb'
+        
+        if time_col not in df:
+            rows = df.iloc[0:0]
+        elif stage == 'embed':
+            rows = df[(df['attack_category'] == 'none') & df[time_col].notna()]
+        else:
+            rows = df[df[time_col].notna()]
+        
+        total_s = rows[time_col].sum() / 1000 if not rows.empty else 0.0
+        
+        figures[f'avg_{stage}_ms'] = rows[time_col].mean() if not rows.empty else None
+        figures[f'{stage}_mpx_per_s'] = rows['cover_megapixels'].sum() / total_s if total_s > 0 else None
+        figures[f'{stage}_bits_per_s'] = (rows['payload_size'] * 8).sum() / total_s if total_s > 0 else None
+        figures[f'{stage}_peak_kb'] = rows[peak_col].max() if peak_col in rows and rows[peak_col].notna().any() else None
+    
+    return figures
+
+
+# Detector columns of clean rows; the cover's output is in `cover_<column>`
+DETECTABILITY_COLUMNS = ['chi2_p', 'rs_rate', 'spa_rate']
+
+
+def detection_evidence(stego, cover) -> np.ndarray:
+    """
+    Evidence of embedding per row: detector output on the stego image minus
+    the cover's, clipped to [0, 1], averaged over the detectors (last axis).
+    """
+    excess = np.clip(np.asarray(stego, dtype=float) - np.asarray(cover, dtype=float), 0.0, 1.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # rows where every detector failed
+        return np.nanmean(excess, axis=-1)
+
+
+def calculate_detectability_score(df: pd.DataFrame) -> Any:
+    """
+    Detectability score (0-100, higher = harder to detect) of an algorithm's rows:
+    100 * (1 - mean detection evidence of its clean rows). None without detector columns.
+    """
+    if DETECTABILITY_COLUMNS[0] not in df:
+        return None
+    clean = df[df['attack_category'] == 'none']
+    evidence = detection_evidence(clean[DETECTABILITY_COLUMNS].to_numpy(dtype=float, na_value=np.nan),
+                                  clean[[f'cover_{c}' for c in DETECTABILITY_COLUMNS]].to_numpy(dtype=float, na_value=np.nan))
+    evidence = evidence[~np.isnan(evidence)]
+    return 100 * (1 - evidence.mean()) if len(evidence) else None
+
+
+class ScoreAggregates:
+    """
+    Single-pass aggregation engine behind all score tables.
+
+    The frame is factorized by algorithm and attack_category once and stably
+    sorted by (algorithm, category), so every algorithm x category group is a
+    contiguous run of row positions. One np.add.reduceat over that order sums
+    every score column (NaNs skipped) and counts its values per group; a
+    lookup over any set of categories adds up the table rows of its groups.
+    The scores CSV, the by-category CSV and the summary share one instance
+    instead of re-masking the full frame. Means equal a boolean-mask
+    filter's up to floating-point rounding.
+    """
+
+    # Score column -> value reported when the column is missing
+    COLUMNS = {'ssim': 0, 'psnr': 0, 'ber': 1.0, 'payload_recovered': 0}
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._cache = {}
+        
+        algo_codes, self.algorithms = pd.factorize(df['algorithm'])
+        cat_codes, self.categories = pd.factorize(df['attack_category'])  # NaN -> -1
+        
+        # Stable sort: groups become contiguous, original order kept inside each group
+        order = np.lexsort((cat_codes, algo_codes))
+        sorted_algo = algo_codes[order]
+        sorted_cat = cat_codes[order]
+        boundaries = np.flatnonzero((np.diff(sorted_algo) != 0) | (np.diff(sorted_cat) != 0)) + 1
+        starts = np.concatenate(([0], boundaries)) if len(order) else np.array([], dtype=int)
+        ends = np.concatenate((boundaries, [len(order)])) if len(order) else np.array([], dtype=int)
+        
+        # Per-group sums and value counts of every score column, in one pass
+        self._columns = [col for col in self.COLUMNS if col in df]
+        values = np.column_stack([pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+                                  for col in self._columns]) if self._columns else np.empty((len(df), 0))
+        values = values[order]
+        present = ~np.isnan(values)
+        if len(order):
+            self._sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+            self._counts = np.add.reduceat(present.astype(np.int64), starts, axis=0)
+        else:
+            self._sums = self._counts = np.empty((0, len(self._columns)))
+        self._sizes = ends - starts
+        
+        # (algorithm, category) -> original row positions (ascending) and group index
+        # Categories per algorithm are listed in order of first appearance
+        self._positions = {}
+        self._groups = {}
+        self._algo_categories = {algo: [] for algo in self.algorithms}
+        first_seen = {}
+        for group, (start, end) in enumerate(zip(starts, ends)):
+            algo = self.algorithms[sorted_algo[start]]
+            cat_code = sorted_cat[start]
+            category = self.categories[cat_code] if cat_code >= 0 else np.nan
+            positions = order[start:end]
+            self._positions[(algo, cat_code)] = positions
+            self._groups[(algo, cat_code)] = group
+            first_seen[(algo, cat_code)] = (positions[0], category)
+        for (algo, cat_code), (_, category) in sorted(first_seen.items(), key=lambda kv: kv[1][0]):
+            self._algo_categories[algo].append((cat_code, category))
+
+    def _category_code(self, category: str) -> int:
+        matches = np.flatnonzero(self.categories == category)
+        return int(matches[0]) if len(matches) else -2
+
+    def _codes(self, algo: str, categories: List[str] = None, exclude: List[str] = None) -> List[int]:
+        if categories is None:
+            return [code for code, category in self._algo_categories[algo] if category not in (exclude or [])]
+        wanted = {self._category_code(c) for c in categories}
+        return [code for code, _ in self._algo_categories[algo] if code in wanted]
+
+    def positions(self, algo: str, categories: List[str] = None, exclude: List[str] = None) -> np.ndarray:
+        """Original row positions of `algo`, restricted to / excluding some categories."""
+        runs = [self._positions[(algo, code)] for code in self._codes(algo, categories, exclude)]
+        if not runs:
+            return np.array([], dtype=np.intp)
+        if len(runs) == 1:
+            return runs[0]
+        return np.sort(np.concatenate(runs))
+
+    def stats(self, algo: str, categories: List[str] = None, exclude: List[str] = None) -> Dict[str, Any]:
+        """Cached mean SSIM/PSNR/BER, recovery rate and row count of a row group."""
+        key = (algo, tuple(categories) if categories is not None else None, tuple(exclude or ()))
+        if key not in self._cache:
+            self._cache[key] = self._group_stats([self._groups[(algo, code)]
+                                                  for code in self._codes(algo, categories, exclude)])
+        return self._cache[key]
+
+    def category_stats(self, algo: str) -> List[Tuple[Any, Dict[str, Any]]]:
+        """(category, stats) for each category of `algo`, in order of first appearance."""
+        # Rows with a missing attack_category (e.g. failed embeds) never match a
+        # category filter, so their group is reported empty
+        return [(category, self.stats(algo, [category]) if code >= 0 else self._group_stats([]))
+                for code, category in self._algo_categories[algo]]
+
+    def algorithm_frame(self, algo: str, columns: List[str] = None) -> pd.DataFrame:
+        """All rows of one algorithm in original order (optionally only some columns)."""
+        frame = self.df if columns is None else self.df[[c for c in columns if c in self.df]]
+        return frame.take(self.positions(algo))
+
+    def _group_stats(self, groups: List[int]) -> Dict[str, Any]:
+        """Means over the rows of some groups, from the per-group table."""
+        sums = self._sums[groups].sum(axis=0)
+        counts = self._counts[groups].sum(axis=0)
+        means = dict(self.COLUMNS)
+        for i, col in enumerate(self._columns):
+            means[col] = sums[i] / counts[i] if counts[i] else np.nan
+        
+        return {
+            'avg_ssim': means['ssim'],
+            'avg_psnr': means['psnr'],
+            'avg_ber': means['ber'],
+            'recovery_rate': means['payload_recovered'],
+            'rows': int(self._sizes[groups].sum()),
+        }
+
+
+def calculate_scores_by_category(df: pd.DataFrame, aggregates: ScoreAggregates = None) -> pd.DataFrame:
     """
     Calculate scores for each algorithm grouped by attack category.
     
+    Args:
+        df: Result rows
+        aggregates: Optional precomputed ScoreAggregates for `df` (shared between reports)
+    
     Returns DataFrame with columns:
     - algorithm
     - attack_category
@@ -92,53 +288,61 @@ def calculate_scores_by_category(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame()
     
+    aggregates = aggregates if aggregates is not None else ScoreAggregates(df)
     results = []
     
-    # Group by algorithm and attack_category
-    for algo in df['algorithm'].unique():
-        algo_df = df[df['algorithm'] == algo]
-        
-        # Get all attack categories
-        categories = algo_df['attack_category'].unique()
-        
-        for category in categories:
-            cat_df = algo_df[algo_df['attack_category'] == category]
-            
+    for algo in aggregates.algorithms:
+        for category, stats in aggregates.category_stats(algo):
             # Skip "none" (clean) - it's not an attack
             if category == 'none':
                 continue
             
-            # Calculate metrics
-            avg_ssim = cat_df['ssim'].mean() if 'ssim' in cat_df else 0
-            avg_psnr = cat_df['psnr'].mean() if 'psnr' in cat_df else 0
-            avg_ber = cat_df['ber'].mean() if 'ber' in cat_df else 1.0
-            recovery_rate = cat_df['payload_recovered'].mean() if 'payload_recovered' in cat_df else 0
-            
             # Calculate scores
-            distortion_score = calculate_distortion_score(avg_ssim, avg_psnr)
-            robustness_score = calculate_robustness_score(avg_ber, recovery_rate > 0)
+            distortion_score = calculate_distortion_score(stats['avg_ssim'], stats['avg_psnr'])
+            robustness_score = calculate_robustness_score(stats['avg_ber'], stats['recovery_rate'] > 0)
             overall_score = calculate_stegnoeval_score(distortion_score, robustness_score)
             
             results.append({
                 'algorithm': algo,
                 'attack_category': category,
-                'avg_ssim': avg_ssim,
-                'avg_psnr': avg_psnr,
-                'avg_ber': avg_ber,
-                'recovery_rate': recovery_rate,
+                'avg_ssim': stats['avg_ssim'],
+                'avg_psnr': stats['avg_psnr'],
+                'avg_ber': stats['avg_ber'],
+                'recovery_rate': stats['recovery_rate'],
                 'distortion_score': distortion_score,
                 'robustness_score': robustness_score,
                 'overall_score': overall_score,
-                'images_tested': len(cat_df)
+                'images_tested': stats['rows']
             })
     
     return pd.DataFrame(results)
 
 
-def calculate_overall_scores(df: pd.DataFrame) -> pd.DataFrame:
+# Columns read by calculate_throughput
+THROUGHPUT_COLUMNS = [
+    'attack_category', 'payload_size', 'cover_megapixels',
+    'embed_time_ms', 'embed_peak_kb', 'extract_time_ms', 'extract_peak_kb',
+]
+
+# Score column -> attack categories it covers
+CATEGORY_SCORE_GROUPS = {
+    'compression_score': ['compression'],
+    'blur_score': ['filtering', 'blur'],
+    'noise_score': ['noise'],
+    'geometric_score': ['geometric'],
+    'combo_score': ['combo'],
+    'capacity_score': ['capacity'],
+}
+
+
+def calculate_overall_scores(df: pd.DataFrame, aggregates: ScoreAggregates = None) -> pd.DataFrame:
     """
     Calculate overall scores for each algorithm across all attacks.
     
+    Args:
+        df: Result rows
+        aggregates: Optional precomputed ScoreAggregates for `df` (shared between reports)
+    
     Returns DataFrame with columns:
     - algorithm
     - compression_score
@@ -148,6 +352,8 @@ def calculate_overall_scores(df: pd.DataFrame) -> pd.DataFrame:
     - combo_score
     - capacity_score
     - overall_score
+    - detectability_score (only when the rows carry detector columns)
+    - cost/throughput figures (see calculate_throughput)
     - total_images
     - total_payloads_recovered
     - overall_recovery_rate
@@ -155,67 +361,505 @@ def calculate_overall_scores(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame()
     
+    aggregates = aggregates if aggregates is not None else ScoreAggregates(df)
     results = []
     
-    for algo in df['algorithm'].unique():
-        algo_df = df[df['algorithm'] == algo]
-        
-        # Scores by category
-        compression_df = algo_df[algo_df['attack_category'] == 'compression']
-        blur_df = algo_df[algo_df['attack_category'].isin(['filtering', 'blur'])]
-        noise_df = algo_df[algo_df['attack_category'] == 'noise']
-        geometric_df = algo_df[algo_df['attack_category'] == 'geometric']
-        combo_df = algo_df[algo_df['attack_category'] == 'combo']
-        capacity_df = algo_df[algo_df['attack_category'] == 'capacity']
-        
+    for algo in aggregates.algorithms:
         # Calculate scores for each category
-        def get_category_score(cat_df):
-            if cat_df.empty:
+        def get_category_score(stats):
+            if stats['rows'] == 0:
                 return None
-            avg_ssim = cat_df['ssim'].mean()
-            avg_psnr = cat_df['psnr'].mean()
-            avg_ber = cat_df['ber'].mean()
-            recovery_rate = cat_df['payload_recovered'].mean()
-            
-            distortion = calculate_distortion_score(avg_ssim, avg_psnr)
-            robustness = calculate_robustness_score(avg_ber, recovery_rate > 0)
+            distortion = calculate_distortion_score(stats['avg_ssim'], stats['avg_psnr'])
+            robustness = calculate_robustness_score(stats['avg_ber'], stats['recovery_rate'] > 0)
             return calculate_stegnoeval_score(distortion, robustness)
         
-        compression_score = get_category_score(compression_df)
-        blur_score = get_category_score(blur_df)
-        noise_score = get_category_score(noise_df)
-        geometric_score = get_category_score(geometric_df)
-        combo_score = get_category_score(combo_df)
-        capacity_score = get_category_score(capacity_df)
+        category_scores = {
+            column: get_category_score(aggregates.stats(algo, categories))
+            for column, categories in CATEGORY_SCORE_GROUPS.items()
+        }
         
         # Overall metrics (excluding clean)
-        attack_df = algo_df[algo_df['attack_category'] != 'none']
+        attack_stats = aggregates.stats(algo, exclude=['none'])
         
-        if not attack_df.empty:
-            overall_ssim = attack_df['ssim'].mean()
-            overall_psnr = attack_df['psnr'].mean()
-            overall_ber = attack_df['ber'].mean()
-            overall_recovery = attack_df['payload_recovered'].mean()
-            
-            overall_distortion = calculate_distortion_score(overall_ssim, overall_psnr)
-            overall_robustness = calculate_robustness_score(overall_ber, overall_recovery > 0)
+        if attack_stats['rows'] > 0:
+            overall_recovery = attack_stats['recovery_rate']
+            overall_distortion = calculate_distortion_score(attack_stats['avg_ssim'], attack_stats['avg_psnr'])
+            overall_robustness = calculate_robustness_score(attack_stats['avg_ber'], overall_recovery > 0)
             overall_score = calculate_stegnoeval_score(overall_distortion, overall_robustness)
         else:
             overall_score = None
             overall_recovery = 0
         
+        algo_df = aggregates.algorithm_frame(algo, THROUGHPUT_COLUMNS + ['payload_recovered'] + DETECTABILITY_COLUMNS
+                                             + [f'cover_{c}' for c in DETECTABILITY_COLUMNS])
+        detectability = ({'detectability_score': calculate_detectability_score(algo_df)}
+                         if DETECTABILITY_COLUMNS[0] in df else {})
+        
         results.append({
             'algorithm': algo,
-            'compression_score': compression_score,
-            'blur_score': blur_score,
-            'noise_score': noise_score,
-            'geometric_score': geometric_score,
-            'combo_score': combo_score,
-            'capacity_score': capacity_score,
+            **category_scores,
             'overall_score': overall_score,
+            **detectability,
+            **calculate_throughput(algo_df),
             'total_images': len(algo_df),
             'total_payloads_recovered': int(algo_df['payload_recovered'].sum()) if 'payload_recovered' in algo_df else 0,
             'overall_recovery_rate': overall_recovery
         })
     
     return pd.DataFrame(results)
+
+
+
+# Resample-index entries drawn per block of bootstrap replicates (bounds memory)
+BOOTSTRAP_BLOCK_ENTRIES = 1 << 22
+
+# Per-row metrics behind a score and the mean used when the column is missing
+# (same defaults as ScoreAggregates)
+BOOTSTRAP_METRICS = [('ssim', 0.0), ('psnr', 0.0), ('ber', 1.0), ('payload_recovered', 0.0)]
+
+
+def score_from_means(ssim, psnr, ber, recovery_rate):
+    """calculate_stegnoeval_score over arrays of group means (NaN where a group is empty)."""
+    psnr_score = np.clip((psnr - 20) / 30 * 100, 0, 100)
+    distortion = (ssim * 100 * 0.7) + (psnr_score * 0.3)
+    robustness = np.where(recovery_rate > 0, (1 - ber) * 100, 0.0)
+    return calculate_stegnoeval_score(distortion, robustness)
+
+
+def bootstrap_score_intervals(df: pd.DataFrame, replicates: int = 1000, confidence: float = 0.95,
+                              seed: int = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Percentile bootstrap intervals for every score, resampling images.
+
+    The resampling unit is the evaluated cover: rows copied to a duplicate
+    filename (`duplicate_of`) belong to the image they were copied from, so
+    pixel-identical covers are drawn together rather than as independent
+    images. Rows are reduced once to per-image sums for every algorithm x category
+    (sum, non-NaN count and +inf count per metric) and projected onto the
+    score groups (each category, CATEGORY_SCORE_GROUPS and overall). A
+    replicate is then a vector of image multiplicities, so a whole block of
+    replicates is one matrix product with that per-image table; no Python
+    loop runs per replicate or per group.
+    
+    Args:
+        df: Result rows (baseline excluded; pruned rows as scored)
+        replicates: Bootstrap replicates
+        confidence: Interval coverage
+        seed: Seed of the resampling generator
+    
+    Returns:
+        (overall, by_category): `algorithm` plus `<score>_ci_low` / `<score>_ci_high`
+        for the calculate_overall_scores columns, and `algorithm`,
+        `attack_category`, `overall_score_ci_low` / `overall_score_ci_high`
+    """
+    if df.empty or replicates <= 0:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    algo_codes, algorithms = pd.factorize(df['algorithm'])
+    cat_codes, categories = pd.factorize(df['attack_category'], use_na_sentinel=False)
+    units = df['image']
+    if 'duplicate_of' in df:
+        aliased = df['duplicate_of'].notna() & (df['duplicate_of'] != '')
+        units = units.where(~aliased, df['duplicate_of'])
+    image_codes, images = pd.factorize(units, use_na_sentinel=False)
+    n_cats, n_images = len(categories), len(images)
+    n_base = len(algorithms) * n_cats
+    keys = image_codes * n_base + algo_codes * n_cats + cat_codes
+    
+    # Score groups as 0/1 columns over the algorithm x category cells
+    def cells(a, wanted):
+        column = np.zeros(n_base)
+        column[a * n_cats:(a + 1) * n_cats] = [wanted(c) for c in categories]
+        return column
+    
+    groups, membership = [], []
+    for a, algo in enumerate(algorithms):
+        for category in categories:
+            if isinstance(category, str) and category != 'none':
+                groups.append((algo, 'category', category))
+                membership.append(cells(a, lambda c: c == category))
+        for column, group_categories in CATEGORY_SCORE_GROUPS.items():
+            groups.append((algo, 'score', column))
+            membership.append(cells(a, lambda c: c in group_categories))
+        groups.append((algo, 'score', 'overall_score'))
+        membership.append(cells(a, lambda c: c != 'none'))
+    membership = np.array(membership).T
+    
+    # Per-image sums / counts / +inf counts of each metric, per score group
+    per_image = []
+    for metric, _ in BOOTSTRAP_METRICS:
+        if metric not in df:
+            continue
+        values = df[metric].to_numpy(dtype=float, na_value=np.nan)
+        finite, present, infinite = np.isfinite(values), ~np.isnan(values), values == np.inf
+        for mask, weights in ((finite, values[finite]), (present, None), (infinite, None)):
+            table = np.bincount(keys[mask], weights, minlength=n_images * n_base).reshape(n_images, n_base)
+            per_image.append(table @ membership)
+    per_image = np.concatenate(per_image, axis=1)
+    n_groups = len(groups)
+    
+    def group_means(totals):
+        """Metric means per group from (..., quantities * groups) totals."""
+        means, q = [], 0
+        for metric, default in BOOTSTRAP_METRICS:
+            if metric not in df:
+                means.append(np.full(totals.shape[:-1] + (n_groups,), default))
+                continue
+            sums, counts, infs = (totals[..., (q + i) * n_groups:(q + i + 1) * n_groups] for i in range(3))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means.append(np.where(infs > 0, np.inf, sums / counts))
+            q += 3
+        return means
+    
+    # Groups without rows get no interval
+    empty_groups = (np.bincount(cat_codes + algo_codes * n_cats, minlength=n_base) @ membership) == 0
+    
+    rng = np.random.default_rng(seed)
+    block = max(1, BOOTSTRAP_BLOCK_ENTRIES // n_images)
+    scores = np.empty((replicates, n_groups))
+    for start in range(0, replicates, block):
+        b = min(block, replicates - start)
+        resample = rng.integers(0, n_images, size=(b, n_images))
+        multiplicity = np.bincount((resample + np.arange(b)[:, None] * n_images).ravel(),
+                                   minlength=b * n_images).reshape(b, n_images)
+        scores[start:start + b] = score_from_means(*group_means(multiplicity @ per_image))
+    
+    alpha = 1 - confidence
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN groups
+        low, high = np.nanquantile(scores, [alpha / 2, 1 - alpha / 2], axis=0)
+    low[empty_groups] = np.nan
+    high[empty_groups] = np.nan
+    
+    overall, by_category = {}, []
+    for (algo, kind, label), lo, hi in zip(groups, low, high):
+        if kind == 'category':
+            by_category.append({'algorithm': algo, 'attack_category': label,
+                                'overall_score_ci_low': lo, 'overall_score_ci_high': hi})
+        else:
+            row = overall.setdefault(algo, {'algorithm': algo})
+            row[f'{label}_ci_low'] = lo
+            row[f'{label}_ci_high'] = hi
+    return pd.DataFrame(list(overall.values())), pd.DataFrame(by_category)
+
+class RunningStats:
+    """
+    Welford accumulator for the mean and variance of a stream of values.
+
+    NaN values are skipped (like pandas' mean). Infinite values are counted
+    separately so that, e.g., an infinite PSNR yields an infinite mean
+    instead of poisoning the running sum with NaN.
+    """
+
+    __slots__ = ("count", "mean_", "m2", "pos_inf", "neg_inf")
+
+    def __init__(self):
+        self.count = 0
+        self.mean_ = 0.0
+        self.m2 = 0.0
+        self.pos_inf = 0
+        self.neg_inf = 0
+
+    def update(self, value: float):
+        if value is None:
+            return
+        value = float(value)
+        if math.isnan(value):
+            return
+        if math.isinf(value):
+            if value > 0:
+                self.pos_inf += 1
+            else:
+                self.neg_inf += 1
+            return
+        self.count += 1
+        delta = value - self.mean_
+        self.mean_ += delta / self.count
+        self.m2 += delta * (value - self.mean_)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine two accumulators (Chan et al. parallel update) into a new one."""
+        merged = RunningStats()
+        merged.pos_inf = self.pos_inf + other.pos_inf
+        merged.neg_inf = self.neg_inf + other.neg_inf
+        merged.count = self.count + other.count
+        if merged.count:
+            delta = other.mean_ - self.mean_
+            merged.mean_ = self.mean_ + delta * other.count / merged.count
+            merged.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / merged.count
+        return merged
+
+    @property
+    def n(self) -> int:
+        return self.count + self.pos_inf + self.neg_inf
+
+    @property
+    def mean(self) -> float:
+        if self.pos_inf and self.neg_inf:
+            return float('nan')
+        if self.pos_inf:
+            return float('inf')
+        if self.neg_inf:
+            return float('-inf')
+        return self.mean_ if self.count else float('nan')
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1); NaN with fewer than two finite values or any infinities."""
+        if self.pos_inf or self.neg_inf or self.count < 2:
+            return float('nan')
+        return self.m2 / (self.count - 1)
+
+
+class LiveScoreboard:
+    """
+    Streaming version of calculate_overall_scores / calculate_scores_by_category.
+
+    Rows are folded into RunningStats per (algorithm, attack_category,
+    attack_name) as the evaluator produces them, so scores are available at
+    any point during a run without keeping or re-reading the rows. Group
+    accumulators are merged on demand and fed through the same
+    distortion/robustness/StegnoEval formulas as the batch functions; the
+    results match those to floating-point rounding.
+    """
+
+    METRICS = ['ssim', 'psnr', 'ber', 'payload_recovered']
+
+    def __init__(self, include_pruned: bool = True):
+        # Whether rows skipped by monotone pruning count (as inferred failures)
+        self.include_pruned = include_pruned
+        # (algo, category, attack_name) -> {"rows": int, metric: RunningStats}
+        self.groups = {}
+        # algo -> running totals for the cost/throughput figures
+        self.costs = {}
+        self.algorithms = []
+        # Whether rows carry detector columns (adds detectability_score)
+        self.has_detection = False
+
+    def update(self, row: Dict[str, Any]):
+        algo = row.get('algorithm')
+        if algo is None or algo == 'COVER_IMAGE_BASELINE':
+            return
+        if row.get('pruned') and not self.include_pruned:
+            return
+        if algo not in self.costs:
+            self.algorithms.append(algo)
+            self.costs[algo] = {
+                'rows': 0, 'recovered': 0, 'detection': RunningStats(),
+                'embed': {'calls': 0, 'time_ms': 0.0, 'mpx': 0.0, 'bits': 0.0, 'peak_kb': None},
+                'extract': {'calls': 0, 'time_ms': 0.0, 'mpx': 0.0, 'bits': 0.0, 'peak_kb': None},
+            }
+        
+        key = (algo, row.get('attack_category'), row.get('attack_name'))
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {'rows': 0, **{m: RunningStats() for m in self.METRICS}}
+        group['rows'] += 1
+        for metric in self.METRICS:
+            group[metric].update(row.get(metric))
+        
+        costs = self.costs[algo]
+        costs['rows'] += 1
+        if row.get('payload_recovered'):
+            costs['recovered'] += 1
+        if row.get('attack_category') == 'none' and DETECTABILITY_COLUMNS[0] in row:
+            costs['detection'].update(detection_evidence(
+                [row.get(c) for c in DETECTABILITY_COLUMNS],
+                [row.get(f'cover_{c}') for c in DETECTABILITY_COLUMNS]))
+            self.has_detection = True
+        for stage in ['embed', 'extract']:
+            time_ms = row.get(f'{stage}_time_ms')
+            if time_ms is None or (stage == 'embed' and row.get('attack_category') != 'none'):
+                continue
+            acc = costs[stage]
+            acc['calls'] += 1
+            acc['time_ms'] += time_ms
+            acc['mpx'] += row.get('cover_megapixels', 0.0)
+            acc['bits'] += row.get('payload_size', 0) * 8
+            peak = row.get(f'{stage}_peak_kb')
+            if peak is not None and (acc['peak_kb'] is None or peak > acc['peak_kb']):
+                acc['peak_kb'] = peak
+
+    def _merged(self, algo: str, include) -> Dict[str, Any]:
+        """Merge the accumulators of all groups of `algo` whose category passes `include`."""
+        merged = {'rows': 0, **{m: RunningStats() for m in self.METRICS}}
+        for (group_algo, category, _), group in self.groups.items():
+            if group_algo != algo or not include(category):
+                continue
+            merged['rows'] += group['rows']
+            for metric in self.METRICS:
+                merged[metric] = merged[metric].merge(group[metric])
+        return merged
+
+    @staticmethod
+    def _score(stats: Dict[str, Any]) -> Tuple[float, float, float]:
+        distortion = calculate_distortion_score(stats['ssim'].mean, stats['psnr'].mean)
+        robustness = calculate_robustness_score(stats['ber'].mean, stats['payload_recovered'].mean > 0)
+        return distortion, robustness, calculate_stegnoeval_score(distortion, robustness)
+
+    def _throughput(self, algo: str) -> Dict[str, Any]:
+        figures = {}
+        for stage in ['embed', 'extract']:
+            acc = self.costs[algo][stage]
+            total_s = acc['time_ms'] / 1000
+            figures[f'avg_{stage}_ms'] = acc['time_ms'] / acc['calls'] if acc['calls'] else None
+            figures[f'{stage}_mpx_per_s'] = acc['mpx'] / total_s if total_s > 0 else None
+            figures[f'{stage}_bits_per_s'] = acc['bits'] / total_s if total_s > 0 else None
+            figures[f'{stage}_peak_kb'] = acc['peak_kb']
+        return figures
+
+    def category_scores(self) -> pd.DataFrame:
+        """Same columns as calculate_scores_by_category."""
+        results = []
+        for algo in self.algorithms:
+            categories = []
+            for (group_algo, category, _) in self.groups:
+                if group_algo == algo and category not in categories and category != 'none':
+                    categories.append(category)
+            for category in categories:
+                # Rows without a category (failed embeds) never match a category, as in the batch path
+                stats = self._merged(algo, lambda c, category=category: category is not None and c == category)
+                distortion, robustness, overall = self._score(stats)
+                results.append({
+                    'algorithm': algo,
+                    'attack_category': category,
+                    'avg_ssim': stats['ssim'].mean,
+                    'avg_psnr': stats['psnr'].mean,
+                    'avg_ber': stats['ber'].mean,
+                    'recovery_rate': stats['payload_recovered'].mean,
+                    'distortion_score': distortion,
+                    'robustness_score': robustness,
+                    'overall_score': overall,
+                    'images_tested': stats['rows']
+                })
+        return pd.DataFrame(results)
+
+    def overall_scores(self) -> pd.DataFrame:
+        """Same columns as calculate_overall_scores."""
+        results = []
+        for algo in self.algorithms:
+            category_scores = {}
+            for column, categories in CATEGORY_SCORE_GROUPS.items():
+                stats = self._merged(algo, lambda c, categories=categories: c in categories)
+                category_scores[column] = self._score(stats)[2] if stats['rows'] else None
+            
+            attack_stats = self._merged(algo, lambda c: c != 'none')
+            if attack_stats['rows']:
+                overall_score = self._score(attack_stats)[2]
+                overall_recovery = attack_stats['payload_recovered'].mean
+            else:
+                overall_score = None
+                overall_recovery = 0
+            
+            detection = self.costs[algo]['detection']
+            detectability = ({'detectability_score': 100 * (1 - detection.mean) if detection.count else None}
+                             if self.has_detection else {})
+            
+            results.append({
+                'algorithm': algo,
+                **category_scores,
+                'overall_score': overall_score,
+                **detectability,
+                **self._throughput(algo),
+                'total_images': self.costs[algo]['rows'],
+                'total_payloads_recovered': self.costs[algo]['recovered'],
+                'overall_recovery_rate': overall_recovery
+            })
+        return pd.DataFrame(results)
+
+    def postfix(self) -> Dict[str, str]:
+        """Short per-algorithm running overall score for a progress bar."""
+        postfix = {}
+        for algo in self.algorithms:
+            attack_stats = self._merged(algo, lambda c: c != 'none')
+            if attack_stats['rows']:
+                postfix[algo] = f"{self._score(attack_stats)[2]:.1f}"
+        return postfix
+
+
+class ScorePrecision:
+    """
+    Normal-approximation confidence intervals for every algorithm x category score.
+
+    Images are the sampling unit (rows of one image are correlated), so rows
+    are averaged per image first. The score is linearized per image: the same
+    StegnoEval formula applied to the image's mean SSIM/PSNR/BER, with the
+    recovery indicator taken from the pooled recovery rate. The half-width is
+    z * std / sqrt(images) of those per-image scores, while the score itself
+    is computed from the pooled rows exactly as in the reports.
+
+    Rows must arrive image by image; call `end_image()` after each image.
+    """
+
+    METRICS = ['ssim', 'psnr', 'ber', 'payload_recovered']
+
+    def __init__(self, confidence: float = 0.95, include_pruned: bool = True):
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.include_pruned = include_pruned
+        self.images_seen = 0
+        # Why sampling stopped, filled in by the evaluator
+        self.stop_reason = None
+        # (algo, category) -> pooled RunningStats per metric, plus per-image
+        # score accumulators for a recovered / not recovered pooled indicator
+        self.groups = {}
+        # (algo, category) -> RunningStats per metric for the image in progress
+        self._current = {}
+
+    def update(self, row: Dict[str, Any]):
+        algo = row.get('algorithm')
+        category = row.get('attack_category')
+        if algo is None or algo == 'COVER_IMAGE_BASELINE' or category in (None, 'none'):
+            return
+        if row.get('pruned') and not self.include_pruned:
+            return
+        current = self._current.get((algo, category))
+        if current is None:
+            current = self._current[(algo, category)] = {m: RunningStats() for m in self.METRICS}
+        for metric in self.METRICS:
+            current[metric].update(row.get(metric))
+
+    def end_image(self):
+        """Fold the finished image's per-group means into the interval accumulators."""
+        self.images_seen += 1
+        for key, current in self._current.items():
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = {
+                    **{m: RunningStats() for m in self.METRICS},
+                    'recovered': RunningStats(), 'not_recovered': RunningStats(), 'images': 0,
+                }
+            group['images'] += 1
+            for metric in self.METRICS:
+                group[metric] = group[metric].merge(current[metric])
+            
+            distortion = calculate_distortion_score(current['ssim'].mean, current['psnr'].mean)
+            ber = current['ber'].mean
+            group['recovered'].update(calculate_stegnoeval_score(distortion, calculate_robustness_score(ber, True)))
+            group['not_recovered'].update(calculate_stegnoeval_score(distortion, 0.0))
+        self._current = {}
+
+    def intervals(self) -> pd.DataFrame:
+        """
+        One row per algorithm x category with:
+        algorithm, attack_category, score, half_width, images
+        """
+        results = []
+        for (algo, category), group in self.groups.items():
+            _, _, score = LiveScoreboard._score(group)
+            per_image = group['recovered'] if group['payload_recovered'].mean > 0 else group['not_recovered']
+            variance = per_image.variance
+            half_width = self.z * math.sqrt(variance / per_image.count) if not math.isnan(variance) else float('inf')
+            results.append({
+                'algorithm': algo,
+                'attack_category': category,
+                'score': score,
+                'half_width': half_width,
+                'images': group['images'],
+            })
+        return pd.DataFrame(results)
+
+    def converged(self, target_half_width: float) -> bool:
+        """True once every score interval is at most `target_half_width` wide (each side)."""
+        intervals = self.intervals()
+        return not intervals.empty and bool((intervals['half_width'] <= target_half_width).all())
@@ -0,0 +1,109 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
+
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class AsyncStegoAlgorithm(ABC):
+    """
+    Asynchronous variant of StegoAlgorithm for I/O-bound algorithms.
+
+    Algorithms that spend their time waiting on external processes or
+    services (e.g. CLI wrappers using asyncio.create_subprocess_exec) can
+    implement embed/extract as coroutines. The async evaluator then keeps
+    many calls in flight from a single process, bounded by its concurrency
+    limit.
+
+    Implementations must be safe to call concurrently: several embed and
+    extract calls on the same instance may be awaited at the same time.
+    """
+
+    last_peak_memory: Optional[int] = None
+
+    @abstractmethod
+    async def embed(self, cover: np.ndarray, payload: str) -> np.ndarray:
+        """
+        Embed a secret payload into the cover image.
+
+        Args:
+            cover (np.ndarray): The cover image (grayscale or RGB) as a numpy array.
+            payload (str): The secret message or binary string to embed.
+
+        Returns:
+            np.ndarray: The resulting stego image.
+        """
+        pass
+
+    @abstractmethod
+    async def extract(self, stego: np.ndarray) -> str:
+        """
+        Extract the secret payload from a stego image.
+
+        Args:
+            stego (np.ndarray): The stego image as a numpy array.
+
+        Returns:
+            str: The extracted secret message or binary string.
+        """
+        pass
+
+    @abstractmethod
+    def name(self) -> str:
+        """
+        Return the unique name of the algorithm.
+
+        Returns:
+            str: Algorithm name.
+        """
+        pass
+
+
+class SyncAlgorithmAdapter(AsyncStegoAlgorithm):
+    """
+    Runs a synchronous StegoAlgorithm on a worker thread.
+
+    Sync algorithms are not assumed to be thread-safe (GenericCLIAdapter,
+    for example, reuses fixed temp file paths), so calls on one instance
+    are serialized unless `concurrent=True`. as_async passes the
+    algorithm's `thread_safe` flag.
+    """
+
+    def __init__(self, algorithm: StegoAlgorithm, concurrent: bool = False):
+        self.algorithm = algorithm
+        self._lock = None if concurrent else asyncio.Lock()
+
+    def name(self) -> str:
+        return self.algorithm.name()
+
+    async def run_sync(self, func, *args):
+        """Run `func(*args)` on a worker thread, serialized with this algorithm's calls."""
+        if self._lock is None:
+            return await asyncio.to_thread(func, *args)
+        async with self._lock:
+            output = await asyncio.to_thread(func, *args)
+            self.last_peak_memory = getattr(self.algorithm, "last_peak_memory", None)
+            return output
+
+    async def embed(self, cover: np.ndarray, payload: str) -> np.ndarray:
+        return await self.run_sync(self.algorithm.embed, cover, payload)
+
+    async def extract(self, stego: np.ndarray) -> str:
+        return await self.run_sync(self.algorithm.extract, stego)
+
+
+def as_async(algorithm) -> AsyncStegoAlgorithm:
+    """
+    Return `algorithm` as an AsyncStegoAlgorithm.
+
+    Sync algorithms that provide a native async version (`async_variant()`,
+    e.g. GenericCLIAdapter) are replaced by it; the others are wrapped, and
+    run concurrently only when they are `thread_safe`.
+    """
+    if isinstance(algorithm, AsyncStegoAlgorithm):
+        return algorithm
+    async_variant = getattr(algorithm, "async_variant", None)
+    if async_variant is not None:
+        return async_variant()
+    return SyncAlgorithmAdapter(algorithm, concurrent=algorithm.thread_safe)
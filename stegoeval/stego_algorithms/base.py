@@ -1,12 +1,25 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
 import numpy as np
 
 
 class StegoAlgorithm(ABC):
     """
     Abstract base class for all steganography algorithms in StegoEval.
+
+    Algorithms that do their work outside the Python process (e.g. CLI
+    wrappers) should set `last_peak_memory` to the peak memory in bytes of
+    their most recent embed/extract call. The evaluator then reports that
+    value instead of tracing Python allocations.
+
+    Set `thread_safe` to True when embed/extract keep no per-call state on
+    the instance; the async evaluator then runs calls on one instance
+    concurrently instead of one at a time.
     """
 
+    last_peak_memory: Optional[int] = None
+    thread_safe: bool = False
+
     @abstractmethod
     def embed(self, cover: np.ndarray, payload: str) -> np.ndarray:
         """
@@ -43,3 +56,18 @@ class StegoAlgorithm(ABC):
             str: Algorithm name.
         """
         pass
+
+    def capacity(self, cover_shape: Tuple[int, ...]) -> Optional[int]:
+        """
+        Capacity hint: largest payload (in characters) this algorithm can embed
+        in a cover of `cover_shape`, or None when unknown. The capacity search
+        uses it as its upper bound.
+        """
+        return None
+
+    def extract_batch(self, stegos: List[np.ndarray]) -> List[str]:
+        """
+        Extract the payloads of several stego images. Override when images can
+        share work (e.g. one stacked transform); the default extracts one by one.
+        """
+        return [self.extract(stego) for stego in stegos]
@@ -0,0 +1,161 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from stegoeval.attacks.compression import DCT_64, ZIGZAG
+from .base import StegoAlgorithm
+
+
+class DCTQIMStego(StegoAlgorithm):
+    """
+    Block-DCT quantization index modulation with repetition coding.
+
+    A robustness baseline: bits are embedded in mid-frequency coefficients
+    of the 8x8 DCT of the luminance (the image itself for grayscale). Each
+    coefficient is quantized onto one of two lattices offset by delta / 2
+    (bit 0 / bit 1). A 16-bit length header and the payload bits are
+    repeated over all coefficient slots, in a keyed pseudo-random order, and
+    decoded by soft majority vote, so the payload survives mild compression,
+    noise and blur (not resampling: slots are tied to the block grid).
+
+    All blocks of an image (or of a batch of same-shaped images in
+    `extract_batch`) are transformed with a single matrix product.
+    """
+
+    HEADER_BITS = 16
+    # Header copies: a quarter of the slots, between MIN_REPEAT and HEADER_REPEAT
+    HEADER_REPEAT = 32
+    MIN_REPEAT = 3
+    thread_safe = True
+
+    def __init__(self, delta: float = 28.0, coefficients: Sequence[int] = tuple(ZIGZAG[3:9]), key: int = 1):
+        # Quantization step of the coefficient lattices (larger = more robust, more distortion)
+        self.delta = float(delta)
+        # Row-major positions (0-63) of the embedding coefficients in each 8x8 block
+        self.coefficients = np.asarray(coefficients)
+        self.key = key
+        self._basis = DCT_64[self.coefficients].astype(np.float64)
+
+    def name(self) -> str:
+        return "dct_qim"
+
+    # Layout
+
+    def _slots(self, shape: Tuple[int, ...]) -> int:
+        return (shape[0] // 8) * (shape[1] // 8) * len(self.coefficients)
+
+    def _header_slots(self, slots: int) -> int:
+        repeat = min(max(slots // (4 * self.HEADER_BITS), self.MIN_REPEAT), self.HEADER_REPEAT)
+        return self.HEADER_BITS * repeat
+
+    def _capacity(self, slots: int) -> int:
+        payload_slots = slots - self._header_slots(slots)
+        return max(0, min(payload_slots // (8 * self.MIN_REPEAT), 2 ** self.HEADER_BITS - 1))
+
+    def capacity(self, cover_shape: Tuple[int, ...]) -> Optional[int]:
+        """Largest payload (characters) that still gets MIN_REPEAT copies of every bit."""
+        return self._capacity(self._slots(cover_shape))
+
+    def _order(self, slots: int) -> np.ndarray:
+        """Keyed permutation spreading every bit's copies over the whole image."""
+        return np.random.default_rng(self.key).permutation(slots)
+
+    def _bit_index(self, slots: int, payload_bits: int) -> np.ndarray:
+        """Bit carried by each slot (header bits first, then payload bits), -1 for unused slots."""
+        header_slots = self._header_slots(slots)
+        index = np.full(slots, -1)
+        index[:header_slots] = np.arange(header_slots) % self.HEADER_BITS
+        if payload_bits:
+            used = (slots - header_slots) // payload_bits * payload_bits
+            index[header_slots:header_slots + used] = self.HEADER_BITS + np.arange(used) % payload_bits
+        permuted = np.empty_like(index)
+        permuted[self._order(slots)] = index
+        return permuted
+
+    # Transforms
+
+    def _luma(self, image: np.ndarray) -> np.ndarray:
+        if image.ndim == 2:
+            return image.astype(np.float64)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)[..., 0].astype(np.float64)
+
+    def _coefficients(self, planes: np.ndarray) -> np.ndarray:
+        """(N, H, W) planes -> (N, slots) embedding coefficients, block-major."""
+        n, h, w = planes.shape
+        rows, cols = h // 8, w // 8
+        blocks = planes[:, :rows * 8, :cols * 8].reshape(n, rows, 8, cols, 8).swapaxes(2, 3)
+        return (blocks.reshape(n, rows * cols, 64) @ self._basis.T).reshape(n, -1)
+
+    # Embed / extract
+
+    def embed(self, cover: np.ndarray, payload: str) -> np.ndarray:
+        """Embed the payload (8 bits per character, like calculate_ber)."""
+        data = payload.encode("latin-1", errors="replace")
+        capacity = self.capacity(cover.shape)
+        if len(data) > capacity:
+            raise ValueError(f"Payload too large for cover image. Max characters: {capacity}")
+
+        header = np.unpackbits(np.array([len(data)], dtype=">u2").view(np.uint8))
+        bits = np.concatenate([header, np.unpackbits(np.frombuffer(data, dtype=np.uint8))])
+        luma = self._luma(cover)
+        coeffs = self._coefficients(luma[None])[0]
+        index = self._bit_index(coeffs.size, len(bits) - self.HEADER_BITS)
+
+        # Move each used coefficient to the nearest point of its bit's lattice
+        used = index >= 0
+        offset = bits[index[used]] * (self.delta / 2)
+        change = np.zeros_like(coeffs)
+        target = np.round((coeffs[used] - offset) / self.delta) * self.delta + offset
+        change[used] = target - coeffs[used]
+
+        # Back to pixels: every block gets the sum of its changed basis images
+        h, w = luma.shape
+        rows, cols = h // 8, w // 8
+        pixels = change.reshape(rows * cols, -1) @ self._basis
+        pixels = pixels.reshape(rows, cols, 8, 8).swapaxes(1, 2).reshape(rows * 8, cols * 8)
+        luma[:rows * 8, :cols * 8] += pixels
+
+        if cover.ndim == 2:
+            return np.clip(np.rint(luma), 0, 255).astype(cover.dtype)
+        ycrcb = cv2.cvtColor(cover, cv2.COLOR_BGR2YCrCb)
+        ycrcb[..., 0] = np.clip(np.rint(luma), 0, 255)
+        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+
+    def _soft_bits(self, coeffs: np.ndarray) -> np.ndarray:
+        """Per-slot evidence for bit 1 (positive) vs bit 0 (negative), in [-delta/2, delta/2]."""
+        to_zero = np.abs(coeffs - np.round(coeffs / self.delta) * self.delta)
+        half = coeffs - self.delta / 2
+        to_one = np.abs(half - np.round(half / self.delta) * self.delta)
+        return to_zero - to_one
+
+    def _decode(self, soft: np.ndarray) -> str:
+        header_index = self._bit_index(soft.size, 0)
+        header_votes = np.bincount(header_index[header_index >= 0], soft[header_index >= 0],
+                                   minlength=self.HEADER_BITS)
+        length = int(np.packbits(header_votes > 0).view(">u2")[0])
+        if length == 0 or length > self._capacity(soft.size):
+            return ""
+
+        index = self._bit_index(soft.size, 8 * length)
+        votes = np.bincount(index[index >= 0], soft[index >= 0], minlength=self.HEADER_BITS + 8 * length)
+        data = np.packbits(votes[self.HEADER_BITS:] > 0).tobytes()
+        return data.decode("latin-1")
+
+    def extract(self, stego: np.ndarray) -> str:
+        """Extract the payload (empty string when the header does not decode to a valid length)."""
+        return self.extract_batch([stego])[0]
+
+    def extract_batch(self, stegos: List[np.ndarray]) -> List[str]:
+        """Extract several images; same-shaped images share one stacked DCT."""
+        results = [""] * len(stegos)
+        by_shape = {}
+        for i, stego in enumerate(stegos):
+            by_shape.setdefault(stego.shape, []).append(i)
+        for shape, members in by_shape.items():
+            if self._capacity(self._slots(shape)) == 0:
+                continue
+            planes = np.stack([self._luma(stegos[i]) for i in members])
+            soft = self._soft_bits(self._coefficients(planes))
+            for i, row in zip(members, soft):
+                results[i] = self._decode(row)
+        return results
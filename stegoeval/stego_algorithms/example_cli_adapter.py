@@ -1,11 +1,15 @@
+import asyncio
 import os
 import subprocess
+import sys
 import tempfile
 import cv2
 import numpy as np
-from typing import Any
+from contextvars import ContextVar
+from typing import Optional, Tuple
 
 from stegoeval.stego_algorithms.base import StegoAlgorithm
+from stegoeval.stego_algorithms.async_base import AsyncStegoAlgorithm
 
 class GenericCLIAdapter(StegoAlgorithm):
     """
@@ -28,6 +32,41 @@ class GenericCLIAdapter(StegoAlgorithm):
     def name(self) -> str:
         return "Generic_CLI_Wrapper"
 
+    def async_variant(self) -> "AsyncGenericCLIAdapter":
+        """Same CLI for the async evaluator (the fixed key path above rules out concurrent calls)."""
+        return AsyncGenericCLIAdapter(self.cli_script_path, self.python_exec)
+
+    def _run_cli(self, command: list) -> subprocess.CompletedProcess:
+        """
+        Run the external command and record its peak RSS in `last_peak_memory`.
+
+        Uses os.wait4 so the resource usage belongs to this child only. Output
+        goes through temporary files to avoid pipe deadlocks without communicate().
+        Raises subprocess.CalledProcessError on a non-zero exit code, like
+        subprocess.run(check=True).
+        """
+        if not hasattr(os, "wait4"):
+            # No per-child rusage on this platform (e.g. Windows)
+            self.last_peak_memory = None
+            return subprocess.run(command, check=True, capture_output=True, text=True)
+
+        with tempfile.TemporaryFile(mode="w+") as out, tempfile.TemporaryFile(mode="w+") as err:
+            proc = subprocess.Popen(command, stdout=out, stderr=err, text=True)
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.last_peak_memory = rusage.ru_maxrss * scale
+
+            out.seek(0)
+            err.seek(0)
+            stdout, stderr = out.read(), err.read()
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr)
+
     def embed(self, cover_image: np.ndarray, payload: str) -> np.ndarray:
         """
         Since the CLI takes file paths, we must save the ndarray to disk,
@@ -50,8 +89,8 @@ class GenericCLIAdapter(StegoAlgorithm):
         ]
         
         try:
-            # We use check=True to raise an error if the CLI fails
-            subprocess.run(command, check=True, capture_output=True, text=True)
+            # Raises CalledProcessError if the CLI fails
+            self._run_cli(command)
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"CLI Embed failed: {e.stderr}")
 
@@ -84,7 +123,7 @@ class GenericCLIAdapter(StegoAlgorithm):
         ]
         
         try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
+            result = self._run_cli(command)
             # The CLI prints to stdout. We assume the output is the text message.
             # You might need to parse `result.stdout` to slice out "Extracted: {"}"
             extracted_text = result.stdout.strip()
@@ -104,3 +143,88 @@ class GenericCLIAdapter(StegoAlgorithm):
         import shutil
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
+
+
+# Work directory of the most recent embed in the current asyncio task (see AsyncGenericCLIAdapter)
+_cli_work_dir: ContextVar[Optional[str]] = ContextVar("stegoeval_cli_work_dir", default=None)
+
+
+class AsyncGenericCLIAdapter(AsyncStegoAlgorithm):
+    """
+    Asynchronous version of GenericCLIAdapter built on asyncio.create_subprocess_exec.
+
+    Many CLI calls can be in flight at once, so every embed gets its own work
+    directory (cover, stego and side-channel key). The directory is stored in
+    a ContextVar: the evaluator awaits embed and then the extracts of that
+    stego image from the same task, so each extract finds the key of its own
+    embed. Peak memory is not reported because rusage of concurrent children
+    cannot be told apart.
+    """
+    def __init__(self, cli_script_path: str, venv_python_path: str = None):
+        self.cli_script_path = cli_script_path
+        self.python_exec = venv_python_path if venv_python_path else "python3"
+        self.temp_dir = tempfile.mkdtemp(prefix="stegoeval_cli_")
+
+    def name(self) -> str:
+        return "Generic_CLI_Wrapper"
+
+    async def _run_cli(self, command: list) -> Tuple[int, str, str]:
+        """Run the external command without blocking the event loop. Returns (returncode, stdout, stderr)."""
+        proc = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+        return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+    async def embed(self, cover_image: np.ndarray, payload: str) -> np.ndarray:
+        work_dir = tempfile.mkdtemp(dir=self.temp_dir)
+        _cli_work_dir.set(work_dir)
+        cover_path = os.path.join(work_dir, "temp_cover.png")
+        stego_path = os.path.join(work_dir, "temp_stego.png")
+        key_path = os.path.join(work_dir, "original_key.npy")
+        
+        cv2.imwrite(cover_path, cv2.cvtColor(cover_image, cv2.COLOR_RGB2BGR))
+        
+        # Customize this command list to match the target CLI's actual expected arguments!
+        command = [
+            self.python_exec, self.cli_script_path,
+            "embed", cover_path, payload,
+            "-o", stego_path,
+            "-k", key_path
+        ]
+        returncode, _, stderr = await self._run_cli(command)
+        if returncode != 0:
+            raise RuntimeError(f"CLI Embed failed: {stderr}")
+        
+        stego_bgr = cv2.imread(stego_path)
+        if stego_bgr is None:
+            raise FileNotFoundError(f"CLI did not produce outputs at {stego_path}")
+        return cv2.cvtColor(stego_bgr, cv2.COLOR_BGR2RGB)
+
+    async def extract(self, stego_image: np.ndarray) -> str:
+        work_dir = _cli_work_dir.get()
+        if work_dir is None:
+            raise RuntimeError("extract() called without a preceding embed() in this task")
+        
+        # Unique file per call: several extracts of one embed may run at once
+        fd, stego_path = tempfile.mkstemp(suffix=".png", dir=work_dir)
+        os.close(fd)
+        cv2.imwrite(stego_path, cv2.cvtColor(stego_image, cv2.COLOR_RGB2BGR))
+        
+        command = [
+            self.python_exec, self.cli_script_path,
+            "extract", stego_path, os.path.join(work_dir, "original_key.npy")
+        ]
+        try:
+            returncode, stdout, _ = await self._run_cli(command)
+        finally:
+            os.remove(stego_path)
+        
+        # A crashed CLI under heavy attacks means complete extraction failure (BER 1.0)
+        return stdout.strip() if returncode == 0 else ""
+
+    def cleanup(self):
+        """Optional: Cleans up the temp directories after the benchmark."""
+        import shutil
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
@@ -9,6 +9,8 @@ class LSBStego(StegoAlgorithm):
     This is a basic example algorithm and is typically not robust against attacks.
     """
 
+    thread_safe = True
+
     def name(self) -> str:
         return "example_lsb"
 
@@ -0,0 +1,47 @@
+"""
+Algorithm registry.
+
+Algorithms are referenced by name and only imported when they are actually
+instantiated, so listing them (e.g. `stegoeval info`) stays cheap. Third-party
+packages can expose their own algorithms through the `stegoeval.algorithms`
+entry-point group:
+
+    [project.entry-points."stegoeval.algorithms"]
+    my_algo = "my_package.module:MyAlgorithm"
+"""
+
+import importlib
+from importlib.metadata import entry_points
+from typing import Dict, List
+
+ENTRY_POINT_GROUP = "stegoeval.algorithms"
+
+# Built-in algorithms as "module:ClassName" references (imported on demand)
+BUILTIN_ALGORITHMS = {
+    "example_lsb": "stegoeval.stego_algorithms.example_lsb:LSBStego",
+    "dct_qim": "stegoeval.stego_algorithms.dct_qim:DCTQIMStego",
+}
+
+
+def available_algorithms() -> Dict[str, str]:
+    """Return a mapping of algorithm name -> "module:ClassName" without importing anything."""
+    registry = dict(BUILTIN_ALGORITHMS)
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        registry[ep.name] = ep.value
+    return registry
+
+
+def load_algorithm(name: str):
+    """Import and instantiate a registered algorithm by name."""
+    registry = available_algorithms()
+    if name not in registry:
+        raise ValueError(f"Unknown algorithm '{name}'. Available: {', '.join(sorted(registry))}")
+
+    module_name, _, class_name = registry[name].partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def load_algorithms(names: List[str]) -> List:
+    """Instantiate several registered algorithms, preserving order."""
+    return [load_algorithm(name) for name in names]
@@ -0,0 +1,60 @@
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.scoring import ScorePrecision
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class Identity(StegoAlgorithm):
+    def embed(self, cover, payload):
+        self.payload = payload
+        return cover.copy()
+
+    def extract(self, stego):
+        return self.payload
+
+    def name(self):
+        return "identity"
+
+
+def _evaluate(tmp_path, target_half_width, **config):
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(8):
+        cv2.imwrite(str(data / f"{i}.png"), rng.integers(0, 256, (32, 32, 3), dtype=np.uint8))
+    evaluator = Evaluator({"dataset_path": str(data), "payload_sizes": [4], "detectability": False,
+                           "attacks": {"compression": {"jpeg": [50]}, "noise": {"gaussian": [{"var": 0.01}]}},
+                           "adaptive_sampling": True, "min_images": 3, "sampling_seed": 1,
+                           "target_half_width": target_half_width, **config}, [Identity()])
+    rows = evaluator.evaluate()
+    return evaluator, {r["image"] for r in rows}
+
+
+def test_sampling_stops_once_intervals_are_narrow(tmp_path):
+    evaluator, images = _evaluate(tmp_path, target_half_width=100.0)
+    assert len(images) == 3
+    assert evaluator.precision.stop_reason.startswith("all score intervals within")
+
+
+def test_sampling_runs_to_the_image_limit_otherwise(tmp_path):
+    evaluator, images = _evaluate(tmp_path, target_half_width=1e-9, max_images=5)
+    assert len(images) == 5
+    assert evaluator.precision.stop_reason == "image limit reached after 5 images"
+
+
+def test_interval_narrows_with_more_images():
+    precision = ScorePrecision()
+    rng = np.random.default_rng(0)
+    widths = []
+    for image in range(40):
+        precision.update({"algorithm": "a", "attack_category": "noise", "ssim": rng.uniform(0.5, 1.0),
+                          "psnr": 30.0, "ber": 0.0, "payload_recovered": True})
+        precision.end_image()
+        widths.append(precision.intervals().loc[0, "half_width"])
+    assert widths[0] == float("inf")
+    assert widths[-1] < widths[4]
+    assert precision.converged(widths[-1]) and not precision.converged(widths[-1] / 2)
+    assert precision.intervals().loc[0, "images"] == 40
@@ -0,0 +1,49 @@
+import numpy as np
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class Counting(StegoAlgorithm):
+    def __init__(self, peak=None):
+        self.calls = 0
+        self.last_peak_memory = peak
+
+    def embed(self, cover, payload):
+        self.calls += 1
+        return np.array(cover, copy=True)
+
+    def extract(self, stego):
+        return ""
+
+    def name(self):
+        return "counting"
+
+
+COVER = np.zeros((256, 256, 3), np.uint8)
+
+
+def _cost(tmp_path, algo, **config):
+    evaluator = Evaluator({"dataset_path": str(tmp_path), **config}, [algo])
+    _, cost = evaluator._call_algorithm(algo, "embed", COVER, "payload")
+    return cost
+
+
+def test_cost_columns_without_tracing(tmp_path):
+    algo = Counting()
+    cost = _cost(tmp_path, algo)
+    assert algo.calls == 1
+    assert cost["embed_time_ms"] > 0
+    assert cost["embed_peak_kb"] is None
+
+
+def test_tracing_measures_the_single_call(tmp_path):
+    algo = Counting()
+    cost = _cost(tmp_path, algo, track_memory=True)
+    assert algo.calls == 1
+    assert cost["embed_peak_kb"] >= COVER.nbytes / 1024
+
+
+def test_algorithm_reported_peak_wins(tmp_path):
+    algo = Counting(peak=10 * 1024)
+    assert _cost(tmp_path, algo, track_memory=True)["embed_peak_kb"] == 10
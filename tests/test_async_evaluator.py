@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+
+from stegoeval.core.async_evaluator import AsyncEvaluator
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.async_base import SyncAlgorithmAdapter, as_async
+from stegoeval.stego_algorithms.dct_qim import DCTQIMStego
+from stegoeval.stego_algorithms.example_cli_adapter import AsyncGenericCLIAdapter, GenericCLIAdapter
+from stegoeval.stego_algorithms.example_lsb import LSBStego
+
+# Wall-time and memory columns differ between runs
+VOLATILE = {"embed_time_ms", "embed_peak_kb", "extract_time_ms", "extract_peak_kb"}
+
+
+def _config(tmp_path, images=3):
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(images):
+        cv2.imwrite(str(data / f"{i}.png"), rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+    return {"dataset_path": str(data), "payload_sizes": [4, 12], "detectability": False, "combo_attacks": True,
+            "attacks": {"compression": {"jpeg": [50, 90]}, "filtering": {"gaussian_blur": [3]},
+                        "geometric": {"rotation": [5.0], "scaling": [0.5]}}}
+
+
+def _run(evaluator_class, config):
+    evaluator = evaluator_class(config, [LSBStego(), DCTQIMStego()])
+    evaluator._generate_random_payload = lambda length: ("payload-" * length)[:length]
+    rows = [{k: v for k, v in row.items() if k not in VOLATILE} for row in evaluator.evaluate()]
+    key = lambda row: (row["image"], row["algorithm"], row.get("payload_size", 0), row.get("attack_category", ""),
+                       row.get("attack_name", ""), row.get("attack_params", ""))
+    return sorted(rows, key=key), evaluator
+
+
+def test_async_rows_equal_sequential_rows(tmp_path):
+    config = _config(tmp_path)
+    sequential, _ = _run(Evaluator, config)
+    concurrent, _ = _run(AsyncEvaluator, {**config, "concurrency": 3})
+    assert len(concurrent) == len(sequential)
+    for a, b in zip(concurrent, sequential):
+        assert a.keys() == b.keys()
+        for column in a:
+            if isinstance(b[column], float):
+                np.testing.assert_allclose(a[column], b[column], rtol=1e-9, err_msg=column)
+            else:
+                assert a[column] == b[column], column
+
+
+def test_images_are_loaded_as_tasks_start(tmp_path):
+    config = {**_config(tmp_path, images=8), "concurrency": 2, "combo_attacks": False}
+    evaluator = AsyncEvaluator(config, [LSBStego()])
+    loaded, active, peak = [], [0], [0]
+    images = evaluator.dataset_loader.get_images
+    evaluator.dataset_loader.get_images = lambda **kw: (loaded.append(i) or i for i in images(**kw))
+    task = evaluator._evaluate_task
+
+    async def counted(*args):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        if len(peak) == 1:
+            peak.append(len(loaded))  # images loaded when the first task starts
+        try:
+            return await task(*args)
+        finally:
+            active[0] -= 1
+
+    evaluator._evaluate_task = counted
+    evaluator.evaluate()
+    assert len(loaded) == 8
+    assert peak[0] <= 2
+    assert peak[1] <= 3
+
+
+def test_as_async_picks_concurrency_from_the_algorithm():
+    assert as_async(LSBStego())._lock is None
+    cli = GenericCLIAdapter("demo.py")
+    assert isinstance(as_async(cli), AsyncGenericCLIAdapter)
+
+    class Stateful(LSBStego):
+        thread_safe = False
+
+    adapter = as_async(Stateful())
+    assert isinstance(adapter, SyncAlgorithmAdapter) and adapter._lock is not None
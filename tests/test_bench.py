@@ -0,0 +1,30 @@
+from stegoeval.bench import compare_to_baseline, run_benchmarks
+
+
+def _results(**medians):
+    return {"results": {name: {"median_s": median} for name, median in medians.items()}}
+
+
+def test_filtered_suite_times_matching_cases():
+    lines = []
+    report = run_benchmarks(size=64, repeat=1, only="attacks.noise", progress=lines.append)
+
+    names = set(report["results"])
+    assert names and all(name.startswith("attacks.noise.") for name in names)
+    assert len(lines) == len(names)
+    for stats in report["results"].values():
+        assert stats["repeat"] == 1 and stats["min_s"] <= stats["median_s"] <= stats["max_s"]
+    assert report["meta"]["cover_size"] == 64
+
+
+def test_regressions_against_baseline_and_budget():
+    baseline = _results(fast=0.010, steady=0.010)
+    current = _results(fast=0.020, steady=0.011, new=1.0)
+    current["results"]["startup.cli_info"] = {"median_s": 0.9, "budget_s": 0.5}
+
+    regressions = {r["name"]: r for r in compare_to_baseline(current, baseline, threshold=0.25)}
+    # steady is within the threshold, new has no baseline
+    assert set(regressions) == {"fast", "startup.cli_info"}
+    assert regressions["fast"]["reason"] == "baseline"
+    assert regressions["fast"]["change"] == 1.0
+    assert regressions["startup.cli_info"]["reason"] == "budget"
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.attacks.filtering import BlurBank, apply_gaussian_blur, apply_motion_blur, motion_kernel
+
+
+def _image(shape=(70, 90, 3)):
+    return np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("shape", [(70, 90, 3), (64, 64)])
+@pytest.mark.parametrize("kernel_size", [3, 15, 31])
+def test_fft_gaussian_matches_opencv(shape, kernel_size):
+    image = _image(shape)
+    bank = BlurBank(image)
+    fft = bank.filter(image, ("gaussian", kernel_size), kernel_size)
+    reference = cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
+    assert fft.shape == reference.shape and fft.dtype == np.uint8
+    # Float rounding only: never more than one gray level apart
+    assert np.abs(fft.astype(int) - reference).max() <= 1
+
+
+@pytest.mark.parametrize("size, angle", [(5, 0.0), (13, 30.0), (21, 90.0)])
+def test_fft_motion_blur_matches_filter2d(size, angle):
+    image = _image()
+    bank = BlurBank(image)
+    fft = bank.filter(image, ("motion", size, angle), size)
+    reference = cv2.filter2D(image, -1, motion_kernel(size, angle))
+    assert np.abs(fft.astype(int) - reference).max() <= 1
+
+
+def test_bank_shares_one_spectrum_across_a_sweep():
+    image = _image()
+    bank = BlurBank(image)
+    for size in (3, 9, 15, 21, 31):
+        bank.filter(image, ("gaussian", size), size)
+    assert len(bank._spectra) == 1
+
+
+def test_attacks_pick_fft_only_where_it_pays():
+    image = _image((256, 256, 3))
+    bank = BlurBank(image)
+    assert not bank.prefers_fft(3, separable=True)
+    assert bank.prefers_fft(15, separable=False)
+    # Either way the attack result stays within a gray level of OpenCV's
+    for size in (3, 15):
+        assert np.abs(apply_motion_blur(image, size, bank=bank).astype(int)
+                      - cv2.filter2D(image, -1, motion_kernel(size, 0.0))).max() <= 1
+        assert np.abs(apply_gaussian_blur(image, size, bank=bank).astype(int)
+                      - cv2.GaussianBlur(image, (size, size), 0)).max() <= 1
@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class CropSensitive(StegoAlgorithm):
+    """Recovers the payload while at least 60% of the cover's height is left."""
+
+    def embed(self, cover, payload):
+        self.payload, self.height = payload, cover.shape[0]
+        return cover.copy()
+
+    def extract(self, stego):
+        return self.payload if stego.shape[0] >= 0.6 * self.height else ""
+
+    def name(self):
+        return "crop_sensitive"
+
+
+def test_search_brackets_the_breaking_point(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    cv2.imwrite(str(data / "a.png"), np.random.default_rng(0).integers(0, 256, (100, 100, 3), dtype=np.uint8))
+    config = {"dataset_path": str(data), "payload_sizes": [8], "detectability": False,
+              "attacks": {"geometric": {"cropping": [0.1, 0.2, 0.3], "rotation": [5.0]}},
+              "robustness_threshold": {"enabled": True, "ber_threshold": 0.0, "resolution": 0.01}}
+    evaluator = Evaluator(config, [CropSensitive()])
+    rows = evaluator.evaluate()
+    points = {p["attack_name"]: p for p in evaluator.breaking_points}
+
+    # 100 - 2 * int(100 * p) >= 60 holds up to p = 0.20999...
+    crop = points["cropping"]
+    assert crop["broken"] and crop["parameter"] == "percentage"
+    assert crop["last_passing"] < 0.21 <= crop["breaking_point"]
+    assert crop["breaking_point"] - crop["last_passing"] <= 0.49 * 0.01
+    assert crop["ber_at_break"] > 0
+    assert crop["evaluations"] <= 2 + 8
+
+    # Rotation keeps the shape: the strongest setting still passes
+    rotation = points["rotation"]
+    assert not rotation["broken"] and rotation["last_passing"] == 90.0 and rotation["evaluations"] == 1
+
+    # Searched attacks replace their grid rows
+    assert not any(r.get("attack_category") == "geometric" for r in rows)
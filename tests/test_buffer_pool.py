@@ -0,0 +1,48 @@
+import threading
+
+import numpy as np
+import pytest
+
+from stegoeval.attacks.noise import apply_gaussian_noise, apply_poisson_noise, apply_speckle_noise
+from stegoeval.core.attack_runner import AttackRunner, BufferPool
+
+
+def test_pool_reuses_buffers_per_shape_and_thread():
+    pool = BufferPool()
+    first = pool.get((4, 5))
+    assert pool.get((4, 5)) is first
+    assert first.dtype == np.float32
+    assert pool.get((4, 5), np.float64) is not first
+    assert pool.get((5, 4)) is not first
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(pool.get((4, 5))))
+    worker.start()
+    worker.join()
+    assert other[0] is not first
+
+    pool.clear()
+    assert pool.get((4, 5)) is not first
+
+
+@pytest.mark.parametrize("name, func, params", [
+    ("gaussian", apply_gaussian_noise, {"var": 0.01}),
+    ("speckle", apply_speckle_noise, {"var": 0.04}),
+    ("poisson", apply_poisson_noise, {}),
+])
+def test_pooled_scratch_leaves_outputs_unchanged(name, func, params):
+    image = np.random.default_rng(0).integers(0, 256, (40, 48, 3), dtype=np.uint8)
+    runner = AttackRunner()
+
+    outputs = []
+    for _ in range(2):
+        np.random.seed(7)
+        outputs.append(runner.run_single_attack(image, "noise", name, params))
+    np.random.seed(7)
+    expected = func(image, **params)
+
+    # The second call runs on the recycled (dirty) scratch buffer
+    np.testing.assert_array_equal(outputs[0], expected)
+    np.testing.assert_array_equal(outputs[1], expected)
+    assert runner.buffers.get(image.shape) is runner.buffers.get(image.shape)
+    assert not np.shares_memory(outputs[1], runner.buffers.get(image.shape))
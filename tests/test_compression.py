@@ -0,0 +1,35 @@
+import cv2
+import numpy as np
+
+from stegoeval.attacks.compression import apply_jpeg_compression, apply_webp_compression
+from stegoeval.core.attack_runner import AttackRunner
+
+
+def _image():
+    rng = np.random.default_rng(0)
+    smooth = cv2.GaussianBlur(rng.integers(0, 256, (64, 80, 3), dtype=np.uint8), (9, 9), 3)
+    return cv2.add(smooth, rng.integers(0, 16, smooth.shape, dtype=np.uint8))
+
+
+def test_compressed_bytes_is_the_encoded_size():
+    image = _image()
+    for quality in (30, 75, 95):
+        stats = {}
+        decoded = apply_jpeg_compression(image, quality, stats=stats)
+        _, encoded = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        assert stats["compressed_bytes"] == len(encoded)
+        np.testing.assert_array_equal(decoded, cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED))
+
+    stats = {}
+    apply_webp_compression(image, 50, stats=stats)
+    assert stats["compressed_bytes"] == len(cv2.imencode(".webp", image, [int(cv2.IMWRITE_WEBP_QUALITY), 50])[1])
+
+
+def test_compressed_bytes_shrinks_with_quality():
+    runner, image = AttackRunner(), _image()
+    sizes = []
+    for quality in (95, 75, 50, 20):
+        stats = {}
+        runner.run_single_attack(image, "compression", "jpeg", quality, stats=stats)
+        sizes.append(stats["compressed_bytes"])
+    assert sizes == sorted(sizes, reverse=True)
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from stegoeval.reporting.database import ResultsDatabase
+
+pytest.importorskip("scipy")
+
+
+def _rows(ber_offset: float):
+    rows = []
+    for image in ["a.png", "b.png", "c.png"]:
+        for i, (cat, name, params) in enumerate([("noise", "gaussian", 0.01), ("noise", "gaussian", 0.05),
+                                                  ("compression", "jpeg", 50)]):
+            rows.append({"image": image, "algorithm": "example_lsb", "payload_size": 10,
+                         "attack_category": "combo", "attack_name": f"{name}+rotation",
+                         "attack_params": str({cat: {name: params}, "geometric": {"rotation": 5.0}}),
+                         "ssim": 0.9, "psnr": 30.0, "ber": 0.1 * i + ber_offset + 0.01 * len(image),
+                         "payload_recovered": False})
+    rows.append({"image": "a.png", "algorithm": "example_lsb", "error": "Embed failed: payload too large"})
+    rows.append({"image": "b.png", "algorithm": "example_lsb", "error": "Embed failed: payload too large"})
+    return pd.DataFrame(rows)
+
+
+def test_compare_pairs_rows_one_to_one_and_tests_per_image(tmp_path):
+    db = ResultsDatabase(str(tmp_path / "stegoeval.db"))
+    db.append_run("a", _rows(0.0))
+    db.append_run("b", _rows(0.02))
+
+    table = db.compare("a", "b").set_index("metric")
+    # Three images, not 3 x 3 rows (or the 9 x 9 pairs of an ambiguous key)
+    assert table.loc["ber", "pairs"] == 3
+    assert table.loc["ber", "delta"] == pytest.approx(0.02)
+
+
+def test_compare_rejects_ambiguous_keys(tmp_path):
+    db = ResultsDatabase(str(tmp_path / "stegoeval.db"))
+    rows = _rows(0.0).assign(attack_params="{'noise': 'gaussian'}")
+    db.append_run("a", rows)
+    db.append_run("b", rows)
+
+    with pytest.raises(ValueError, match="cannot be paired"):
+        db.compare("a", "b")
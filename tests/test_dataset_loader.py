@@ -0,0 +1,60 @@
+import os
+
+import cv2
+import numpy as np
+
+from stegoeval.core.dataset_loader import DatasetLoader
+
+
+def _write(path, seed):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cv2.imwrite(str(path), np.random.RandomState(seed).randint(0, 255, (8, 8, 3), np.uint8))
+
+
+def _dataset(root):
+    # Same filename in two directories, only one pair pixel-identical
+    _write(root / "a" / "img.png", 0)
+    _write(root / "b" / "img.png", 1)
+    _write(root / "b" / "zz.png", 0)
+    _write(root / "c" / "img.png", 1)
+    return str(root)
+
+
+def test_duplicates_are_named_by_relative_path(tmp_path):
+    dataset = _dataset(tmp_path / "data")
+    loader = DatasetLoader(dataset, deduplicate=True)
+
+    assert loader.aliases == {"a/img.png": ["b/zz.png"], "b/img.png": ["c/img.png"]}
+    assert [name for name, _ in loader.get_images()] == ["a/img.png", "b/img.png"]
+    assert sorted(os.listdir(dataset)) == ["a", "b", "c"]
+
+
+def test_limit_selects_files_before_deduplication(tmp_path):
+    dataset = _dataset(tmp_path / "data")
+    loader = DatasetLoader(dataset, deduplicate=True, limit=3)
+
+    # First three files are a/img, b/img, b/zz; c/img is never looked at
+    assert [name for name, _ in loader.get_images()] == ["a/img.png", "b/img.png"]
+    assert loader.aliases == {"a/img.png": ["b/zz.png"]}
+
+
+def test_manifest_is_reused(tmp_path, monkeypatch):
+    dataset = _dataset(tmp_path / "data")
+    manifest = tmp_path / "out" / "manifest.json"
+    DatasetLoader(dataset, deduplicate=True, manifest_path=str(manifest))
+    assert manifest.exists()
+
+    def imread(*args):
+        raise AssertionError("decoded an image with a cached hash")
+
+    monkeypatch.setattr(cv2, "imread", imread)
+    loader = DatasetLoader(dataset, deduplicate=True, manifest_path=str(manifest))
+    assert loader.duplicates_skipped == 2
+
+
+def test_evaluator_keeps_every_file_by_default(tmp_path):
+    from stegoeval.core.evaluator import Evaluator
+
+    dataset = _dataset(tmp_path / "data")
+    assert len(Evaluator({"dataset_path": dataset}, []).dataset_loader) == 4
+    assert len(Evaluator({"dataset_path": dataset, "deduplicate": True}, []).dataset_loader) == 2
@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.attacks.compression import apply_jpeg_compression
+from stegoeval.stego_algorithms.dct_qim import DCTQIMStego
+
+
+def _cover(shape=(128, 160, 3)):
+    rng = np.random.default_rng(0)
+    smooth = cv2.GaussianBlur(rng.integers(0, 256, shape, dtype=np.uint8), (0, 0), 3)
+    return cv2.normalize(smooth, None, 20, 235, cv2.NORM_MINMAX)
+
+
+PAYLOAD = "Hidden message 42!"
+
+
+@pytest.mark.parametrize("shape", [(128, 160, 3), (96, 96)])
+def test_round_trip_is_exact(shape):
+    algo, cover = DCTQIMStego(), _cover(shape)
+    stego = algo.embed(cover, PAYLOAD)
+    assert stego.shape == cover.shape and stego.dtype == np.uint8
+    assert algo.extract(stego) == PAYLOAD
+    assert algo.extract_batch([stego, stego]) == [PAYLOAD, PAYLOAD]
+
+
+def test_survives_jpeg_75():
+    algo, cover = DCTQIMStego(), _cover()
+    stego = algo.embed(cover, PAYLOAD)
+    assert algo.extract(apply_jpeg_compression(stego, 75)) == PAYLOAD
+
+
+def test_capacity_bounds_the_payload():
+    algo, cover = DCTQIMStego(), _cover()
+    capacity = algo.capacity(cover.shape)
+    assert capacity > len(PAYLOAD)
+    longest = "x" * capacity
+    assert algo.extract(algo.embed(cover, longest)) == longest
+    with pytest.raises(ValueError):
+        algo.embed(cover, longest + "x")
+
+
+def test_wrong_key_does_not_decode():
+    cover = _cover()
+    stego = DCTQIMStego(key=1).embed(cover, PAYLOAD)
+    assert DCTQIMStego(key=2).extract(stego) != PAYLOAD
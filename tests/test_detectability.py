@@ -0,0 +1,52 @@
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.metrics.detectability import chi_square_attack, rs_analysis, sample_pair_analysis
+
+pytest.importorskip("scipy")
+
+
+def _cover():
+    rng = np.random.default_rng(0)
+    smooth = cv2.GaussianBlur(rng.normal(128, 60, (256, 256)), (0, 0), 6)
+    image = (smooth - smooth.min()) / np.ptp(smooth) * 220 + 15 + rng.normal(0, 2, smooth.shape)
+    return np.clip(np.rint(image), 0, 255).astype(np.uint8)
+
+
+def _embed(cover, rate, seed=1):
+    """LSB replacement of random bits in a random `rate` fraction of the pixels."""
+    rng = np.random.default_rng(seed)
+    stego = cover.copy().ravel()
+    chosen = rng.random(stego.size) < rate
+    stego[chosen] = (stego[chosen] & 0xFE) | rng.integers(0, 2, chosen.sum(), dtype=np.uint8)
+    return stego.reshape(cover.shape)
+
+
+@pytest.mark.parametrize("detector", [rs_analysis, sample_pair_analysis])
+def test_rate_estimate_rises_with_embedding_rate(detector):
+    cover = _cover()
+    # RS cannot tell full embedding (its quadratic degenerates at rate 1), so stop short of it
+    rates = [0.0, 0.2, 0.5, 0.8]
+    estimates = [detector(_embed(cover, rate)) for rate in rates]
+    assert estimates == sorted(estimates)
+    assert estimates[0] < 0.1 and estimates[-1] > 0.6
+    # Close to the true fraction of modified pixels in between
+    assert estimates[2] == pytest.approx(0.5, abs=0.15)
+
+
+def test_chi_square_flags_full_embedding():
+    # Uneven pairs of values (every value even) in the cover; embedding equalizes them
+    cover = _cover() & 0xFE
+    assert chi_square_attack(cover) < 0.05
+    assert chi_square_attack(_embed(cover, 1.0)) > 0.5
+
+
+def test_detectors_are_opt_in(tmp_path):
+    assert not Evaluator({"dataset_path": str(tmp_path)}, []).detectability
+    cover = _cover()
+    stego = _embed(cover, 1.0)
+    on = Evaluator({"dataset_path": str(tmp_path), "detectability": True}, [])
+    assert on._compute_detectability_metrics(cover, stego).keys() == {
+        "chi2_p", "rs_rate", "spa_rate", "cover_chi2_p", "cover_rs_rate", "cover_spa_rate"}
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from stegoeval.reporting.export import export_results, load_results, write_parquet
+
+pytest.importorskip("pyarrow")
+
+ROWS = [
+    {"image": "a.png", "algorithm": "COVER_IMAGE_BASELINE", "payload_size": 0, "attack_category": "baseline",
+     "attack_name": "clean_jpeg_save", "attack_params": "quality=95", "psnr": 40.0},
+    {"image": "a.png", "algorithm": "example_lsb", "payload_size": 10, "attack_category": "none",
+     "attack_name": "clean", "attack_params": "none", "psnr": 50.0, "ber": 0.0, "payload_recovered": True},
+    {"image": "a.png", "algorithm": "example_lsb", "payload_size": 10, "attack_category": "noise",
+     "attack_name": "gaussian", "attack_params": "{'var': 0.01}", "psnr": 30.0, "ber": 0.4,
+     "payload_recovered": False},
+    # Failed embed: no attack_category
+    {"image": "a.png", "algorithm": "dct_qim", "error": "Embed failed: payload too large"},
+    {"image": "a.png", "algorithm": "example_lsb", "payload_size": 0, "attack_category": "capacity",
+     "attack_name": "max_text_length", "attack_params": "none", "max_text_length": 42},
+]
+
+
+def test_parquet_round_trip_with_error_and_capacity_rows(tmp_path):
+    write_parquet(pd.DataFrame(ROWS), str(tmp_path), "run")
+
+    df = load_results(str(tmp_path), "run")
+    assert len(df) == len(ROWS)
+    assert set(df["attack_category"]) == {"baseline", "none", "noise", "error", "capacity"}
+    assert df.loc[df["attack_category"] == "error", "error"].tolist() == ["Embed failed: payload too large"]
+    assert df.loc[df["attack_category"] == "capacity", "max_text_length"].tolist() == [42]
+
+    noise = load_results(str(tmp_path), "run", categories=["noise"])
+    assert noise["attack_name"].tolist() == ["gaussian"]
+
+
+def test_export_of_run_with_error_rows(tmp_path):
+    write_parquet(pd.DataFrame(ROWS), str(tmp_path), "run")
+
+    path = export_results(str(tmp_path), "run", fmt="csv", algorithms=["dct_qim"])
+    assert pd.read_csv(path)["error"].tolist() == ["Embed failed: payload too large"]
@@ -0,0 +1,51 @@
+import numpy as np
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class Recorder(StegoAlgorithm):
+    """Extracts the first pixel value; extract_batch fails on batches with a zero image."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed(self, cover, payload):
+        return cover
+
+    def extract(self, stego):
+        if not stego.any():
+            raise ValueError("blank image")
+        return str(stego.flat[0])
+
+    def extract_batch(self, stegos):
+        self.batches.append(len(stegos))
+        if any(not stego.any() for stego in stegos):
+            raise ValueError("blank image in batch")
+        return [self.extract(stego) for stego in stegos]
+
+    def name(self):
+        return "recorder"
+
+
+def _images(*values):
+    return [np.full((4, 4), value, np.uint8) for value in values]
+
+
+def test_attacked_images_share_one_batch_call(tmp_path):
+    algo = Recorder()
+    evaluator = Evaluator({"dataset_path": str(tmp_path)}, [algo])
+
+    extracted = evaluator._extract_many(algo, _images(1, 2, 3))
+    assert algo.batches == [3]
+    assert [output for output, _ in extracted] == ["1", "2", "3"]
+    assert len({cost["extract_time_ms"] for _, cost in extracted}) == 1
+
+
+def test_failed_batch_falls_back_to_single_extracts(tmp_path):
+    algo = Recorder()
+    evaluator = Evaluator({"dataset_path": str(tmp_path)}, [algo])
+
+    extracted = evaluator._extract_many(algo, _images(1, 0, 3))
+    assert [output for output, _ in extracted[::2]] == ["1", "3"]
+    assert isinstance(extracted[1][0], ValueError)
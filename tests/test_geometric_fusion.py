@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.core import evaluator as evaluator_module
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.metrics import distortion
+
+
+def _image():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 256, (60, 80, 3), dtype=np.uint8), (0, 0), 4)
+
+
+def _evaluator(tmp_path, fusion):
+    return Evaluator({"dataset_path": str(tmp_path), "geometric_fusion": fusion}, [])
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Counts of the resampling calls made by the evaluator and the metrics."""
+    counts = {"warp": 0, "metric_resize": 0}
+    apply_affine = evaluator_module.apply_affine
+    resize = distortion.cv2.resize
+
+    def counted_warp(*args):
+        counts["warp"] += 1
+        return apply_affine(*args)
+
+    def counted_resize(*args, **kwargs):
+        counts["metric_resize"] += 1
+        return resize(*args, **kwargs)
+
+    monkeypatch.setattr(evaluator_module, "apply_affine", counted_warp)
+    monkeypatch.setattr(distortion.cv2, "resize", counted_resize)
+    return counts
+
+
+def test_single_step_realigns_in_one_warp(tmp_path, calls):
+    cover = _image()
+    chain = [("compression", "jpeg", 90), ("geometric", "rotation", 5.0)]
+    plain_image, plain = _evaluator(tmp_path, False)._apply_attack_chain(cover, chain, cover.shape)
+    plain_metrics = _evaluator(tmp_path, False)._compute_distortion_metrics(cover, plain)
+    assert calls["warp"] == 0 and calls["metric_resize"] > 1
+
+    calls.update(warp=0, metric_resize=0)
+    fused = _evaluator(tmp_path, True)
+    image, comparable = fused._apply_attack_chain(cover, chain, cover.shape)
+    metrics = fused._compute_distortion_metrics(cover, comparable)
+
+    # The attacked image is untouched; the metrics' copy is one warp at cover size
+    np.testing.assert_array_equal(image, plain_image)
+    assert comparable.shape == cover.shape
+    assert calls == {"warp": 1, "metric_resize": 0}
+    assert metrics["psnr"] == pytest.approx(plain_metrics["psnr"], abs=0.5)
+    assert metrics["ssim"] == pytest.approx(plain_metrics["ssim"], abs=0.02)
+
+
+def test_geometric_run_is_one_warp(tmp_path, calls):
+    cover = _image()
+    chain = [("geometric", "rotation", 5.0), ("geometric", "scaling", 1.5)]
+    plain_image, _ = _evaluator(tmp_path, False)._apply_attack_chain(cover, chain, cover.shape)
+
+    image, comparable = _evaluator(tmp_path, True)._apply_attack_chain(cover, chain, cover.shape)
+    assert calls["warp"] == 2  # the run, and its cover-size copy for the metrics
+    assert image.shape == plain_image.shape and comparable.shape == cover.shape
+    # One interpolation instead of two: the interior agrees to within rounding
+    h, w = image.shape[:2]
+    inner = (slice(h // 4, 3 * h // 4), slice(w // 4, 3 * w // 4))
+    assert np.abs(image[inner].astype(int) - plain_image[inner]).mean() < 1.0
+
+
+def test_downscaled_results_are_realigned_from_the_result(tmp_path, calls):
+    cover = _image()
+    chain = [("geometric", "scaling", 0.5)]
+    plain_image, _ = _evaluator(tmp_path, False)._apply_attack_chain(cover, chain, cover.shape)
+    image, comparable = _evaluator(tmp_path, True)._apply_attack_chain(cover, chain, cover.shape)
+
+    np.testing.assert_array_equal(image, plain_image)
+    upscaled = cv2.resize(image, cover.shape[1::-1], interpolation=cv2.INTER_LINEAR)
+    assert np.abs(comparable.astype(int) - upscaled).max() <= 1
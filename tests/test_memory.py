@@ -0,0 +1,95 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from stegoeval.core.async_evaluator import AsyncEvaluator
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.core.memory import MemoryBudget, parse_memory_size
+from stegoeval.core.pipeline_evaluator import PipelineEvaluator
+from stegoeval.stego_algorithms.example_lsb import LSBStego
+
+
+def _acquire_later(budget, nbytes):
+    admitted = threading.Event()
+    thread = threading.Thread(target=lambda: (budget.acquire(nbytes), admitted.set()), daemon=True)
+    thread.start()
+    return thread, admitted
+
+
+def test_admission_blocks_once_over_the_limit():
+    budget = MemoryBudget(limit=100)
+    budget.acquire(60)
+    thread, admitted = _acquire_later(budget, 60)
+    assert not admitted.wait(0.2)
+    assert budget.in_use == 60
+
+    budget.release(60)
+    assert admitted.wait(2)
+    thread.join(2)
+    summary = budget.summary()
+    assert summary["admissions"] == 2 and summary["admission_waits"] == 1
+    assert summary["estimated_peak_bytes"] == 60 and summary["oversized_tasks"] == 0
+
+
+def test_requests_that_fit_do_not_wait():
+    budget = MemoryBudget(limit=100)
+    budget.acquire(40)
+    budget.acquire(60)
+    assert budget.waits == 0 and budget.peak == 100
+
+
+def test_oversized_task_runs_alone():
+    budget = MemoryBudget(limit=100)
+    budget.acquire(10)
+    thread, admitted = _acquire_later(budget, 500)
+    assert not admitted.wait(0.2)
+    budget.release(10)
+    assert admitted.wait(2)
+    thread.join(2)
+    assert budget.oversized == 1 and budget.in_use == 500
+
+
+def test_reservation_is_released_by_its_last_holder():
+    budget = MemoryBudget(limit=100)
+    reservation = budget.reserve(80)
+    reservation.share(3)
+    reservation.retire()
+    reservation.retire()
+    assert budget.in_use == 80
+    reservation.retire()
+    assert budget.in_use == 0
+
+    budget.reserve(50).share(0)
+    assert budget.in_use == 0
+
+
+def test_parse_memory_size():
+    assert parse_memory_size(None) is None
+    assert parse_memory_size(4096) == 4096
+    assert parse_memory_size("512MiB") == 512 * 2**20
+    with pytest.raises(ValueError):
+        parse_memory_size("lots")
+
+
+def _config(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    cv2.imwrite(str(data / "0.png"), np.random.default_rng(0).integers(0, 256, (32, 32, 3), dtype=np.uint8))
+    return {"dataset_path": str(data), "payload_sizes": [4], "attacks": {"filtering": {"gaussian_blur": [3]}},
+            "memory_budget": "64MiB"}
+
+
+@pytest.mark.parametrize("evaluator_class", [Evaluator, AsyncEvaluator])
+def test_budget_is_rejected_where_it_cannot_be_enforced(tmp_path, evaluator_class):
+    with pytest.raises(ValueError, match="pipeline"):
+        evaluator_class(_config(tmp_path), [LSBStego()])
+
+
+def test_pipeline_admits_tasks_against_the_budget(tmp_path):
+    evaluator = PipelineEvaluator(_config(tmp_path), [LSBStego()])
+    rows = evaluator.evaluate()
+    summary = evaluator.memory_budget.summary()
+    assert rows and summary["memory_budget_bytes"] == 64 * 2**20
+    assert summary["admissions"] > 0 and evaluator.memory_budget.in_use == 0
@@ -0,0 +1,18 @@
+import time
+
+from stegoeval.core.pipeline import Pipeline
+
+
+def test_admission_wait_counts_as_blocked_not_busy():
+    def admit(item):
+        time.sleep(0.1)
+        return item + 1
+
+    received = []
+    stats = Pipeline(queue_size=4).add_stage("sink", received.append).run(iter(range(3)), admit=admit)
+
+    assert sorted(received) == [1, 2, 3]
+    load = stats[0]
+    assert load["stage"] == "load" and load["items"] == 3
+    assert load["blocked_s"] >= 0.3
+    assert load["busy_s"] < 0.1
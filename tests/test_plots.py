@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stegoeval.reporting.plots import generate_plots, plot_aggregates
+
+pytest.importorskip("matplotlib")
+
+
+def _rows(psnr_offset=0.0):
+    rows = []
+    for image in ("a.png", "b.png"):
+        for algorithm in ("example_lsb", "dct_qim"):
+            for quality in (90, 50):
+                rows.append({"image": image, "algorithm": algorithm, "attack_category": "compression",
+                             "attack_name": "jpeg", "attack_params": str(quality),
+                             "psnr": quality / 2 + (image == "b.png") + psnr_offset, "ssim": 0.9, "ber": 0.1})
+            for var in (0.01, 0.05):
+                rows.append({"image": image, "algorithm": algorithm, "attack_category": "noise",
+                             "attack_name": "gaussian", "attack_params": str({"mean": 0.0, "var": var}),
+                             "psnr": 30.0, "ssim": 0.8, "ber": var * 4})
+            rows.append({"image": image, "algorithm": algorithm, "attack_category": "filtering",
+                         "attack_name": "median", "attack_params": "3", "psnr": 35.0, "ssim": 0.95, "ber": 0.0})
+    return pd.DataFrame(rows)
+
+
+def test_aggregates_average_per_setting():
+    agg = plot_aggregates(_rows())
+    # Median is not plotted; one row per algorithm x attack x setting
+    assert set(agg["attack_name"]) == {"jpeg", "gaussian"}
+    assert len(agg) == 2 * (2 + 2)
+    jpeg = agg[(agg["algorithm"] == "dct_qim") & (agg["attack_name"] == "jpeg")]
+    assert list(jpeg["x"]) == [50.0, 90.0] and set(jpeg["x_label"]) == {"quality"}
+    np.testing.assert_allclose(jpeg["psnr"], [25.5, 45.5])
+    noise = agg[(agg["algorithm"] == "example_lsb") & (agg["attack_name"] == "gaussian")]
+    assert list(noise["x"]) == [0.01, 0.05] and set(noise["x_label"]) == {"var"}
+
+
+def test_unchanged_figures_are_not_rendered_again(tmp_path):
+    first = generate_plots(_rows(), str(tmp_path), workers=1)
+    assert sorted(os.path.basename(p) for p in first) == ["ber_vs_noise-benchmark.png",
+                                                            "psnr_vs_jpeg-benchmark.png"]
+    assert generate_plots(_rows(), str(tmp_path), workers=1) == []
+
+    # Only the figure whose aggregate changed is redrawn
+    again = generate_plots(_rows(psnr_offset=1.0), str(tmp_path), workers=1)
+    assert [os.path.basename(p) for p in again] == ["psnr_vs_jpeg-benchmark.png"]
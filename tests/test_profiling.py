@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from stegoeval.core.profiling import SamplingProfiler, StageTimer
+
+
+def test_disabled_timer_records_nothing():
+    timer = StageTimer(enabled=False)
+    with timer.time("embed"):
+        pass
+    assert timer.summary() == []
+
+
+def test_timer_summary_shares_of_total():
+    timer = StageTimer(enabled=True)
+    timer.record("total", 4.0)
+    timer.record("embed", 1.0)
+    timer.record("embed", 2.0)
+    with timer.time("extract"):
+        pass
+
+    rows = {row["stage"]: row for row in timer.summary()}
+    assert [row["stage"] for row in timer.summary()][:2] == ["total", "embed"]
+    assert rows["embed"]["calls"] == 2
+    assert rows["embed"]["mean_s"] == pytest.approx(1.5)
+    assert rows["embed"]["max_s"] == 2.0
+    assert rows["embed"]["share"] == pytest.approx(0.75)
+    assert rows["extract"]["calls"] == 1
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler_writes_folded_stacks(tmp_path):
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _spin(0.2)
+    profiler.stop()
+
+    path = tmp_path / "profile.folded"
+    profiler.dump(str(path))
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("_spin" in line for line in lines)
+
+
+def test_traced_call_runs_once_and_reports_numpy_peak():
+    import numpy as np
+
+    from stegoeval.core.profiling import traced_call
+
+    calls = []
+
+    def allocate():
+        calls.append(1)
+        return np.ones(1 << 20, dtype=np.uint8).sum()
+
+    output, peak = traced_call(allocate)
+    assert output == 1 << 20
+    assert calls == [1]
+    assert peak >= 1 << 20
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from stegoeval.core.evaluator import Evaluator
+from stegoeval.stego_algorithms.base import StegoAlgorithm
+
+
+class UpscaleRobust(StegoAlgorithm):
+    """Survives any attack that keeps at least the cover's height; fails on anything smaller."""
+
+    def embed(self, cover, payload):
+        self.payload, self.height = payload, cover.shape[0]
+        return cover.copy()
+
+    def extract(self, stego):
+        return self.payload if stego.shape[0] >= self.height else ""
+
+    def name(self):
+        return "upscale_robust"
+
+
+ATTACKS = {
+    "compression": {"jpeg": [90, 50, 30]},
+    "geometric": {"scaling": [0.9, 1.5, 0.5, 2.0, 0.25]},
+}
+
+
+def _rows(tmp_path, prune: bool):
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    cv2.imwrite(str(data / "a.png"), np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8))
+    config = {"dataset_path": str(data), "payload_sizes": [8], "attacks": ATTACKS, "deduplicate": False,
+              "detectability": False, "prune_monotone": prune, "prune_patience": 1}
+    rows = Evaluator(config, [UpscaleRobust()]).evaluate()
+    return {(r["attack_name"], r["attack_params"]): r for r in rows
+            if r["algorithm"] == "upscale_robust" and r.get("attack_category") not in (None, "none")}
+
+
+def test_pruning_infers_the_rows_of_a_full_sweep(tmp_path):
+    full = _rows(tmp_path, prune=False)
+    pruned = _rows(tmp_path, prune=True)
+
+    assert pruned.keys() == full.keys()
+    for key, row in pruned.items():
+        assert row["payload_recovered"] == full[key]["payload_recovered"], key
+        assert (row["ber"] >= 0.4) == (full[key]["ber"] >= 0.4), key
+    # Upscaling is its own sweep: downscale failures never prune it
+    assert all(pruned[("scaling", str(s))]["payload_recovered"] for s in (1.5, 2.0))
+    assert [s for s in (0.9, 0.5, 0.25) if pruned[("scaling", str(s))]["pruned"]] == [0.5, 0.25]
+    # JPEG keeps the shape and never fails: nothing is pruned
+    assert not any(pruned[("jpeg", str(q))]["pruned"] for q in (90, 50, 30))
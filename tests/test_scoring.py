@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stegoeval.scoring import (
+    CATEGORY_SCORE_GROUPS, LiveScoreboard, ScoreAggregates, bootstrap_score_intervals, calculate_overall_scores,
+    calculate_scores_by_category,
+)
+
+
+def _frame(rows: int = 400, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    categories = np.array(["none", "noise", "blur", "compression", "geometric", "combo"], dtype=object)
+    df = pd.DataFrame({
+        "image": [f"{i % 20}.png" for i in range(rows)],
+        "algorithm": rng.choice(["example_lsb", "dct_qim", "other"], rows),
+        "attack_category": rng.choice(categories, rows),
+        "ssim": rng.random(rows),
+        "psnr": rng.uniform(10, 60, rows),
+        "ber": rng.random(rows),
+        "payload_recovered": rng.random(rows) < 0.5,
+    })
+    # Clean rows have infinite PSNR, failed rows have no metrics and no category
+    df.loc[df["attack_category"] == "none", "psnr"] = np.inf
+    failed = rng.random(rows) < 0.1
+    df.loc[failed, ["ssim", "psnr", "ber"]] = np.nan
+    df.loc[failed, "attack_category"] = np.nan
+    df["payload_recovered"] = df["payload_recovered"].astype(object)
+    df.loc[failed, "payload_recovered"] = np.nan
+    return df
+
+
+def _masked(df, algo, categories=None, exclude=None):
+    """The per-mask means ScoreAggregates replaced."""
+    rows = df[df["algorithm"] == algo]
+    if categories is not None:
+        rows = rows[rows["attack_category"].isin(categories)]
+    elif exclude:
+        rows = rows[~rows["attack_category"].isin(exclude)]
+    return {
+        "avg_ssim": rows["ssim"].mean(),
+        "avg_psnr": rows["psnr"].mean(),
+        "avg_ber": rows["ber"].mean(),
+        "recovery_rate": pd.to_numeric(rows["payload_recovered"]).mean(),
+        "rows": len(rows),
+    }
+
+
+def test_stats_match_per_mask_means():
+    df = _frame()
+    aggregates = ScoreAggregates(df)
+    lookups = [(["noise"], None), (["blur", "noise"], None), (["compression", "combo"], None),
+               (["none"], None), (["missing"], None), (None, ["none"]), (None, None)]
+    for algo in df["algorithm"].unique():
+        for categories, exclude in lookups:
+            expected = _masked(df, algo, categories, exclude)
+            got = aggregates.stats(algo, categories, exclude)
+            assert got["rows"] == expected["rows"]
+            for key in ("avg_ssim", "avg_psnr", "avg_ber", "recovery_rate"):
+                assert got[key] == pytest.approx(expected[key], rel=1e-12, nan_ok=True), (algo, categories, key)
+
+
+def test_category_table_matches_groupby():
+    df = _frame(seed=1)
+    table = calculate_scores_by_category(df).dropna(subset=["attack_category"])
+    expected = (df[df["attack_category"].notna() & (df["attack_category"] != "none")]
+                .groupby(["algorithm", "attack_category"])
+                .agg(avg_ssim=("ssim", "mean"), avg_ber=("ber", "mean"), rows=("ber", "size")))
+    assert len(table) == len(expected)
+    for _, row in table.iterrows():
+        want = expected.loc[(row["algorithm"], row["attack_category"])]
+        assert row["avg_ssim"] == pytest.approx(want["avg_ssim"], rel=1e-12)
+        assert row["avg_ber"] == pytest.approx(want["avg_ber"], rel=1e-12)
+
+
+def test_missing_columns_fall_back_to_defaults():
+    df = pd.DataFrame({"algorithm": ["a", "a"], "attack_category": ["noise", "noise"], "ber": [0.2, 0.4]})
+    stats = ScoreAggregates(df).stats("a", ["noise"])
+    assert stats["avg_ssim"] == 0 and stats["avg_psnr"] == 0 and stats["recovery_rate"] == 0
+    assert stats["avg_ber"] == pytest.approx(0.3)
+    assert calculate_overall_scores(df).loc[0, "algorithm"] == "a"
+
+
+def test_live_scoreboard_matches_batch_scores():
+    df = _frame(seed=2)
+    board = LiveScoreboard()
+    for row in df.to_dict("records"):
+        board.update({k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()})
+
+    columns = ["algorithm", "attack_category", "avg_ssim", "avg_psnr", "avg_ber", "recovery_rate",
+               "overall_score", "images_tested"]
+    batch = calculate_scores_by_category(df).dropna(subset=["attack_category"])[columns]
+    live = board.category_scores().dropna(subset=["attack_category"])[columns]
+    key = ["algorithm", "attack_category"]
+    pd.testing.assert_frame_equal(live.sort_values(key).reset_index(drop=True),
+                                  batch.sort_values(key).reset_index(drop=True), rtol=1e-9)
+
+    columns = ["algorithm", *CATEGORY_SCORE_GROUPS, "overall_score", "total_images",
+               "total_payloads_recovered", "overall_recovery_rate"]
+    batch = calculate_overall_scores(df)[columns].sort_values("algorithm").reset_index(drop=True)
+    live = board.overall_scores()[columns].sort_values("algorithm").reset_index(drop=True)
+    pd.testing.assert_frame_equal(live, batch, rtol=1e-9, check_dtype=False)
+
+
+def test_bootstrap_is_reproducible_under_a_seed():
+    df = _frame(seed=3)
+    overall, by_category = bootstrap_score_intervals(df, replicates=200, seed=5)
+    again_overall, again_by_category = bootstrap_score_intervals(df, replicates=200, seed=5)
+    pd.testing.assert_frame_equal(overall, again_overall)
+    pd.testing.assert_frame_equal(by_category, again_by_category)
+    assert (overall["overall_score_ci_low"] <= overall["overall_score_ci_high"]).all()
+
+    other, _ = bootstrap_score_intervals(df, replicates=200, seed=6)
+    assert not other.equals(overall)
+    assert bootstrap_score_intervals(df, replicates=0)[0].empty
+
+
+def test_bootstrap_draws_duplicate_covers_together():
+    df = _frame(seed=4)
+    copies = df[df["image"].isin(["0.png", "1.png"])]
+    copies = copies.assign(image="copy-" + copies["image"], duplicate_of=copies["image"])
+    aliased = pd.concat([df, copies], ignore_index=True)
+    # The copies resample exactly like extra rows of the images they were copied from
+    merged = aliased.assign(image=aliased["duplicate_of"].fillna(aliased["image"])).drop(columns="duplicate_of")
+
+    result = bootstrap_score_intervals(aliased, replicates=200, seed=5)[0]
+    pd.testing.assert_frame_equal(result, bootstrap_score_intervals(merged, replicates=200, seed=5)[0])
+    independent = bootstrap_score_intervals(aliased.drop(columns="duplicate_of"), replicates=200, seed=5)[0]
+    assert not result.equals(independent)
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+from stegoeval.bench import CLI_STARTUP_BUDGET, _cli_startup_time
+
+# Imported lazily by the commands that need them
+HEAVY_MODULES = ["numpy", "cv2", "pandas", "scipy", "skimage", "pydantic", "yaml"]
+
+
+def test_cli_import_stays_light():
+    code = f"import sys, stegoeval.cli; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_cli_info_within_startup_budget():
+    timing = _cli_startup_time(repeat=3)
+    assert timing["median_s"] <= CLI_STARTUP_BUDGET, (
+        f"`stegoeval info` took {timing['median_s']:.3f} s (budget {CLI_STARTUP_BUDGET} s)")
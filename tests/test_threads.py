@@ -0,0 +1,49 @@
+import os
+
+import cv2
+import pytest
+
+from stegoeval.core import threads
+from stegoeval.core.pipeline import stage_threads
+from stegoeval.core.threads import THREAD_ENV_VARS, apply_thread_layout, resolve_thread_layout
+
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(threads, "available_cores", lambda: 8)
+
+
+def test_no_budget_leaves_libraries_alone(eight_cores):
+    assert resolve_thread_layout(None) is None
+
+
+def test_sequential_evaluator_gets_every_thread(eight_cores):
+    assert resolve_thread_layout("auto") == {"cores": 8, "threads": 8, "workers": 1, "threads_per_worker": 8}
+    assert resolve_thread_layout(4, workers=6)["workers"] == 1
+
+
+def test_parallel_workers_split_the_budget(eight_cores):
+    assert resolve_thread_layout("auto", parallel=True)["workers"] == 8
+    layout = resolve_thread_layout("auto", threads_per_worker=2, parallel=True)
+    assert (layout["workers"], layout["threads_per_worker"]) == (4, 2)
+    layout = resolve_thread_layout(6, workers=3, parallel=True)
+    assert (layout["workers"], layout["threads_per_worker"]) == (3, 2)
+
+
+def test_pipeline_workers_are_the_threads_of_all_stages(eight_cores):
+    workers = sum(stage_threads({"attack": 3, "metrics": 2}).values())
+    layout = resolve_thread_layout("auto", workers=workers, parallel=True)
+    assert layout["workers"] == workers
+    assert layout["threads_per_worker"] == max(1, 8 // workers)
+
+
+def test_apply_sets_environment_and_opencv(monkeypatch):
+    for var in THREAD_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    previous = cv2.getNumThreads()
+    try:
+        apply_thread_layout({"cores": 8, "threads": 2, "workers": 1, "threads_per_worker": 2})
+        assert all(os.environ[var] == "2" for var in THREAD_ENV_VARS)
+        assert cv2.getNumThreads() == 2
+    finally:
+        cv2.setNumThreads(previous)